@@ -0,0 +1,230 @@
+"""
+Per-frame allocation tracking for Road Fighter.
+
+AllocationTracker takes a tracemalloc snapshot after every frame and diffs
+it against the previous one, grouped by the line in this project that made
+the allocation. Only memory still alive at the end of a frame is counted:
+that is what fills the garbage collector's generation 0 and eventually
+triggers a collection pause. Collections are counted in a separate,
+untraced run because taking snapshots allocates enough to trigger them.
+
+    python alloc_tracker.py                    # report top call sites per state
+    python alloc_tracker.py --state GAME --frames 600
+    python alloc_tracker.py --check            # assert the per-state budgets below
+
+--check exits with status 1 if any state keeps more blocks alive per frame
+than its budget allows or triggers a garbage collection.
+"""
+
+import argparse
+import collections
+import gc
+import os
+import tracemalloc
+
+from headless import PROJECT_DIR, create_game, main, pygame, run_frame
+from track import CHUNK_ROWS, OPENING_CHUNKS
+import benchmark
+
+WARMUP_FRAMES = 120
+# Until the road is past the chunks kept for restarts, every new chunk adds to the live set
+OPENING_ROWS = (OPENING_CHUNKS + 1) * CHUNK_ROWS
+# Extra frames allowed for traffic to return to the car count the window started with
+MAX_SETTLE_FRAMES = 600
+# Blocks a whole window may keep without failing. Freed tuples and floats go
+# back to CPython's freelists, so tracemalloc sometimes credits a reused block
+# to the wrong line and a handful of blocks never net out.
+NOISE_BLOCKS = 32
+
+# Average blocks left alive per frame once a state has settled. Gameplay
+# windows end with as many cars on the road and track chunks built as they
+# started with, so anything kept beyond the noise floor is a leak or a per-frame cache miss.
+STATE_BUDGETS = {
+    'MENU': 0.0,
+    'HOW_TO_PLAY': 0.0,
+    'GAME': 0.0,
+    'ATTRACT': 0.0,
+    'PAUSED': 0.0,
+    'REPLAY': 0.0,
+    'GAME_OVER': 0.0,
+    'CREDITS': 0.0,
+}
+
+STATE_SCENARIOS = {
+    'MENU': 'menu_idle',
+    'GAME': 'normal_drive',
+    'ATTRACT': 'attract',
+    'PAUSED': 'pause',
+    'REPLAY': 'instant_replay',
+    'GAME_OVER': 'game_over',
+}
+
+
+class AllocationTracker:
+    def __init__(self, traceback_depth=1):
+        self.traceback_depth = traceback_depth
+        self.filters = [
+            tracemalloc.Filter(True, os.path.join(PROJECT_DIR, "*")),
+            tracemalloc.Filter(False, os.path.abspath(__file__)),
+            tracemalloc.Filter(False, tracemalloc.__file__),
+        ]
+        self.previous = None
+        self.frames = 0
+        self.sites = collections.Counter()  # (file, line) -> net blocks over all frames
+        self.site_bytes = collections.Counter()
+        self.per_frame_blocks = []
+
+    def start(self):
+        tracemalloc.start(self.traceback_depth)
+        self.previous = self._snapshot()
+
+    def stop(self):
+        tracemalloc.stop()
+
+    def _snapshot(self):
+        return tracemalloc.take_snapshot().filter_traces(self.filters)
+
+    def end_frame(self):
+        """Diff against the previous frame and attribute the change to call sites"""
+        snapshot = self._snapshot()
+        blocks = 0
+        for stat in snapshot.compare_to(self.previous, 'lineno'):
+            if stat.count_diff:
+                frame = stat.traceback[0]
+                site = (os.path.relpath(frame.filename, PROJECT_DIR), frame.lineno)
+                self.sites[site] += stat.count_diff
+                self.site_bytes[site] += stat.size_diff
+                blocks += stat.count_diff
+        self.per_frame_blocks.append(blocks)
+        self.previous = snapshot
+        self.frames += 1
+
+    @property
+    def blocks_kept(self):
+        return sum(self.per_frame_blocks)
+
+    @property
+    def blocks_per_frame(self):
+        return self.blocks_kept / max(1, self.frames)
+
+    def report(self, top=15):
+        lines = [f"{self.frames} frames, {self.blocks_kept:+d} blocks kept ({self.blocks_per_frame:+.3f} per frame)"]
+        for (filename, lineno), count in self.sites.most_common(top):
+            if count <= 0:
+                break
+            lines.append(f"  {filename}:{lineno:<5} {count / self.frames:+8.2f} blocks/frame"
+                         f" {self.site_bytes[(filename, lineno)] / self.frames:+10.1f} B/frame")
+        return "\n".join(lines)
+
+
+def setup_state(game, state):
+    """Put a fresh game into `state` and return the per-frame step function"""
+    if state in STATE_SCENARIOS:
+        setup, step = benchmark.SCENARIOS[STATE_SCENARIOS[state]]
+        setup(game)
+        return step
+    if state == 'HOW_TO_PLAY':
+        game.show_how_to_play()
+        game.how_to_play_timer = float('inf')  # Never auto-start the game
+    else:
+        game.set_state(state)
+    return None
+
+
+def play_window(game, step, first_frame, frames, after_frame=None):
+    """Play at least `frames` frames, then until the car and track chunk counts are back where they started"""
+    start_counts = (len(game.enemy_cars), len(game.track.chunks))
+    end = first_frame + frames
+    frame = first_frame
+    while frame < end or ((len(game.enemy_cars), len(game.track.chunks)) != start_counts
+                          and frame < end + MAX_SETTLE_FRAMES):
+        if step:
+            step(game, frame)
+        run_frame(game)
+        if after_frame:
+            after_frame()
+        frame += 1
+
+
+def warm_up(game, step):
+    """Play until caches are warm and the track streams past its opening; return the frame number"""
+    frame = 0
+    while frame < 2 * WARMUP_FRAMES or (game.state in ("GAME", "ATTRACT") and game.road_offset < OPENING_ROWS):
+        if step:
+            step(game, frame)
+        run_frame(game)
+        frame += 1
+    return frame
+
+
+def measure_state(state, frames):
+    """Track kept allocations per call site over a settled window of `state`"""
+    # Trace from before the game exists: tracemalloc can't see frees of
+    # objects allocated while it was off, which would show up as false growth
+    tracker = AllocationTracker()
+    tracemalloc.start(tracker.traceback_depth)
+    game = create_game()
+    step = setup_state(game, state)
+    frame = warm_up(game, step)
+    gc.collect()
+
+    tracker.start()
+    play_window(game, step, frame, frames, tracker.end_frame)
+    tracker.stop()
+    return tracker
+
+
+def count_collections(state, frames):
+    """Count garbage collections by generation over the same window, untraced"""
+    counts = collections.Counter()
+
+    def on_gc(phase, info):
+        if phase == 'start':
+            counts[info['generation']] += 1
+
+    game = create_game()
+    step = setup_state(game, state)
+    frame = warm_up(game, step)
+    gc.collect()
+
+    gc.callbacks.append(on_gc)
+    try:
+        play_window(game, step, frame, frames)
+    finally:
+        gc.callbacks.remove(on_gc)
+    return counts
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--state", action="append", choices=sorted(STATE_BUDGETS),
+                        help="only measure this state (repeatable)")
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument("--check", action="store_true", help="fail if a state exceeds its budget")
+    args = parser.parse_args()
+
+    failures = []
+    for state in args.state or STATE_BUDGETS:
+        tracker = measure_state(state, args.frames)
+        gc_counts = count_collections(state, args.frames)
+        print(f"[{state}] {tracker.report()}")
+        print(f"  gc collections by generation: {dict(gc_counts) or 'none'}")
+        if tracker.blocks_kept > STATE_BUDGETS[state] * tracker.frames + NOISE_BLOCKS:
+            failures.append(f"{state}: {tracker.blocks_per_frame:+.3f} blocks/frame "
+                            f"(budget {STATE_BUDGETS[state]:+.3f})")
+        if gc_counts:
+            failures.append(f"{state}: {sum(gc_counts.values())} garbage collections")
+
+    if args.check:
+        for failure in failures:
+            print(f"OVER BUDGET {failure}")
+        if failures:
+            return 1
+        print("All states within their allocation budgets")
+    return 0
+
+
+if __name__ == "__main__":
+    exit_code = main_cli()
+    pygame.quit()
+    raise SystemExit(exit_code)
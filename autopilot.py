@@ -0,0 +1,81 @@
+"""
+Autopilot driver for Road Fighter's attract mode.
+
+An Autopilot stands in for the keyboard state: Game.update_game reads the
+arrow keys from it exactly as it reads pygame.key.get_pressed(), so the
+demo is the real game. Every PLAN_INTERVAL steps it picks a lane from the
+lane centers just ahead of the player. A lane costs more the more traffic
+is in it ahead of the player (closer cars weigh more) and the further away
+it is, and fuel pickups in it lower the cost, by much more when fuel is
+low. Between plans a step only compares the player's x with the chosen
+lane, so driving costs a couple of comparisons per step and a plan is one
+pass over the cars per lane.
+"""
+
+import pygame
+
+PLAN_INTERVAL = 6  # Steps between lane choices
+LOOKAHEAD = 420  # How far up the screen traffic is considered
+CLEARANCE = 12  # Extra sideways room a car needs to pass another
+PICKUP_REACH = 30  # Sideways distance at which the car's sprite still touches a fuel station's opaque pixels
+DEADZONE = 4  # Close enough to the lane center to stop steering
+LOW_FUEL = 50
+BLOCKED_COST = 1.0  # Any car in the lane ahead...
+NEAR_COST = 3.0  # ...plus this much more the closer it is
+FUEL_BONUS = 0.5
+LOW_FUEL_BONUS = 4.0
+DISTANCE_COST = 0.002  # Per pixel of steering to reach the lane
+
+
+class Autopilot:
+    def __init__(self):
+        self.left = False
+        self.right = False
+        self.target = None  # x of the chosen lane
+        self.steps = 0
+
+    def reset(self):
+        self.left = self.right = False
+        self.target = None
+        self.steps = 0
+
+    def __getitem__(self, key):
+        # Only steers; the speed is the game's
+        if key == pygame.K_LEFT:
+            return self.left
+        if key == pygame.K_RIGHT:
+            return self.right
+        return False
+
+    def drive(self, game):
+        """Choose this step's keys"""
+        x = game.player.x
+        if self.steps % PLAN_INTERVAL == 0:
+            self.target = self.plan(game)
+        self.steps += 1
+        target = self.target
+        self.left = x > target + DEADZONE
+        self.right = x < target - DEADZONE
+
+    def plan(self, game):
+        """Center x of the cheapest lane ahead"""
+        player = game.player
+        top = player.y - LOOKAHEAD
+        bottom = player.y + player.height  # Cars alongside block a lane too
+        fuel_bonus = LOW_FUEL_BONUS if game.fuel < LOW_FUEL else FUEL_BONUS
+        nearby = [(car.x, PICKUP_REACH if car.car_type == 'fuel' else (car.width + player.width) / 2 + CLEARANCE,
+                   (car.y - top) / (bottom - top), car.car_type == 'fuel')
+                  for car in game.enemy_cars if top < car.y < bottom]
+        best = None
+        best_cost = 0.0
+        for lane in game.track.lanes(player.y - player.height):
+            cost = abs(lane - player.x) * DISTANCE_COST
+            for car_x, reach, nearness, fuel in nearby:
+                if abs(car_x - lane) < reach:
+                    if fuel:
+                        cost -= fuel_bonus * nearness
+                    else:
+                        cost += BLOCKED_COST + NEAR_COST * nearness
+            if best is None or cost < best_cost:
+                best, best_cost = lane, cost
+        return player.x if best is None else best
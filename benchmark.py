@@ -0,0 +1,285 @@
+"""
+Headless benchmark suite for Road Fighter.
+
+Drives Game through scripted scenarios with SDL's dummy drivers, measures
+per-frame update and draw time plus memory, and compares the results with
+stored baselines for a hardware profile.
+
+    python benchmark.py                         # run and compare with the baseline
+    python benchmark.py --save-baseline         # record a new baseline for this profile
+    python benchmark.py --profile cabinet-v2    # pick which baseline to use
+    python benchmark.py --scenario dense_traffic --frames 1200
+    python benchmark.py --render-scale 0.5      # baselines are kept per render scale
+
+Exits with status 1 when any metric regresses past its threshold.
+"""
+
+import argparse
+import json
+import math
+import os
+import platform
+import time
+import tracemalloc
+
+from headless import create_game, key_event, main, pygame, run_frame
+
+BASELINE_FILE = "benchmark_baselines.json"
+WARMUP_FRAMES = 60
+
+# Allowed growth over the baseline before a metric counts as a regression
+TIME_THRESHOLD = 0.15
+MEMORY_THRESHOLD = 0.10
+# Absolute slack so sub-millisecond noise doesn't fail the run
+TIME_SLACK_MS = 0.05
+MEMORY_SLACK_KB = 64
+
+
+# Scenarios: setup(game) prepares the state, step(game, frame) runs before each update
+
+def setup_menu(game):
+    game.set_state("MENU")
+
+
+def step_menu(game, frame):
+    game.menu_idle = 0  # Someone is at the controls; attract mode has its own scenario
+
+
+def setup_drive(game):
+    game.start_game()
+
+
+def step_drive(game, frame):
+    # Weave across the lanes and keep the tank topped up so the run never ends
+    phase = (frame // 45) % 4
+    if phase == 0:
+        game.keys.press(pygame.K_LEFT)
+    elif phase == 2:
+        game.keys.press(pygame.K_RIGHT)
+    else:
+        game.keys.release()
+    game.fuel = 100
+
+
+def setup_dense(game):
+    game.start_game()
+    step_dense(game, 0)
+
+
+def step_dense(game, frame):
+    step_drive(game, frame)
+    # Keep forty cars on screen at all times
+    lanes = [450, 550, 650, 750, 850, 950]
+    enemy_types = ['static', 'reactive', 'zigzag']
+    while len(game.enemy_cars) < 40:
+        i = len(game.enemy_cars)
+        y = -50 - (i // len(lanes)) * 120
+        game.enemy_cars.append(main.EnemyCar(lanes[i % len(lanes)], y, 'normal',
+                                             enemy_types[i % 3], game.sprite_manager))
+
+
+def step_spin_outs(game, frame):
+    step_drive(game, frame)
+    # Drop a car on the player every 1.5 seconds so collisions keep happening
+    if frame % 90 == 0:
+        game.enemy_cars.append(main.EnemyCar(game.player.x, game.player.y, 'normal',
+                                             'static', game.sprite_manager))
+
+
+def setup_attract(game):
+    game.set_state("MENU")
+    game.start_attract()
+
+
+def step_attract(game, frame):
+    # The autopilot drives; keep the demo from running out of fuel or time
+    game.fuel = 100
+    game.attract_frames = 0
+
+
+def setup_pause(game):
+    game.start_game()
+    for frame in range(120):
+        step_dense(game, frame)
+        game.update()
+    game.handle_game_events(key_event(pygame.K_ESCAPE))
+
+
+def setup_instant_replay(game):
+    game.start_game()
+    for frame in range(240):  # Four seconds of driving to play back
+        step_drive(game, frame)
+        run_frame(game)
+    game.handle_game_events(key_event(pygame.K_i))
+
+
+def setup_game_over(game):
+    game.start_game()
+    game.fuel = 0.05
+    game.update()  # Runs out of fuel and calls game_over()
+
+
+SCENARIOS = {
+    'menu_idle': (setup_menu, step_menu),
+    'normal_drive': (setup_drive, step_drive),
+    'dense_traffic': (setup_dense, step_dense),
+    'spin_outs': (setup_drive, step_spin_outs),
+    'attract': (setup_attract, step_attract),
+    'pause': (setup_pause, None),
+    'instant_replay': (setup_instant_replay, None),
+    'game_over': (setup_game_over, None),
+}
+
+
+def percentile(ordered, p):
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(math.ceil(len(ordered) * p)) - 1)]
+
+
+def summarize(samples):
+    ordered = sorted(samples)
+    return {
+        'mean': sum(ordered) / len(ordered),
+        'p50': percentile(ordered, 0.50),
+        'p95': percentile(ordered, 0.95),
+        'p99': percentile(ordered, 0.99),
+        'max': ordered[-1],
+    }
+
+
+def read_rss_kb():
+    """Resident set size of this process in KB (Linux), or None"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") // 1024
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def play(game, step, frames, timings=None):
+    perf = time.perf_counter
+    for frame in range(frames):
+        if step:
+            step(game, frame)
+        start = perf()
+        game.update()
+        middle = perf()
+        game.draw()
+        game.present()
+        end = perf()
+        if timings is not None:
+            timings[0].append((middle - start) * 1000.0)
+            timings[1].append((end - middle) * 1000.0)
+
+
+def run_scenario(name, frames, seed=0, render_scale=1.0):
+    """Time one scenario, then replay it under tracemalloc for memory numbers"""
+    setup, step = SCENARIOS[name]
+
+    game = create_game(seed, render_scale)
+    setup(game)
+    play(game, step, WARMUP_FRAMES)
+    rss_before = read_rss_kb()
+    update_ms, draw_ms = [], []
+    play(game, step, frames, (update_ms, draw_ms))
+    rss_after = read_rss_kb()
+
+    # Separate pass so tracemalloc overhead doesn't skew the timings
+    game = create_game(seed, render_scale)
+    setup(game)
+    play(game, step, WARMUP_FRAMES)
+    tracemalloc.start()
+    start_kb = tracemalloc.get_traced_memory()[0] / 1024
+    play(game, step, frames)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    result = {
+        'frames': frames,
+        'update_ms': summarize(update_ms),
+        'draw_ms': summarize(draw_ms),
+        'heap_peak_kb': peak / 1024 - start_kb,
+        'heap_growth_kb': current / 1024 - start_kb,
+    }
+    if rss_before is not None:
+        result['rss_growth_kb'] = rss_after - rss_before
+    return result
+
+
+def compare(results, baseline):
+    """Return a list of (scenario, metric, baseline, current) regressions"""
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if not base:
+            continue
+        for section in ('update_ms', 'draw_ms'):
+            for stat in ('p50', 'p95'):
+                old, new = base[section][stat], result[section][stat]
+                if new > old * (1 + TIME_THRESHOLD) + TIME_SLACK_MS:
+                    regressions.append((name, f"{section}.{stat}", old, new))
+        for metric in ('heap_peak_kb', 'heap_growth_kb'):
+            old, new = base.get(metric), result[metric]
+            if old is not None and new > max(old, 0) * (1 + MEMORY_THRESHOLD) + MEMORY_SLACK_KB:
+                regressions.append((name, metric, old, new))
+    return regressions
+
+
+def print_results(results):
+    print(f"{'scenario':<15}{'update p50':>11}{'p95':>8}{'draw p50':>10}{'p95':>8}{'max':>8}{'heap peak':>11}")
+    for name, r in results.items():
+        print(f"{name:<15}{r['update_ms']['p50']:>11.3f}{r['update_ms']['p95']:>8.3f}"
+              f"{r['draw_ms']['p50']:>10.3f}{r['draw_ms']['p95']:>8.3f}{r['draw_ms']['max']:>8.3f}"
+              f"{r['heap_peak_kb']:>9.0f}KB")
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--profile", default=platform.node() or "default",
+                        help="hardware profile name the baseline is stored under")
+    parser.add_argument("--scenario", action="append", choices=sorted(SCENARIOS),
+                        help="run only this scenario (repeatable)")
+    parser.add_argument("--frames", type=int, default=600, help="measured frames per scenario")
+    parser.add_argument("--render-scale", type=float, choices=main.RENDER_SCALES, default=1.0)
+    parser.add_argument("--baseline-file", default=BASELINE_FILE)
+    parser.add_argument("--save-baseline", action="store_true", help="store results as the new baseline")
+    args = parser.parse_args()
+
+    results = {}
+    for name in args.scenario or SCENARIOS:
+        results[name] = run_scenario(name, args.frames, render_scale=args.render_scale)
+    print_results(results)
+
+    if args.render_scale != 1:
+        args.profile = f"{args.profile}@{args.render_scale:g}x"
+
+    baselines = {}
+    if os.path.exists(args.baseline_file):
+        with open(args.baseline_file) as f:
+            baselines = json.load(f)
+
+    if args.save_baseline:
+        baselines.setdefault(args.profile, {}).update(results)
+        with open(args.baseline_file, 'w') as f:
+            json.dump(baselines, f, indent=2)
+        print(f"Saved baseline for profile '{args.profile}' to {args.baseline_file}")
+        return 0
+
+    if args.profile not in baselines:
+        print(f"No baseline for profile '{args.profile}' - run with --save-baseline first")
+        return 0
+
+    regressions = compare(results, baselines[args.profile])
+    for name, metric, old, new in regressions:
+        print(f"REGRESSION {name} {metric}: {old:.3f} -> {new:.3f}")
+    if regressions:
+        return 1
+    print(f"No regressions against profile '{args.profile}'")
+    return 0
+
+
+if __name__ == "__main__":
+    exit_code = main_cli()
+    pygame.quit()
+    raise SystemExit(exit_code)
@@ -0,0 +1,110 @@
+"""
+Headless comparison of Road Fighter's bots.
+
+Plays runs with each driver - no input, the attract mode's autopilot and
+the look-ahead planner - from the same seeds, and reports how long each
+survived, its score, hits and fuel pickups. For the planner it also
+reports the time spent planning against the frame budget: a plan has to
+fit in one frame on one core.
+
+    python bot_benchmark.py                      # three seeds, up to five minutes of play each
+    python bot_benchmark.py --seeds 10 --frames 36000
+    python bot_benchmark.py --bots planner --budget-ms 4
+
+Traffic comes from the game's random stream, which no bot draws from, so
+every bot meets the same traffic until its driving makes a difference.
+"""
+
+import argparse
+import time
+
+from headless import create_game, main, pygame
+from autopilot import Autopilot
+from benchmark import percentile
+from planner import PLAN_BUDGET, Planner, PlannerBot
+from sim_state import InputKeys
+
+BOTS = ('none', 'autopilot', 'planner')
+
+
+class Idle:
+    """A driver that never touches the controls"""
+
+    keys = InputKeys()
+
+    def reset(self):
+        pass
+
+    def __getitem__(self, key):
+        return False
+
+    def drive(self, game):
+        pass
+
+
+def make_bot(name, budget):
+    if name == 'none':
+        return Idle()
+    if name == 'autopilot':
+        return Autopilot()
+    return PlannerBot(Planner(budget=budget))
+
+
+def play(bot, seed, frames):
+    """Play one run with `bot`; its results and the seconds each drive() took"""
+    game = create_game(seed)
+    game.start_game()
+    bot.reset()
+    hits = pickups = 0
+    drive_times = []
+    frame = 0
+    while frame < frames and game.state == "GAME":
+        start = time.perf_counter()
+        bot.drive(game)
+        drive_times.append(time.perf_counter() - start)
+        fuel = game.fuel
+        game.update_game(bot)
+        frame += 1
+        if game.damage_flash == 30:
+            hits += 1
+        elif game.fuel > fuel:
+            pickups += 1
+    return {'frames': frame, 'score': game.score, 'hits': hits, 'pickups': pickups}, drive_times
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seeds", type=int, default=3, help="runs per bot, seeded 0..N-1")
+    parser.add_argument("--frames", type=int, default=5 * 60 * main.FPS, help="longest run in frames")
+    parser.add_argument("--bots", nargs="+", choices=BOTS, default=list(BOTS))
+    parser.add_argument("--budget-ms", type=float, default=PLAN_BUDGET * 1000, help="planner time per plan")
+    args = parser.parse_args()
+
+    frame_ms = 1000.0 / main.FPS
+    print(f"{'bot':<10} {'seed':>4} {'frames':>7} {'score':>6} {'hits':>5} {'pickups':>7}")
+    for name in args.bots:
+        totals = {'frames': 0, 'score': 0, 'hits': 0, 'pickups': 0}
+        drive_times = []
+        for seed in range(args.seeds):
+            result, times = play(make_bot(name, args.budget_ms / 1000), seed, args.frames)
+            drive_times.extend(times)
+            for key in totals:
+                totals[key] += result[key]
+            print(f"{name:<10} {seed:>4} {result['frames']:>7} {result['score']:>6} {result['hits']:>5} "
+                  f"{result['pickups']:>7}")
+        runs = args.seeds
+        print(f"{name:<10} {'mean':>4} {totals['frames'] / runs:>7.0f} {totals['score'] / runs:>6.0f} "
+              f"{totals['hits'] / runs:>5.1f} {totals['pickups'] / runs:>7.1f}")
+        if name == 'planner':
+            # Steps between plans only compare a counter; the plans are the slow ones
+            ordered = sorted(t * 1000 for t in drive_times)
+            over = sum(t > frame_ms for t in ordered)
+            print(f"{'':<10} drive ms p50 {percentile(ordered, 0.50):.3f}  p95 {percentile(ordered, 0.95):.3f}  "
+                  f"max {ordered[-1]:.3f}  over the {frame_ms:.1f} ms frame: {over}")
+    return 0
+
+
+if __name__ == "__main__":
+    exit_code = main_cli()
+    pygame.quit()
+    raise SystemExit(exit_code)
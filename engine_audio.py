@@ -0,0 +1,163 @@
+import math
+import wave
+import pygame
+from game_log import get_logger
+
+try:
+    import numpy as np
+except ImportError:  # pygame.sndarray needs numpy too, so engine audio is simply disabled
+    np = None
+
+log = get_logger('audio')
+
+# Channels 0-1 are reserved by MusicManager, the engine loops use the next two
+ENGINE_CHANNELS = (2, 3)
+
+# Rendered banks keyed by (path, mixer format, steps, pitch range) so a new Game reuses them
+_bank_cache = {}
+
+
+def load_loop(path, loop_seconds=0.5, seam_seconds=0.05):
+    """Read a WAV file and turn its start into a seamless loop (float32, frames x channels)"""
+    with wave.open(path, 'rb') as wav_file:
+        if wav_file.getsampwidth() != 2:
+            raise ValueError(f"{path} must be 16-bit PCM")
+        rate = wav_file.getframerate()
+        channels = wav_file.getnchannels()
+        frames = wav_file.readframes(wav_file.getnframes())
+
+    samples = np.frombuffer(frames, dtype='<i2').astype(np.float32).reshape(-1, channels)
+    loop_length = min(len(samples), int(loop_seconds * rate))
+    seam = min(int(seam_seconds * rate), loop_length // 2)
+
+    # Crossfade the tail into the head so the loop point doesn't click
+    loop = samples[:loop_length - seam].copy()
+    if seam:
+        fade = np.linspace(0.0, 1.0, seam, dtype=np.float32)[:, None]
+        loop[:seam] = loop[:seam] * fade + samples[loop_length - seam:loop_length] * (1.0 - fade)
+    return loop, rate
+
+
+def render_pitch_bank(loop, source_rate, mixer_rate, mixer_channels, ratios):
+    """Resample one loop to every pitch ratio at once, returning int16 arrays ready for sndarray"""
+    # Normalize so the quiet legacy engine file sits at a usable level
+    peak = float(np.abs(loop).max()) or 1.0
+    loop = loop * (26000.0 / peak)
+
+    # Append the first frame so interpolation wraps around the loop seamlessly
+    wrapped = np.vstack([loop, loop[:1]])
+    source_length = len(loop)
+    source_index = np.arange(len(wrapped), dtype=np.float64)
+
+    bank = []
+    for ratio in ratios:
+        step = ratio * source_rate / mixer_rate
+        out_length = max(1, int(round(source_length / step)))
+        # Stretch the step slightly so the output is a whole number of frames long
+        positions = np.arange(out_length, dtype=np.float64) * (source_length / out_length)
+        channels = [np.interp(positions, source_index, wrapped[:, c]) for c in range(wrapped.shape[1])]
+        resampled = np.stack(channels, axis=1)
+
+        # Match the mixer's channel layout
+        if mixer_channels == 1:
+            resampled = resampled.mean(axis=1)
+        elif resampled.shape[1] != mixer_channels:
+            resampled = np.repeat(resampled[:, :1], mixer_channels, axis=1)
+
+        bank.append(np.ascontiguousarray(np.clip(resampled, -32768, 32767).astype(np.int16)))
+    return bank
+
+
+class EngineSound:
+    """Speed-reactive engine hum built from a pre-rendered bank of pitched loops.
+
+    Nothing is resampled while playing: each frame picks the two bank entries
+    around the current speed and sets their channel volumes for an
+    equal-power crossfade.
+    """
+
+    def __init__(self, path="sounds/engine.wav", min_speed=2, max_speed=5,
+                 min_pitch=1.0, max_pitch=2.0, steps=8, volume=0.25):
+        self.min_speed = min_speed
+        self.max_speed = max_speed
+        self.volume = volume
+        self.enabled = False
+        self.sounds = []
+        self.playing = False
+
+        if np is None:
+            log.info("Engine sound disabled - numpy not available")
+            return
+
+        mixer_rate, _, mixer_channels = pygame.mixer.get_init()
+        ratios = [min_pitch + (max_pitch - min_pitch) * i / (steps - 1) for i in range(steps)]
+        key = (path, mixer_rate, mixer_channels, tuple(ratios))
+
+        try:
+            if key not in _bank_cache:
+                loop, source_rate = load_loop(path)
+                _bank_cache[key] = render_pitch_bank(loop, source_rate, mixer_rate, mixer_channels, ratios)
+            self.sounds = [pygame.sndarray.make_sound(samples) for samples in _bank_cache[key]]
+        except Exception as e:
+            log.warning("Could not build engine sound bank from %s: %s", path, e)
+            return
+
+        if pygame.mixer.get_num_channels() < 8:
+            pygame.mixer.set_num_channels(8)
+        pygame.mixer.set_reserved(ENGINE_CHANNELS[-1] + 1)
+        self.channels = [pygame.mixer.Channel(c) for c in ENGINE_CHANNELS]
+
+        # Bank index playing on each channel and the last volume sent to it
+        self.channel_index = [None, None]
+        self.channel_volume = [-1.0, -1.0]
+        self.enabled = True
+        log.info("Engine sound bank ready: %d pitches from %s", steps, path)
+
+    def _assign(self, slot, index):
+        """Loop bank entry `index` on channel `slot` (restarted only when it changes)"""
+        if self.channel_index[slot] != index:
+            self.channels[slot].set_volume(0.0)
+            self.channels[slot].play(self.sounds[index], loops=-1)
+            self.channel_index[slot] = index
+            self.channel_volume[slot] = 0.0
+
+    def _set_volume(self, slot, volume):
+        # Quantize so steady speed issues no mixer calls at all
+        volume = round(volume * 64) / 64
+        if volume != self.channel_volume[slot]:
+            self.channels[slot].set_volume(volume)
+            self.channel_volume[slot] = volume
+
+    def update(self, speed):
+        """Crossfade the bank for the current speed, or silence it when speed is None"""
+        if not self.enabled:
+            return
+
+        if speed is None:
+            if self.playing:
+                for channel in self.channels:
+                    channel.fadeout(200)
+                self.channel_index = [None, None]
+                self.channel_volume = [-1.0, -1.0]
+                self.playing = False
+            return
+        self.playing = True
+
+        # Fractional position of this speed inside the bank
+        span = self.max_speed - self.min_speed
+        position = (min(max(speed, self.min_speed), self.max_speed) - self.min_speed) / span
+        position *= len(self.sounds) - 1
+        lower = min(int(position), len(self.sounds) - 2)
+        blend = position - lower
+
+        # Keep whichever channel already plays one of the two needed pitches
+        if self.channel_index[1] == lower or self.channel_index[0] == lower + 1:
+            low_slot, high_slot = 1, 0
+        else:
+            low_slot, high_slot = 0, 1
+        self._assign(low_slot, lower)
+        self._assign(high_slot, lower + 1)
+
+        # Equal-power crossfade between the adjacent pitches
+        self._set_volume(low_slot, self.volume * math.cos(blend * math.pi / 2))
+        self._set_volume(high_slot, self.volume * math.sin(blend * math.pi / 2))
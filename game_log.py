@@ -0,0 +1,246 @@
+"""
+Lightweight leveled logging for Road Fighter.
+
+Messages are recorded with %-style arguments and only formatted when they
+are actually written out, on a background thread, so a slow console never
+stalls the game loop. Every enabled record also lands in an in-memory ring
+buffer that is dumped to disk if the game crashes.
+
+Usage:
+    from game_log import get_logger
+    log = get_logger('audio')
+    log.debug("Playing sound: %s", sound_name)
+
+While the game loop runs, console output is deferred instead: records
+wait in a bounded queue and flush_pending() writes a batch of them in idle
+time (see scheduler.py), so the writer thread never competes with a frame
+for the interpreter. If the queue fills up, the oldest lines are dropped
+from the console; the crash ring still has them.
+
+Disabled levels are bound to a no-op, so a filtered call costs one empty
+function call and never formats anything. For code that has to build its
+arguments, guard it with `if log.debug_enabled:`.
+
+Configuration comes from environment variables (or configure()):
+    ROADFIGHTER_LOG=info,audio=debug,perf=off   default and per-category levels
+    ROADFIGHTER_LOG_CONSOLE=info                minimum level echoed to the console
+"""
+
+import atexit
+import collections
+import os
+import queue
+import sys
+import threading
+import time
+import traceback
+
+DEBUG = 10
+INFO = 20
+WARNING = 30
+ERROR = 40
+OFF = 100
+
+LEVEL_NAMES = {DEBUG: 'DEBUG', INFO: 'INFO', WARNING: 'WARNING', ERROR: 'ERROR'}
+LEVELS_BY_NAME = {'debug': DEBUG, 'info': INFO, 'warning': WARNING, 'error': ERROR, 'off': OFF}
+
+CRASH_LOG_FILE = "crash_log.txt"
+PENDING_LIMIT = 4096  # Console records held while output is deferred
+FLUSH_BATCH = 32  # Records written per flush_pending() call
+
+
+def _noop(*args, **kwargs):
+    pass
+
+
+class _Writer:
+    """Formats and prints records on a daemon thread"""
+
+    def __init__(self, stream=None):
+        self.stream = stream or sys.stdout
+        self.queue = queue.SimpleQueue()
+        self.thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+        self.thread.start()
+
+    def _run(self):
+        while True:
+            record = self.queue.get()
+            if record is None:
+                break
+            try:
+                self.stream.write(format_record(record) + "\n")
+                self.stream.flush()
+            except Exception:
+                pass
+
+    def close(self):
+        self.queue.put(None)
+        self.thread.join(timeout=1.0)
+
+
+def format_record(record):
+    """Turn a (timestamp, level, category, message, args) record into a line of text"""
+    timestamp, level, category, message, args = record
+    if args:
+        try:
+            message = message % args
+        except Exception:
+            message = f"{message} {args!r}"
+    return f"{timestamp:10.3f} {LEVEL_NAMES.get(level, level):7} [{category}] {message}"
+
+
+class CategoryLogger:
+    """Logger for one category; its level methods are rebound whenever the config changes"""
+
+    def __init__(self, category, registry):
+        self.category = category
+        self.registry = registry
+        self.level = INFO
+        self.debug_enabled = False
+        self.info_enabled = False
+        self.debug = self.info = self.warning = self.error = _noop
+
+    def _bind(self, level):
+        self.level = level
+        for name, value in (('debug', DEBUG), ('info', INFO), ('warning', WARNING), ('error', ERROR)):
+            setattr(self, name, self._make_emitter(value) if value >= level else _noop)
+        self.debug_enabled = DEBUG >= level
+        self.info_enabled = INFO >= level
+
+    def _make_emitter(self, level):
+        registry = self.registry
+        category = self.category
+
+        def emit(message, *args):
+            registry.emit(level, category, message, args)
+        return emit
+
+    def exception(self, message, *args):
+        """Log an error with the current traceback appended"""
+        if ERROR >= self.level:
+            self.registry.emit(ERROR, self.category, message + "\n" + traceback.format_exc().rstrip(), args)
+
+
+class LogRegistry:
+    def __init__(self, ring_size=2048):
+        self.default_level = INFO
+        self.category_levels = {}
+        self.console_level = INFO
+        self.ring = collections.deque(maxlen=ring_size)
+        self.loggers = {}
+        self.writer = None
+        self.pending = None  # Console records waiting for flush_pending(), while deferred
+        self.start_time = time.perf_counter()
+
+    def configure(self, level=None, console_level=None, categories=None, ring_size=None):
+        """Change levels at runtime and rebind every logger"""
+        if level is not None:
+            self.default_level = level
+        if console_level is not None:
+            self.console_level = console_level
+        if categories:
+            self.category_levels.update(categories)
+        if ring_size is not None and ring_size != self.ring.maxlen:
+            self.ring = collections.deque(self.ring, maxlen=ring_size)
+        for logger in self.loggers.values():
+            logger._bind(self.category_levels.get(logger.category, self.default_level))
+
+    def configure_from_env(self):
+        """Apply ROADFIGHTER_LOG / ROADFIGHTER_LOG_CONSOLE if set"""
+        spec = os.environ.get("ROADFIGHTER_LOG", "")
+        categories = {}
+        level = None
+        for part in filter(None, (p.strip() for p in spec.split(','))):
+            if '=' in part:
+                name, value = part.split('=', 1)
+                if value.lower() in LEVELS_BY_NAME:
+                    categories[name.strip()] = LEVELS_BY_NAME[value.lower()]
+            elif part.lower() in LEVELS_BY_NAME:
+                level = LEVELS_BY_NAME[part.lower()]
+        console = LEVELS_BY_NAME.get(os.environ.get("ROADFIGHTER_LOG_CONSOLE", "").lower())
+        self.configure(level=level, console_level=console, categories=categories)
+
+    def get_logger(self, category):
+        logger = self.loggers.get(category)
+        if logger is None:
+            logger = CategoryLogger(category, self)
+            logger._bind(self.category_levels.get(category, self.default_level))
+            self.loggers[category] = logger
+        return logger
+
+    def emit(self, level, category, message, args):
+        record = (time.perf_counter() - self.start_time, level, category, message, args)
+        self.ring.append(record)
+        if level >= self.console_level:
+            if self.pending is not None:
+                self.pending.append(record)
+                return
+            if self.writer is None:
+                self.writer = _Writer()
+            self.writer.queue.put(record)
+
+    def dump(self, path):
+        """Write the ring buffer to a file, oldest record first"""
+        with open(path, 'w') as f:
+            for record in list(self.ring):
+                f.write(format_record(record) + "\n")
+
+    def defer_console(self, limit=PENDING_LIMIT):
+        """Hold console records until flush_pending() writes them"""
+        if self.pending is None:
+            self.pending = collections.deque(maxlen=limit)
+
+    def flush_pending(self, limit=FLUSH_BATCH):
+        """Write up to `limit` deferred records to the console; True if more are waiting"""
+        pending = self.pending
+        if not pending:
+            return False
+        stream = sys.stdout
+        try:
+            for _ in range(min(limit, len(pending))):
+                stream.write(format_record(pending.popleft()) + "\n")
+            stream.flush()
+        except Exception:
+            pass
+        return bool(pending)
+
+    def shutdown(self):
+        """Drain pending console output (called at exit)"""
+        if self.pending is not None:
+            while self.flush_pending(len(self.pending)):
+                pass
+            self.pending = None
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = None
+
+    def install_crash_handler(self, path=CRASH_LOG_FILE):
+        """Dump the ring buffer to `path` when an exception escapes the game"""
+        previous_hook = sys.excepthook
+
+        def crash_hook(exc_type, exc, tb):
+            self.emit(ERROR, 'crash', "Unhandled exception:\n%s",
+                      (''.join(traceback.format_exception(exc_type, exc, tb)).rstrip(),))
+            try:
+                self.dump(path)
+                sys.stderr.write(f"Crash log written to {path}\n")
+            except Exception:
+                pass
+            self.shutdown()
+            previous_hook(exc_type, exc, tb)
+
+        sys.excepthook = crash_hook
+
+
+registry = LogRegistry()
+registry.configure_from_env()
+atexit.register(registry.shutdown)
+
+
+def get_logger(category):
+    """Get the shared logger for a category (e.g. 'audio', 'assets', 'scores')"""
+    return registry.get_logger(category)
+
+
+def configure(**kwargs):
+    registry.configure(**kwargs)
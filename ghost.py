@@ -0,0 +1,152 @@
+"""
+Ghost car for Road Fighter: the best run, driven again beside the player.
+
+While a run is played, GhostRecorder keeps the player's position and the
+road scroll for every simulation step, quantized to 1/QUANTA of a logical
+pixel. The course is the same every run, so a ghost drawn where the best
+run's player was, relative to how far each run's road has scrolled, is a
+car to race.
+
+When a run takes the top score, ScoreManager writes its recording next to
+the high scores file. Each channel (x, y, scroll) is stored as one signed
+byte per step: the change since the previous step. The player moves a few
+pixels a step, so changes fit a byte; the encoder keeps track of the value
+the decoder will rebuild, so a jump too large for one byte is caught up
+over the next steps instead of drifting. The channels are stored one after
+the other and zlib compressed, which does well on the scroll channel (the
+same change for long stretches) and on a car holding its lane.
+
+Decoded runs are plain arrays, so finding the ghost for a step is one
+index. Loading happens on a worker thread and the ghost appears once it is
+ready; starting a run never waits for it.
+"""
+
+import itertools
+import os
+import struct
+import threading
+import time
+import zlib
+from array import array
+
+from game_log import get_logger
+from profiler import tracer
+
+log = get_logger('scores')
+
+MAGIC = b'RFGHOST1'
+HEADER = struct.Struct('<8sIiii')  # Magic, steps, then the first value of each channel
+QUANTA = 2  # Recorded units per logical pixel
+MAX_DELTA = 127
+ENCODE_SLICE = 1024  # Steps encoded per idle-time slice
+DECODE_BLOCK = 4096  # Steps decoded between chances for the frame thread to take the GIL
+GHOST_ALPHA = 110
+
+
+class GhostRecorder:
+    """Quantized player positions and road scroll, one entry per simulation step"""
+
+    def __init__(self):
+        self.x = array('i')
+        self.y = array('i')
+        self.scroll = array('i')
+
+    def __len__(self):
+        return len(self.x)
+
+    def clear(self):
+        del self.x[:]
+        del self.y[:]
+        del self.scroll[:]
+
+    def record(self, x, y, scroll):
+        self.x.append(round(x * QUANTA))
+        self.y.append(round(y * QUANTA))
+        self.scroll.append(round(scroll * QUANTA))
+
+    def copy(self):
+        recording = GhostRecorder()
+        recording.x = array('i', self.x)
+        recording.y = array('i', self.y)
+        recording.scroll = array('i', self.scroll)
+        return recording
+
+    def encode(self):
+        """Generator writing the ghost file bytes into `self.encoded`, one slice of steps per next()"""
+        channels = (self.x, self.y, self.scroll)
+        deltas = [array('b') for _ in channels]
+        rebuilt = [channel[0] if channel else 0 for channel in channels]
+        for start in range(0, len(self), ENCODE_SLICE):
+            for i, channel in enumerate(channels):
+                out = deltas[i]
+                value = rebuilt[i]
+                for target in channel[start:start + ENCODE_SLICE]:
+                    delta = max(-MAX_DELTA, min(MAX_DELTA, target - value))
+                    out.append(delta)
+                    value += delta
+                rebuilt[i] = value
+            yield
+        header = HEADER.pack(MAGIC, len(self), *(channel[0] if channel else 0 for channel in channels))
+        self.encoded = header + zlib.compress(b''.join(d.tobytes() for d in deltas), 9)
+
+
+def decode(data, pause=None):
+    """(x, y, scroll) arrays in quanta from ghost file bytes, calling `pause` between blocks of steps"""
+    magic, steps, *starts = HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError("not a ghost file")
+    payload = zlib.decompress(data[HEADER.size:])
+    if len(payload) != steps * 3:
+        raise ValueError(f"ghost file holds {len(payload)} deltas, expected {steps * 3}")
+    channels = []
+    for i, value in enumerate(starts):
+        channel = array('i')
+        for start in range(i * steps, (i + 1) * steps, DECODE_BLOCK):
+            values = itertools.accumulate(array('b', payload[start:min(start + DECODE_BLOCK, (i + 1) * steps)]),
+                                          initial=value)
+            next(values)  # The initial value, already in the channel (or the header)
+            channel.extend(values)
+            value = channel[-1]
+            if pause is not None:
+                pause()
+        channels.append(channel)
+    return channels
+
+
+class GhostRun:
+    """A recorded run to race, loaded on a worker thread when given a path"""
+
+    def __init__(self, path=None, recording=None):
+        self.steps = 0  # Set last, once the channels below are complete
+        self.x = self.y = self.scroll = None
+        if recording is not None:
+            self.x, self.y, self.scroll = recording.x, recording.y, recording.scroll
+            self.steps = len(recording)
+        elif path is not None:
+            threading.Thread(target=self._load, args=(path,), name="ghost-load", daemon=True).start()
+
+    def _load(self, path):
+        try:
+            with tracer.span('ghost.load', path):
+                with open(path, 'rb') as f:
+                    data = f.read()
+                # sleep(0) hands the GIL to the frame thread between blocks
+                self.x, self.y, self.scroll = decode(data, pause=lambda: time.sleep(0))
+            self.steps = len(self.x)
+            log.info("Loaded ghost run (%d steps) from %s", self.steps, path)
+        except Exception as e:
+            log.warning("Could not load ghost run %s: %s", path, e)
+
+    def position(self, step, scroll):
+        """Logical (x, y) of the ghost at a step, for a road scrolled to `scroll`; None past its end"""
+        if step >= self.steps:
+            return None
+        return self.x[step] / QUANTA, (self.y[step] - self.scroll[step]) / QUANTA + scroll
+
+
+def write_ghost(path, data):
+    # Written beside the old file and swapped in, so a crash never leaves half a ghost
+    temp_path = path + '.tmp'
+    with open(temp_path, 'wb') as f:
+        f.write(data)
+    os.replace(temp_path, path)
@@ -0,0 +1,314 @@
+"""
+Golden-frame render verification for Road Fighter.
+
+Renders deterministic scenes headlessly and diffs them pixel by pixel.
+By default every scene is drawn twice - once through the reference path
+(the straightforward drawing code, with every optimization in
+REFERENCE_PATHS swapped out) and once through the optimized path the game
+actually uses - so rendering optimizations can be checked against the code
+they replace. Renders can also be saved and compared across commits.
+
+    python golden_frames.py                        # reference vs optimized, every scene
+    python golden_frames.py --scene game_fallback  # one scene
+    python golden_frames.py --save golden          # store optimized renders as PNGs
+    python golden_frames.py --against golden       # compare with stored renders
+
+--tolerance is the per-pixel color distance (0-1, as used by
+PixelArray.compare) below which two pixels count as equal. For every scene
+with more than --max-pixels differing pixels, the two renders and a diff
+image (differences in red over a dimmed frame) are written to --diff-dir.
+Exits with status 1 if any scene differs.
+"""
+
+import argparse
+import contextlib
+import os
+
+from headless import create_game, key_event, main, pygame
+from scenery import SCENERY_LAYERS, STRIP_HEIGHT
+
+DIFF_DIR = "golden_diffs"
+DEFAULT_TOLERANCE = 0.02
+DIFF_COLOR = (255, 0, 0)
+DIM_COLOR = (90, 90, 90)
+
+
+# Reference implementations of optimized drawing code. Each entry is
+# (owner, attribute, reference function); reference_rendering() swaps them in.
+
+def reference_render_text(self, font, text, color):
+    return font.render(text, True, color)
+
+
+def reference_render_value(self, slot, font, value, template, color):
+    return font.render(template.format(value), True, color)
+
+
+def reference_draw_cars(self):
+    # One blit (or one set of shape draws) per car, in list order
+    if not (self.damage_flash > 0 and self.damage_flash % 6 < 3):
+        self.player.draw(self.screen, self.control_loss, self.spin_angle, self.view)
+    for car in self.enemy_cars:
+        car.draw(self.screen, self.view)
+
+
+def reference_draw_road(self):
+    # Every visible chunk drawn with shapes instead of blitting its baked surface
+    track = self.track
+    for index, top in track.visible(self.road_offset):
+        chunk = track.chunks[index]
+        main.draw_chunk(self.screen, self.view, chunk, self.road_detail, self.view.pt(chunk.x0, top))
+
+
+def reference_draw_scenery(self):
+    # Every tile blitted where its strip would put it, instead of the baked strips
+    scenery = self.scenery
+    pt = self.view.pt
+    for layer, layout, tiles in list(zip(SCENERY_LAYERS, scenery.layouts, scenery.tiles))[:self.scenery_layers]:
+        if 'fill' in layer:
+            self.screen.fill(layer['fill'])
+        y = scenery.offset(layer, self.road_offset)
+        for left, width, placements in layout:
+            for strip_y in (y, y - STRIP_HEIGHT):
+                for index, x, tile_y in placements:
+                    self.screen.blit(tiles[index], pt(left + x, strip_y + tile_y))
+
+
+def reference_draw_particles(self):
+    # One blit per particle, positioned through the view
+    particles = self.particles
+    pt = self.view.pt
+    for i, index in enumerate(particles.sprite_indices().tolist()):
+        sprite = particles.sprites[index]
+        half = sprite.get_width() // 2
+        x, y = pt(float(particles.x[i]), float(particles.y[i]))
+        self.screen.blit(sprite, (x - half, y - half))
+
+
+REFERENCE_PATHS = [
+    (main.Game, 'draw_scenery', reference_draw_scenery),
+    (main.Game, 'draw_road', reference_draw_road),
+    (main.Game, 'render_text', reference_render_text),
+    (main.Game, 'render_value', reference_render_value),
+    (main.Game, 'draw_cars', reference_draw_cars),
+    (main.Game, 'draw_particles', reference_draw_particles),
+]
+
+
+@contextlib.contextmanager
+def reference_rendering():
+    """Draw with the reference implementations for the duration of the block"""
+    saved = [(owner, name, owner.__dict__[name]) for owner, name, _ in REFERENCE_PATHS]
+    try:
+        for owner, name, reference in REFERENCE_PATHS:
+            setattr(owner, name, reference)
+        yield
+    finally:
+        for owner, name, original in saved:
+            setattr(owner, name, original)
+
+
+# Scenes: setup(game) builds a fixed frame on a freshly seeded game
+
+def add_traffic(game, sprite_manager):
+    # One of every car, including both zigzag directions and a moving fuel truck
+    cars = [
+        main.EnemyCar(450, 120, 'normal', 'static', sprite_manager),
+        main.EnemyCar(550, 260, 'normal', 'reactive', sprite_manager),
+        main.EnemyCar(650, 180, 'normal', 'zigzag', sprite_manager),
+        main.EnemyCar(750, 330, 'normal', 'zigzag', sprite_manager),
+        main.EnemyCar(800, 80, 'fuel', 'fuel_station', sprite_manager),
+        main.EnemyCar(950, 420, 'fuel', 'static', sprite_manager),
+    ]
+    cars[2].zigzag_direction = 1
+    cars[3].zigzag_direction = -1
+    game.enemy_cars = cars
+
+
+def setup_game(game):
+    game.start_game()
+    add_traffic(game, game.sprite_manager)
+    game.fuel = 55.5
+    game.score = 1230
+    game.distance = 87.3
+    game.speed = 3.2
+    game.road_offset = 12
+
+
+def setup_game_fallback(game):
+    # Sprites missing: the optimized path blits baked fallbacks, the reference draws shapes
+    setup_game(game)
+    for car in game.enemy_cars + [game.player]:
+        car.sprite = None
+
+
+def setup_game_damage(game):
+    setup_game(game)
+    game.damage_flash = 4  # A frame where the player is hidden by the flash
+    game.control_loss = 20
+    game.spin_angle = 135
+    game.fuel = 12
+    game.play_sound('collision')
+
+
+def setup_game_particles(game):
+    # Every kind of particle at several ages
+    setup_game(game)
+    particles = game.particles
+    particles.crash(600, 500, 3)
+    particles.pickup(800, 300)
+    for _ in range(12):
+        particles.update(game.speed, main.SCREEN_WIDTH, main.SCREEN_HEIGHT)
+        particles.stream(main.EXHAUST, game.player.x, game.player.y + 30, 2, 10, main.EXHAUST_HEADING,
+                         main.EXHAUST_ANGLE)
+    particles.crash(450, 650, 1)
+
+
+def setup_game_ghost(game):
+    # The best run a little ahead of the player, on a road scrolled as far as this one
+    setup_game(game)
+    recording = main.GhostRecorder()
+    for step in range(40):
+        recording.record(600 + step * 0.5, 620 - step * 2.25, step * 3)
+    game.ghost = main.GhostRun(recording=recording)
+    game.run_steps = 40
+    game.road_offset = 39 * 3
+
+
+def setup_game_spin(game):
+    setup_game(game)
+    game.control_loss = 30
+    game.spin_angle = 75
+
+
+def setup_attract(game):
+    # The demo run, drawn as the game plus its prompt
+    game.set_state("MENU")
+    game.start_attract()
+    add_traffic(game, game.sprite_manager)
+    game.road_offset = 12
+
+
+def setup_pause(game):
+    setup_game(game)
+    game.handle_event(key_event(pygame.K_ESCAPE))
+
+
+def setup_menu(game):
+    game.set_state("MENU")
+    game.menu_selection = 1
+
+
+def setup_game_over(game):
+    setup_game(game)
+    game.high_score = 4560
+    game.game_over()
+
+
+SCENES = {
+    'menu': setup_menu,
+    'how_to_play': lambda game: game.show_how_to_play(),
+    'credits': lambda game: game.set_state("CREDITS"),
+    'game': setup_game,
+    'game_fallback': setup_game_fallback,
+    'game_damage': setup_game_damage,
+    'game_spin': setup_game_spin,
+    'game_particles': setup_game_particles,
+    'game_ghost': setup_game_ghost,
+    'attract': setup_attract,
+    'pause': setup_pause,
+    'game_over': setup_game_over,
+}
+
+
+def render_scene(name, frames=2, render_scale=1.0):
+    """Draw a scene and return a copy of the game surface
+
+    Drawing more than once makes cached paths serve the frame from their
+    caches, which is the path a running game takes.
+    """
+    game = create_game(render_scale=render_scale)
+    SCENES[name](game)
+    for _ in range(frames):
+        game.draw()
+    return game.screen.copy()
+
+
+def compare_surfaces(expected, actual, tolerance):
+    """Return (differing pixel count, mask of differing pixels)"""
+    if expected.get_size() != actual.get_size():
+        raise ValueError(f"size mismatch: {expected.get_size()} vs {actual.get_size()}")
+    # compare() marks equal pixels white and differing pixels black
+    result = pygame.PixelArray(expected).compare(pygame.PixelArray(actual), distance=tolerance)
+    marked = result.make_surface()
+    result.close()
+    mask = pygame.mask.from_threshold(marked, (0, 0, 0), (1, 1, 1, 255))
+    return mask.count(), mask
+
+
+def diff_image(actual, mask):
+    image = actual.copy()
+    image.fill(DIM_COLOR, special_flags=pygame.BLEND_MULT)
+    mask.to_surface(image, setcolor=DIFF_COLOR, unsetcolor=None)
+    return image
+
+
+def write_diff(diff_dir, name, expected, actual, mask):
+    os.makedirs(diff_dir, exist_ok=True)
+    pygame.image.save(expected, os.path.join(diff_dir, f"{name}_expected.png"))
+    pygame.image.save(actual, os.path.join(diff_dir, f"{name}_actual.png"))
+    path = os.path.join(diff_dir, f"{name}_diff.png")
+    pygame.image.save(diff_image(actual, mask), path)
+    return path
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scene", action="append", choices=sorted(SCENES), help="only this scene (repeatable)")
+    parser.add_argument("--save", metavar="DIR", help="save optimized renders as golden PNGs")
+    parser.add_argument("--against", metavar="DIR", help="compare with golden PNGs instead of the reference path")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    parser.add_argument("--max-pixels", type=int, default=0, help="differing pixels allowed per scene")
+    parser.add_argument("--diff-dir", default=DIFF_DIR)
+    parser.add_argument("--render-scale", type=float, choices=main.RENDER_SCALES, default=1.0)
+    args = parser.parse_args()
+
+    failures = 0
+    for name in args.scene or SCENES:
+        actual = render_scene(name, render_scale=args.render_scale)
+        if args.save:
+            os.makedirs(args.save, exist_ok=True)
+            pygame.image.save(actual, os.path.join(args.save, f"{name}.png"))
+            print(f"{name:<15} saved")
+            continue
+
+        if args.against:
+            path = os.path.join(args.against, f"{name}.png")
+            if not os.path.exists(path):
+                print(f"{name:<15} no golden image at {path}")
+                failures += 1
+                continue
+            expected = pygame.image.load(path).convert(actual)
+        else:
+            with reference_rendering():
+                expected = render_scene(name, render_scale=args.render_scale)
+
+        count, mask = compare_surfaces(expected, actual, args.tolerance)
+        if count > args.max_pixels:
+            path = write_diff(args.diff_dir, name, expected, actual, mask)
+            print(f"{name:<15} DIFFERS in {count} pixels - see {path}")
+            failures += 1
+        else:
+            print(f"{name:<15} ok ({count} pixels differ)")
+
+    if failures:
+        return 1
+    if not args.save:
+        print("All scenes match")
+    return 0
+
+
+if __name__ == "__main__":
+    exit_code = main_cli()
+    pygame.quit()
+    raise SystemExit(exit_code)
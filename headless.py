@@ -0,0 +1,79 @@
+"""
+Helpers for driving Game without a display or sound card.
+
+Import this module before main: it selects SDL's dummy video and audio
+drivers (unless they are already set) and changes into the project folder
+so sprites, fonts and sounds resolve as they do for `python main.py`.
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+PROJECT_DIR = os.path.dirname(os.path.abspath(__file__))
+os.chdir(PROJECT_DIR)
+if PROJECT_DIR not in sys.path:
+    sys.path.insert(0, PROJECT_DIR)
+
+import pygame  # noqa: E402
+import game_log  # noqa: E402
+
+# Tools print their own reports; keep routine game messages off the console
+if "ROADFIGHTER_LOG_CONSOLE" not in os.environ:
+    game_log.configure(console_level=game_log.WARNING)
+
+import main  # noqa: E402
+
+
+class ScriptedKeys:
+    """Stands in for pygame.key.get_pressed() with a set of held keys"""
+
+    def __init__(self):
+        self.held = set()
+
+    def __getitem__(self, key):
+        return key in self.held
+
+    def __call__(self):
+        return self
+
+    def press(self, *keys):
+        self.held = set(keys)
+
+    def release(self):
+        self.held = set()
+
+
+def create_game(seed=0, render_scale=1.0):
+    """Create a Game with scripted keys and a throwaway high score file"""
+    random.seed(seed)
+    game = main.Game(render_scale)
+    game.track.run_inline()  # Same road at the same frame on every run
+    game.keys = ScriptedKeys()
+    game.read_keys = game.keys
+    scores_file = os.path.join(tempfile.mkdtemp(prefix="roadfighter-"), "high_scores.json")
+    game.score_manager = main.ScoreManager(scores_file)
+    game.load_ghost()
+    game.high_score = 0
+    return game
+
+
+def key_event(key):
+    """Build a KEYDOWN event for the state event handlers"""
+    return pygame.event.Event(pygame.KEYDOWN, key=key, mod=0, unicode='', scancode=0)
+
+
+def run_frame(game):
+    """One iteration of Game.run without event polling or the frame limiter"""
+    start = time.perf_counter()
+    game.update()
+    game.draw()
+    if game.state == "GAME":
+        game.instant_replay.capture(game.screen, game.frame_count)
+    game.present()
+    game.scheduler.run(start + 1.0 / main.FPS - main.IDLE_TASK_MARGIN)
@@ -0,0 +1,114 @@
+"""
+Instant replay for Road Fighter: the last seconds of a run, kept as small
+compressed frames.
+
+While a run is played, every CAPTURE_EVERY-th drawn frame is scaled down
+to 1/DOWNSCALE of the game area (one nearest-neighbour scale into a
+reused surface, about 0.25 ms) and its pixels are queued. Compressing them
+is idle-time work: an IdleScheduler task deflates one queued frame in each
+frame with slack to spare (zlib level 1, under a millisecond, about 12 KB
+a frame). If no frame has slack for a while the queue fills and captures
+are skipped, so capturing never costs a frame more than the scale.
+
+Compressed frames sit in a ring that keeps the last REPLAY_SECONDS and
+never more than MEMORY_CAP bytes, dropping the oldest first. Each frame is
+compressed on its own rather than as a delta from the one before: a delta
+is about a quarter smaller, but playing back at any speed, or exporting,
+would then mean decoding forward from the last full frame.
+"""
+
+import collections
+import os
+import zlib
+
+import pygame
+
+from game_log import get_logger
+
+log = get_logger('display')
+
+REPLAY_SECONDS = 10
+CAPTURE_EVERY = 2  # Replays play back at 30 frames a second
+DOWNSCALE = 4
+MEMORY_CAP = 8 * 1024 * 1024  # Compressed bytes kept
+MAX_QUEUED = 8  # Captures waiting to be compressed before new ones are skipped
+COMPRESS_LEVEL = 1
+REPLAY_SPEEDS = (0.25, 0.5, 1.0, 2.0)
+EXPORT_DIR = "instant_replays"
+
+
+class InstantReplay:
+    def __init__(self, size, fps, seconds=REPLAY_SECONDS, memory_cap=MEMORY_CAP):
+        self.frame_size = (size[0] // DOWNSCALE, size[1] // DOWNSCALE)
+        self.capacity = seconds * fps // CAPTURE_EVERY  # Frames kept
+        self.fps = fps / CAPTURE_EVERY
+        self.memory_cap = memory_cap
+        self.frames = collections.deque()  # (frame number, compressed pixels), oldest first
+        self.bytes = 0  # Compressed bytes in `frames`
+        self.queued = collections.deque()  # (frame number, raw pixels) waiting for idle time
+        self.skipped = 0  # Captures dropped because the queue was full
+        self.scratch = None  # Capture target, in the screen's pixel format
+
+    def __len__(self):
+        return len(self.frames) + len(self.queued)
+
+    def clear(self):
+        self.frames.clear()
+        self.queued.clear()
+        self.bytes = 0
+
+    def capture(self, screen, frame_number):
+        """Queue a downscaled copy of the screen, every CAPTURE_EVERY frames"""
+        if frame_number % CAPTURE_EVERY:
+            return
+        if len(self.queued) >= MAX_QUEUED:
+            self.skipped += 1
+            return
+        scratch = self.scratch
+        if scratch is None or scratch.get_bitsize() != screen.get_bitsize():
+            # Frames are stored as raw pixels of this surface's format
+            self.clear()
+            scratch = self.scratch = pygame.Surface(self.frame_size, 0, screen)
+        pygame.transform.scale(screen, self.frame_size, scratch)
+        self.queued.append((frame_number, scratch.get_buffer().raw))
+
+    def compress_next(self):
+        """Compress one queued capture into the ring (an idle task)"""
+        if not self.queued:
+            return
+        frame_number, pixels = self.queued.popleft()
+        data = zlib.compress(pixels, COMPRESS_LEVEL)
+        frames = self.frames
+        frames.append((frame_number, data))
+        self.bytes += len(data)
+        while len(frames) > self.capacity or self.bytes > self.memory_cap:
+            self.bytes -= len(frames.popleft()[1])
+
+    def flush(self):
+        while self.queued:
+            self.compress_next()
+
+    def snapshot(self):
+        """Every kept frame, oldest first, for playback while capturing carries on"""
+        self.flush()
+        return list(self.frames)
+
+    def surface(self):
+        """A surface to decode frames into"""
+        return pygame.Surface(self.frame_size, 0, self.scratch)
+
+    def decode(self, data, surface):
+        surface.get_buffer().write(zlib.decompress(data), 0)
+
+    def export(self, frames, folder):
+        """Generator writing `frames` as numbered PNGs in `folder`, one per slice"""
+        try:
+            os.makedirs(folder, exist_ok=True)
+            surface = self.surface()
+            for i, (frame_number, data) in enumerate(frames):
+                self.decode(data, surface)
+                pygame.image.save(surface, os.path.join(folder, f"frame-{i:04d}.png"))
+                yield
+            log.info("Exported %d replay frames to %s", len(frames), folder)
+        except Exception as e:
+            log.error("Could not export replay to %s: %s", folder, e)
@@ -1,8 +1,37 @@
 import pygame
+import contextlib
+import copy
 import random
 import sys
 import os
 import json
+import time
+import game_log
+from game_log import get_logger
+from music_manager import MusicManager
+from engine_audio import EngineSound
+from perf_overlay import PerfOverlay
+from profiler import tracer, profile_session
+from scenes import Scene
+from pipeline import SimulationPipeline
+from scheduler import IdleScheduler, PRIORITY_HIGH, PRIORITY_LOW
+from render_queue import RenderQueue, LAYER_PLAYER, LAYER_TRAFFIC
+from render_scale import RENDER_SCALES, UNSCALED, View
+from quality import QualityController, TIER_NAMES, ROAD_FULL
+from track import Track, draw_chunk
+from scenery import Scenery
+from particles import ParticleSystem, EXHAUST, EXHAUST_HEADING, EXHAUST_ANGLE
+from ghost import GhostRecorder, GhostRun, GHOST_ALPHA, write_ghost
+from replay import InputLog, Replay, SEED_BITS, write_replay
+from autopilot import Autopilot
+from instant_replay import InstantReplay, CAPTURE_EVERY, EXPORT_DIR, REPLAY_SPEEDS
+
+# Loggers per category (levels configured through ROADFIGHTER_LOG, see game_log.py)
+audio_log = get_logger('audio')
+asset_log = get_logger('assets')
+score_log = get_logger('scores')
+display_log = get_logger('display')
+state_log = get_logger('game')
 
 # Initialize Pygame and mixer
 pygame.init()
@@ -11,42 +40,55 @@ try:
     pygame.mixer.pre_init(frequency=44100, size=-16, channels=2, buffer=1024)
     pygame.mixer.init()
     SOUND_ENABLED = True
-    print("Audio system initialized successfully!")
+    audio_log.info("Audio system initialized successfully!")
 except pygame.error as e:
-    print(f"Audio not available - running in silent mode: {e}")
+    audio_log.warning("Audio not available - running in silent mode: %s", e)
     SOUND_ENABLED = False
 
 class ScoreManager:
-    def __init__(self):
-        self.scores_file = "high_scores.json"
+    def __init__(self, scores_file="high_scores.json", scheduler=None):
+        self.scores_file = scores_file
+        self.scheduler = scheduler  # Saves wait for idle time when set
+        self.ghost_file = os.path.splitext(scores_file)[0] + "_ghost.bin"  # The best run's recording
+        self.replay_dir = os.path.splitext(scores_file)[0] + "_replays"  # Replays of the top 10 runs
         self.high_scores = self.load_scores()
     
     def load_scores(self):
         """Load high scores from file"""
         try:
             if os.path.exists(self.scores_file):
-                with open(self.scores_file, 'r') as f:
+                with tracer.span('load_scores', self.scores_file), open(self.scores_file, 'r') as f:
                     scores = json.load(f)
-                    print(f"Loaded {len(scores)} high scores")
+                    score_log.info("Loaded %d high scores", len(scores))
                     return scores
             else:
-                print("No high scores file found, starting fresh")
+                score_log.info("No high scores file found, starting fresh")
                 return []
         except Exception as e:
-            print(f"Error loading scores: {e}")
+            score_log.error("Error loading scores: %s", e)
             return []
     
     def save_scores(self):
         """Save high scores to file"""
         try:
-            with open(self.scores_file, 'w') as f:
+            with tracer.span('save_scores', self.scores_file), open(self.scores_file, 'w') as f:
                 json.dump(self.high_scores, f, indent=2)
-            print(f"Saved {len(self.high_scores)} high scores")
+            score_log.info("Saved %d high scores", len(self.high_scores))
         except Exception as e:
-            print(f"Error saving scores: {e}")
+            score_log.error("Error saving scores: %s", e)
+    
+    def request_save(self):
+        """Save now, or in the next frame with time to spare when a scheduler is attached"""
+        if self.scheduler is None:
+            self.save_scores()
+        else:
+            self.scheduler.add('save_scores', self.save_scores, PRIORITY_HIGH)
     
-    def add_score(self, score, distance):
-        """Add a new score and keep top 10"""
+    def add_score(self, score, distance, recording=None, replay=None):
+        """Add a new score and keep top 10; True if it is the new best and its recording was kept
+
+        A run that makes the top 10 keeps its replay (see replay.py) for verification.
+        """
         new_score = {
             'score': int(score),
             'distance': int(distance),
@@ -57,10 +99,76 @@ class ScoreManager:
         # Sort by score (highest first)
         self.high_scores.sort(key=lambda x: x['score'], reverse=True)
         # Keep only top 10
+        dropped = self.high_scores[10:]
         self.high_scores = self.high_scores[:10]
+        best = recording is not None and len(recording) > 0 and self.high_scores[0] is new_score
+        if best:
+            for entry in self.high_scores:
+                entry.pop('ghost', None)
+            new_score['ghost'] = os.path.basename(self.ghost_file)
+            self.request_ghost_save(recording.copy())
+        
+        # Replays follow their scores out of the table
+        stale = [entry['replay'] for entry in dropped if entry.get('replay')]
+        if replay is not None and len(replay.inputs) > 0 and any(entry is new_score for entry in self.high_scores):
+            new_score['replay'] = f"run-{time.time_ns() // 1000000}.replay"
+            self.request_replay_save(new_score['replay'], replay, stale)
+        elif stale:
+            self.request_replay_save(None, None, stale)
+        elif not best:
+            self.request_save()
+        
+        score_log.info("Added score: %d (Distance: %d km)", score, distance)
+        return best
+    
+    def save_ghost(self, recording):
+        """Encode and write the best run's recording, then the scores that point at it (one slice per step)"""
+        yield from recording.encode()
+        try:
+            with tracer.span('save_ghost', self.ghost_file):
+                write_ghost(self.ghost_file, recording.encoded)
+            score_log.info("Saved ghost run (%d steps, %d bytes)", len(recording), len(recording.encoded))
+        except Exception as e:
+            score_log.error("Error saving ghost run: %s", e)
         self.save_scores()
-        
-        print(f"Added score: {int(score)} (Distance: {int(distance)} km)")
+    
+    def request_ghost_save(self, recording):
+        if self.scheduler is None:
+            for _ in self.save_ghost(recording):
+                pass
+        else:
+            self.scheduler.add('save_ghost', self.save_ghost(recording), PRIORITY_HIGH)
+    
+    def save_replay(self, name, replay, stale):
+        """Write a top 10 run's replay and remove the ones that left the table, then save the scores"""
+        try:
+            if replay is not None:
+                data = replay.encode()
+                yield
+                os.makedirs(self.replay_dir, exist_ok=True)
+                with tracer.span('save_replay', name):
+                    write_replay(os.path.join(self.replay_dir, name), data)
+                score_log.info("Saved replay %s (%d steps, %d bytes)", name, len(replay.inputs), len(data))
+            for old in stale:
+                with contextlib.suppress(FileNotFoundError):
+                    os.remove(os.path.join(self.replay_dir, old))
+        except Exception as e:
+            score_log.error("Error saving replay %s: %s", name, e)
+        self.save_scores()
+    
+    def request_replay_save(self, name, replay, stale):
+        work = self.save_replay(name, replay, stale)
+        if self.scheduler is None:
+            for _ in work:
+                pass
+        else:
+            self.scheduler.add(f'save_replay {name}', work, PRIORITY_HIGH)
+    
+    def ghost_path(self):
+        """Path of the best run's recording, or None if it has none"""
+        if self.high_scores and self.high_scores[0].get('ghost'):
+            return os.path.join(os.path.dirname(self.scores_file), self.high_scores[0]['ghost'])
+        return None
     
     def get_high_score(self):
         """Get the highest score"""
@@ -76,29 +184,74 @@ class ScoreManager:
 
 # Sprite Manager Class
 class SpriteManager:
+    # Sprites only one scene uses, loaded by preload() and dropped by release()
+    SCENE_SPRITES = {
+        'amazonQ': ("amazonQ.png", (1024, 1024)),  # Splash logo - keep original 1024x1024 size
+    }
+    
     def __init__(self):
         self.sprites = {}
+        self.fallbacks = {}  # Baked fallback drawings, see bake_fallback
+        self.masks = {}  # Collision masks by (sprite name, size, angle), see collision_mask
         self.load_all_sprites()
+        
+        # Sprites pre-scaled for each internal render scale; self.sprites is the current set
+        self.scale = 1.0
+        self.scaled_sprites = {1.0: self.sprites}
+        self.bake_masks()
+    
+    def set_scale(self, scale):
+        """Switch to sprites sized for an internal render scale (scaled once, then cached)"""
+        sprites = self.scaled_sprites.get(scale)
+        if sprites is None:
+            sprites = {name: self.scale_sprite(sprite, scale) for name, sprite in self.scaled_sprites[1.0].items()}
+            self.scaled_sprites[scale] = sprites
+            asset_log.debug("Scaled %d sprites for render scale %g", len(sprites), scale)
+        self.sprites = sprites
+        self.scale = scale
+    
+    def scale_sprite(self, sprite, scale):
+        if sprite is None or scale == 1:
+            return sprite
+        return pygame.transform.smoothscale(sprite, View(scale).size(*sprite.get_size()))
+    
+    def preload(self, names):
+        """Load scene sprites (see SCENE_SPRITES) that are not loaded yet"""
+        full_size = self.scaled_sprites[1.0]
+        for name in names:
+            if name not in full_size:
+                filename, size = self.SCENE_SPRITES[name]
+                full_size[name] = self.load_sprite(filename, size)
+            if name not in self.sprites:
+                self.sprites[name] = self.scale_sprite(full_size[name], self.scale)
+    
+    def release(self, names):
+        """Drop scene sprites at every render scale"""
+        for sprites in self.scaled_sprites.values():
+            for name in names:
+                sprites.pop(name, None)
+        asset_log.debug("Released sprites: %s", ", ".join(names))
     
     def load_sprite(self, filename, size=(75, 75)):
         """Load a sprite with automatic resizing and aspect ratio preservation"""
         try:
             sprite_path = os.path.join("sprites", filename)
             if os.path.exists(sprite_path):
-                sprite = pygame.image.load(sprite_path).convert_alpha()
-                sprite = pygame.transform.scale(sprite, size)
-                print(f"Loaded sprite: {filename} -> {size}")
+                with tracer.span('load_sprite', filename):
+                    sprite = pygame.image.load(sprite_path).convert_alpha()
+                    sprite = pygame.transform.scale(sprite, size)
+                asset_log.debug("Loaded sprite: %s -> %s", filename, size)
                 return sprite
             else:
-                print(f"Sprite not found: {filename}")
+                asset_log.warning("Sprite not found: %s", filename)
                 return None
         except Exception as e:
-            print(f"Error loading sprite {filename}: {e}")
+            asset_log.error("Error loading sprite %s: %s", filename, e)
             return None
     
     def load_all_sprites(self):
         """Load all available sprites with proper aspect ratio preservation"""
-        print("Loading sprites with proper sizing...")
+        asset_log.debug("Loading sprites with proper sizing...")
         
         # Car sprites: 256x256 -> maintain aspect ratio, scale to fit game
         # Target height for cars: 75 pixels, calculate width proportionally
@@ -122,16 +275,67 @@ class SpriteManager:
         
         self.sprites['fuel_station'] = self.load_sprite("fuel_station.png", (fuel_target_width, fuel_target_height))
         
-        # Amazon Q logo for splash screen - keep original 1024x1024 size
-        self.sprites['amazonQ'] = self.load_sprite("amazonQ.png", (1024, 1024))  # Original size
-        
-        print(f"Loaded {len([s for s in self.sprites.values() if s is not None])} sprites successfully")
-        print(f"Car sprites sized to: {car_target_width}x{car_target_height}")
-        print(f"Fuel station sized to: {fuel_target_width}x{fuel_target_height}")
+        asset_log.info("Loaded %d sprites successfully", len([s for s in self.sprites.values() if s is not None]))
+        asset_log.debug("Car sprites sized to: %dx%d", car_target_width, car_target_height)
+        asset_log.debug("Fuel station sized to: %dx%d", fuel_target_width, fuel_target_height)
     
     def get_sprite(self, name):
         """Get a sprite by name"""
         return self.sprites.get(name, None)
+    
+    def collision_mask(self, name, size, angle=0):
+        """Mask of a full-size sprite's opaque pixels turned by `angle` degrees, centered like the drawn sprite
+        
+        Collisions are decided at full size whatever the render scale, so runs replay the same.
+        A sprite that failed to load collides as a solid `size` box, like its fallback drawing.
+        """
+        key = (name, size, angle)
+        mask = self.masks.get(key)
+        if mask is None:
+            sprite = self.scaled_sprites[1.0].get(name)
+            if sprite is None:
+                sprite = pygame.Surface(size, pygame.SRCALPHA)
+                sprite.fill(WHITE)
+            if angle:
+                sprite = pygame.transform.rotate(sprite, angle)
+            mask = pygame.mask.from_surface(sprite)
+            self.masks[key] = mask
+        return mask
+    
+    def bake_masks(self):
+        """Build the car masks up front: upright, and the player's at every spin-out angle"""
+        for name in ('player_car', 'enemy_static', 'enemy_police', 'enemy_sports', 'fuel_station'):
+            sprite = self.sprites.get(name)
+            if sprite is None:
+                continue  # Its solid box is built when first needed
+            angles = range(0, 360, SPIN_STEP) if name == 'player_car' else (0,)
+            for angle in angles:
+                self.collision_mask(name, sprite.get_size(), angle)
+        asset_log.debug("Baked %d collision masks", len(self.masks))
+    
+    def bake_fallback(self, key, draw, *args):
+        """Draw a fallback shape once per render scale and return (surface, offset from the car's center)"""
+        baked = self.fallbacks.get((key, self.scale))
+        if baked is None:
+            view = View(self.scale)
+            center = FALLBACK_CANVAS_SIZE // 2
+            canvas = pygame.Surface((FALLBACK_CANVAS_SIZE, FALLBACK_CANVAS_SIZE), pygame.SRCALPHA)
+            draw(canvas, view, center / self.scale, center / self.scale, *args)
+            bounds = canvas.get_bounding_rect()
+            baked = (canvas.subsurface(bounds).copy(), (bounds.x - center, bounds.y - center))
+            self.fallbacks[(key, self.scale)] = baked
+        return baked
+    
+    def fallback_enemy(self, car_type, enemy_type, color):
+        """Baked fallback drawings for an enemy car, keyed by zigzag direction"""
+        return {
+            direction: self.bake_fallback(('enemy', car_type, enemy_type, color, direction),
+                                          draw_enemy_shapes, car_type, enemy_type, color, direction)
+            for direction in (-1, 1)
+        }
+    
+    def fallback_player(self):
+        return self.bake_fallback(('player',), draw_player_shapes)
 
 # Constants
 FPS = 60
@@ -157,44 +361,122 @@ RED = (255, 0, 0)
 BLUE = (0, 0, 255)
 YELLOW = (255, 255, 0)
 ORANGE = (255, 165, 0)
+PANEL_COLOR = (40, 40, 40)
+
+# HUD layout (built once instead of creating Rects every frame)
+LEFT_PANEL_RECT = pygame.Rect(20, 10, 280, 300)
+RIGHT_PANEL_RECT = pygame.Rect(1080, 10, 280, 300)
+INSTRUCTION_PANEL_RECT = pygame.Rect(20, SCREEN_HEIGHT - 140, 280, 120)
+FUEL_BAR_RECT = pygame.Rect(30, 95, 120, 12)
+
+# Fallback car shapes are baked onto a canvas this size (larger than any shape)
+FALLBACK_CANVAS_SIZE = 128
+
+# Idle-time housekeeping stops this long before the next frame is due (seconds)
+IDLE_TASK_MARGIN = 0.002
+
+# Fallback colors for each kind of traffic car
+ENEMY_COLORS = {
+    'static': [RED, YELLOW, ORANGE],
+    'reactive': [WHITE, GRAY],
+    'zigzag': [BLUE, (128, 0, 128)],  # Blue or Purple
+}
+
+# Degrees the player car turns per frame while spinning out
+SPIN_STEP = 15
+
+# Closest a car's center gets to the road edges and the median of a fork
+PLAYER_ROAD_MARGIN = 50
+ENEMY_ROAD_MARGIN = 40
+
+# Attract mode starts after this long idle on the menu and plays for this long
+ATTRACT_IDLE_FRAMES = 15 * 60
+ATTRACT_FRAMES = 45 * 60
+
+# Exhaust particles per frame for each unit of speed above 1
+EXHAUST_RATE = 0.5
+
+# How long the instant replay prompt shows after a heavy collision
+REPLAY_PROMPT_FRAMES = 4 * 60
+
+# Static text renders kept by render_text (labels, menu lines, feedback messages)
+TEXT_CACHE_SIZE = 256
+
+# Visual feedback shown for each sound effect
+SOUND_EFFECTS = {
+    'collision': {
+        'text': 'CRASH!',
+        'color': RED,
+        'size': 'large'
+    },
+    'pickup': {
+        'text': '+FUEL',
+        'color': GREEN,
+        'size': 'medium'
+    },
+    'selection': {
+        'text': 'SELECT',
+        'color': YELLOW,
+        'size': 'small'
+    }
+}
 
 class Game:
-    def __init__(self):
+    def __init__(self, render_scale=1.0, quality='auto', pipelined=False):
         # Set up fullscreen display
         self.fullscreen = pygame.display.set_mode((FULLSCREEN_WIDTH, FULLSCREEN_HEIGHT), pygame.FULLSCREEN)
         
-        # Create game surface (centered on fullscreen)
-        self.screen = pygame.Surface((GAME_AREA_WIDTH, GAME_AREA_HEIGHT))
-        
         pygame.display.set_caption("Road Fighter")
         self.clock = pygame.time.Clock()
         
-        # Load custom font
-        try:
-            self.font_large = pygame.font.Font("fonts/Pixeled.ttf", 48)
-            self.font_medium = pygame.font.Font("fonts/Pixeled.ttf", 32)
-            self.font_small = pygame.font.Font("fonts/Pixeled.ttf", 24)
-            self.font_tiny = pygame.font.Font("fonts/Pixeled.ttf", 16)
-            print("Loaded custom Pixeled font successfully!")
-        except Exception as e:
-            print(f"Could not load custom font: {e}")
-            # Fallback to default fonts
-            self.font_large = pygame.font.Font(None, 72)
-            self.font_medium = pygame.font.Font(None, 48)
-            self.font_small = pygame.font.Font(None, 36)
-            self.font_tiny = pygame.font.Font(None, 24)
+        # Keyboard source for driving; tools swap in scripted input
+        self.read_keys = pygame.key.get_pressed
+        
+        # Frame-time overlay (F3), costs nothing while hidden
+        self.perf = PerfOverlay()
+        
+        # Profiling options (F9 trace recording, F10 cProfile capture)
+        self.trace_file = None  # Export path used when tracing is still on at exit
+        self.profile_seconds = 10
+        
+        # Housekeeping run in the slack left at the end of each frame (see scheduler.py)
+        self.scheduler = IdleScheduler()
+        
+        # The last seconds of the run, captured after drawing and compressed in idle time
+        self.instant_replay = InstantReplay((SCREEN_WIDTH, SCREEN_HEIGHT), FPS)
+        self.scheduler.every('instant_replay', self.instant_replay.compress_next, PRIORITY_LOW)
+        self.replay_prompt = 0  # Frames left showing the instant replay prompt
+        self.replay_return = "GAME"  # Scene the instant replay goes back to
+        self.replay_frames = []
+        self.replay_position = 0.0  # Index into replay_frames, advanced by the playback speed
+        self.replay_speed = REPLAY_SPEEDS.index(1.0)
+        self.replay_paused = False
+        self.replay_surface = None
+        self.replay_shown = None  # Frame decoded into replay_surface
+        self.replay_message = ""
         
         # Initialize sprite manager
         self.sprite_manager = SpriteManager()
         
         # Initialize score manager
-        self.score_manager = ScoreManager()
+        self.score_manager = ScoreManager(scheduler=self.scheduler)
+        
+        # This run's drive, and the best run's to race against (loaded in the background)
+        self.ghost_recorder = GhostRecorder()
+        self.run_steps = 0  # Simulation steps since the run started
+        self.load_ghost()
+        
+        # The keys held every step and the seed the run started from, to verify its score
+        self.input_log = InputLog()
+        self.run_seed = 0
         
-        self.state = "SPLASH"  # Start with splash screen
         self.splash_timer = 0  # Timer for splash screen
         self.menu_selection = 0
+        self.menu_idle = 0  # Frames on the menu without a key press
+        self.attract_frames = 0
+        self.autopilot = Autopilot()
         self.pause_selection = 0  # For pause menu
-        self.road_offset = 0
+        self.road_offset = 0  # How far the track has scrolled this run
         self.how_to_play_timer = 0
         self.game_over_timer = 0  # Timer for game over screen
         
@@ -220,12 +502,175 @@ class Game:
         self.sound_feedback_color = WHITE
         self.sound_feedback_size = 'medium'
         
+        # Rendered values reused across frames (see render_value); text caches belong to scenes
+        self.value_cache = {}
+        
+        # Car sprites are queued during the frame and blitted in one batch
+        self.render_queue = RenderQueue()
+        
+        # Procedural road, generated and baked ahead of the player on a worker thread
+        self.track = Track(SCREEN_HEIGHT)
+        self.road_detail = ROAD_FULL
+        
+        # Roadside parallax layers, baked into wrapping strips per render scale
+        self.scenery = Scenery()
+        self.scenery_layers = 3
+        
+        # Crash, pickup and exhaust effects, kept in preallocated arrays
+        self.particles = ParticleSystem()
+        
+        # One scene per state, looked up by name (see set_state)
+        play_text = {}  # The pause screen draws the same HUD as the game
+        cls = type(self)
+        self.scenes = {scene.name: scene for scene in (
+            Scene("SPLASH", cls.draw_splash, cls.handle_splash_events, cls.update_splash,
+                  on_enter=cls.enter_splash, sprites=('amazonQ',), keep_text=False),
+            Scene("MENU", cls.draw_menu, cls.handle_menu_events, cls.update_menu, on_enter=cls.enter_menu),
+            Scene("ATTRACT", cls.draw_attract, cls.handle_attract_events, cls.update_attract,
+                  text_cache=play_text, clear=False),
+            Scene("HOW_TO_PLAY", cls.draw_how_to_play, cls.handle_how_to_play_events, cls.update_how_to_play,
+                  on_enter=cls.enter_how_to_play, keep_text=False),
+            Scene("CREDITS", cls.draw_credits, cls.handle_credits_events, keep_text=False),
+            Scene("GAME", cls.draw_game, cls.handle_game_events, cls.update_game, text_cache=play_text, clear=False),
+            Scene("PAUSED", cls.draw_pause, cls.handle_pause_events, text_cache=play_text, clear=False),
+            Scene("GAME_OVER", cls.draw_game_over, cls.handle_game_over_events, on_enter=cls.enter_game_over),
+            Scene("REPLAY", cls.draw_instant_replay, cls.handle_instant_replay_events, cls.update_instant_replay,
+                  on_enter=cls.enter_instant_replay, clear=False),
+        )}
+        self.scene = None
+        self.set_state("SPLASH")  # Start with splash screen
+        
+        # Internal render surface, fonts, scaled sprites and HUD rects (see set_render_scale)
+        self.max_render_scale = render_scale
+        self.set_render_scale(render_scale)
+        
+        # Optional simulation thread (see pipeline.py); game changes from this thread hold sim_lock
+        self.pipeline = SimulationPipeline(self.update, self.capture_frame, FPS) if pipelined else None
+        self.sim_lock = self.pipeline.lock if pipelined else contextlib.nullcontext()
+        
+        # Quality tier, stepped with frame time unless fixed on the command line
+        self.frame_count = 0
+        self.hud_refresh = True
+        adaptive = quality == 'auto'
+        self.quality = QualityController(self.apply_quality, 0 if adaptive else TIER_NAMES.index(quality), adaptive)
+        self.apply_quality(self.quality.current)
+        
         # Load sounds (will be disabled but structure remains)
         self.load_sounds()
         
+        # Music tracks are decoded in the background and crossfaded on reserved channels
+        self.music = MusicManager(self.music_files) if SOUND_ENABLED else None
+        
+        # Engine hum pitched to the current speed (pre-rendered bank, no runtime resampling)
+        self.engine_sound = EngineSound() if SOUND_ENABLED else None
+        
         # Start menu music when game starts
         self.play_menu_music()
     
+    def set_render_scale(self, scale):
+        """Render at `scale` of the game area and upscale once per frame in present()"""
+        self.render_scale = scale
+        self.view = View(scale)
+        self.setup_render_target()
+        self.load_fonts()
+        
+        # Sprites and cached renders at the new size
+        self.sprite_manager.set_scale(scale)
+        self.track.set_style(scale, self.road_detail)
+        self.scenery.set_scale(scale)
+        self.particles.set_scale(scale)
+        ghost = self.sprite_manager.get_sprite('player_car') or self.sprite_manager.fallback_player()[0]
+        self.ghost_sprite = ghost.copy()
+        self.ghost_sprite.set_alpha(GHOST_ALPHA)
+        self.scheduler.add('warm_fallbacks', self.warm_fallbacks(), PRIORITY_LOW)
+        if self.player:
+            self.player.load_sprites()
+        for car in self.enemy_cars:
+            car.load_sprites()
+        for scene in self.scenes.values():
+            scene.text_cache.clear()
+        self.value_cache.clear()
+        
+        # Dimming layer for the pause screen, created once
+        self.pause_overlay = pygame.Surface(self.view.size(SCREEN_WIDTH, SCREEN_HEIGHT))
+        self.pause_overlay.set_alpha(128)  # Semi-transparent
+        self.pause_overlay.fill((0, 0, 0))
+        
+        # HUD layout in render pixels
+        self.left_panel_rect = self.view.scale_rect(LEFT_PANEL_RECT)
+        self.right_panel_rect = self.view.scale_rect(RIGHT_PANEL_RECT)
+        self.instruction_panel_rect = self.view.scale_rect(INSTRUCTION_PANEL_RECT)
+        self.fuel_bar_rect = self.view.scale_rect(FUEL_BAR_RECT)
+        
+        display_log.info("Render scale %g (%dx%d internal)", scale, *self.screen.get_size())
+    
+    def load_ghost(self):
+        """Start loading the best run's recording, if it has one"""
+        path = self.score_manager.ghost_path()
+        self.ghost = GhostRun(path) if path else None
+    
+    def apply_quality(self, tier):
+        """Switch road detail, effect and HUD update rates and render scale to a quality tier"""
+        with self.sim_lock:
+            self.road_detail = tier['road_detail']
+            self.effect_interval = tier['effect_interval']
+            self.hud_interval = tier['hud_interval']
+            self.scenery_layers = tier['scenery_layers']
+            self.particles.density = tier['particle_density']
+            scale = min(tier['render_scale'], self.max_render_scale)
+            if scale != self.render_scale:
+                self.set_render_scale(scale)
+            self.track.set_style(self.render_scale, self.road_detail)
+            if self.pipeline and self.pipeline.running:
+                self.pipeline.publish()
+    
+    def warm_fallbacks(self):
+        """Bake fallback drawings for every kind of car at the current scale, one per slice"""
+        sprite_manager = self.sprite_manager
+        sprite_manager.fallback_player()
+        yield
+        for enemy_type, colors in ENEMY_COLORS.items():
+            for color in colors:
+                sprite_manager.fallback_enemy('normal', enemy_type, color)
+                yield
+        sprite_manager.fallback_enemy('fuel', 'fuel_station', GREEN)
+    
+    def setup_render_target(self):
+        """Pick where frames are drawn and how present() gets them on the display"""
+        display = self.fullscreen
+        display.fill(BLACK)  # Borders around the game area are never drawn over again
+        
+        area = pygame.Rect(GAME_OFFSET_X, GAME_OFFSET_Y, GAME_AREA_WIDTH, GAME_AREA_HEIGHT)
+        if display.get_size() == area.size:
+            area.topleft = (0, 0)  # Windowed mode
+        # Displays smaller than the game area get the frame blitted (and cropped) instead
+        self.present_area = display.subsurface(area) if display.get_rect().contains(area) else None
+        self.present_buffer = None
+        
+        if self.render_scale == 1 and self.present_area is not None:
+            self.screen = self.present_area  # Draw straight onto the display
+        else:
+            self.screen = pygame.Surface(self.view.size(GAME_AREA_WIDTH, GAME_AREA_HEIGHT))
+            if self.render_scale != 1 and self.present_area is None:
+                self.present_buffer = pygame.Surface((GAME_AREA_WIDTH, GAME_AREA_HEIGHT))
+    
+    def load_fonts(self):
+        # Load custom font
+        font_size = self.view.font_size
+        try:
+            self.font_large = pygame.font.Font("fonts/Pixeled.ttf", font_size(48))
+            self.font_medium = pygame.font.Font("fonts/Pixeled.ttf", font_size(32))
+            self.font_small = pygame.font.Font("fonts/Pixeled.ttf", font_size(24))
+            self.font_tiny = pygame.font.Font("fonts/Pixeled.ttf", font_size(16))
+            asset_log.info("Loaded custom Pixeled font successfully!")
+        except Exception as e:
+            asset_log.warning("Could not load custom font: %s", e)
+            # Fallback to default fonts
+            self.font_large = pygame.font.Font(None, font_size(72))
+            self.font_medium = pygame.font.Font(None, font_size(48))
+            self.font_small = pygame.font.Font(None, font_size(36))
+            self.font_tiny = pygame.font.Font(None, font_size(24))
+    
     def load_sounds(self):
         """Load sound effects and music from MP3/WAV files in sounds folder"""
         global SOUND_ENABLED
@@ -233,11 +678,11 @@ class Game:
         if not SOUND_ENABLED:
             self.sounds = {}
             self.music_files = {}
-            print("Skipping sound loading - audio disabled")
+            audio_log.info("Skipping sound loading - audio disabled")
             return
             
         try:
-            print("Loading sounds from sounds/ folder...")
+            audio_log.debug("Loading sounds from sounds/ folder...")
             self.sounds = {}
             self.music_files = {}
             
@@ -248,7 +693,7 @@ class Game:
                 'selection': 'sounds/selection.mp3'
             }
             
-            # Load music files (for pygame.mixer.music)
+            # Music files (decoded in the background by MusicManager)
             self.music_files = {
                 'menu': 'sounds/menu.mp3',
                 'background': 'sounds/background.mp3'
@@ -257,10 +702,11 @@ class Game:
             # Load sound effects
             for sound_name, filename in sound_files.items():
                 try:
-                    self.sounds[sound_name] = pygame.mixer.Sound(filename)
-                    print(f"Loaded {filename}")
+                    with tracer.span('load_sound', filename):
+                        self.sounds[sound_name] = pygame.mixer.Sound(filename)
+                    audio_log.debug("Loaded %s", filename)
                 except Exception as e:
-                    print(f"Could not load {filename}: {e}")
+                    audio_log.warning("Could not load %s: %s", filename, e)
                     # Fallback to generated sound
                     if sound_name == 'selection':
                         self.sounds[sound_name] = self.create_simple_tone(600, 0.1, 0.2)
@@ -268,22 +714,22 @@ class Game:
                         self.sounds[sound_name] = self.create_simple_tone(800, 0.2, 0.3)
                     elif sound_name == 'collision':
                         self.sounds[sound_name] = self.create_simple_tone(300, 0.3, 0.5)
-                    print(f"Using generated sound for {sound_name}")
+                    audio_log.info("Using generated sound for %s", sound_name)
             
             # Check music files exist
             for music_name, filename in self.music_files.items():
                 try:
                     # Just check if file exists, don't load it yet
                     with open(filename, 'rb'):
-                        print(f"Found music file: {filename}")
+                        audio_log.debug("Found music file: %s", filename)
                 except Exception as e:
-                    print(f"Could not find music file {filename}: {e}")
+                    audio_log.warning("Could not find music file %s: %s", filename, e)
                     self.music_files[music_name] = None
             
-            print("Sound loading completed!")
+            audio_log.info("Sound loading completed!")
             
         except Exception as e:
-            print(f"Could not load sounds: {e}")
+            audio_log.error("Could not load sounds: %s", e)
             self.sounds = {}
             self.music_files = {}
             SOUND_ENABLED = False
@@ -312,79 +758,53 @@ class Game:
         return pygame.sndarray.make_sound(sound_array)
     
     def play_menu_music(self):
-        """Start menu music (loops during menu)"""
-        if not SOUND_ENABLED:
-            print("Menu music would be playing (audio disabled)")
+        """Crossfade to menu music (loops during menu)"""
+        if not SOUND_ENABLED or not self.music:
+            audio_log.debug("Menu music would be playing (audio disabled)")
             return
             
         try:
             if self.music_files.get('menu'):
-                print("Starting menu music...")
-                pygame.mixer.music.load(self.music_files['menu'])
-                pygame.mixer.music.set_volume(0.4)  # Medium volume for menu
-                pygame.mixer.music.play(-1)  # Loop indefinitely
-                print("Menu music started successfully!")
+                self.music.play('menu', 0.4)  # Medium volume for menu
             else:
-                print("Menu music file not available")
+                audio_log.warning("Menu music file not available")
         except Exception as e:
-            print(f"Could not start menu music: {e}")
+            audio_log.error("Could not start menu music: %s", e)
     
     def play_background_music(self):
-        """Start background music during gameplay"""
-        if not SOUND_ENABLED:
-            print("Background music would be playing (audio disabled)")
+        """Crossfade to background music during gameplay"""
+        if not SOUND_ENABLED or not self.music:
+            audio_log.debug("Background music would be playing (audio disabled)")
             return
             
         try:
             if self.music_files.get('background'):
-                print("Starting background music...")
-                pygame.mixer.music.load(self.music_files['background'])
-                pygame.mixer.music.set_volume(0.3)  # Lower volume during gameplay
-                pygame.mixer.music.play(-1)  # Loop indefinitely
-                print("Background music started successfully!")
+                self.music.play('background', 0.3)  # Lower volume during gameplay
             else:
-                print("Background music file not available")
+                audio_log.warning("Background music file not available")
         except Exception as e:
-            print(f"Could not start background music: {e}")
+            audio_log.error("Could not start background music: %s", e)
     
     def stop_music(self):
-        """Stop currently playing music"""
-        if SOUND_ENABLED:
+        """Fade out currently playing music"""
+        if SOUND_ENABLED and self.music:
             try:
-                pygame.mixer.music.stop()
+                self.music.stop()
             except Exception as e:
-                print(f"Could not stop music: {e}")
+                audio_log.error("Could not stop music: %s", e)
     
     def play_sound(self, sound_name):
         """Play a sound effect or show visual feedback with markdown-style icons"""
         if SOUND_ENABLED and sound_name in self.sounds:
             try:
-                print(f"Playing sound: {sound_name}")
+                audio_log.debug("Playing sound: %s", sound_name)
                 pygame.mixer.Sound.play(self.sounds[sound_name])
             except Exception as e:
-                print(f"Could not play sound {sound_name}: {e}")
+                audio_log.error("Could not play sound %s: %s", sound_name, e)
         
         # Enhanced visual feedback with plain text
-        sound_effects = {
-            'collision': {
-                'text': 'CRASH!',
-                'color': RED,
-                'size': 'large'
-            },
-            'pickup': {
-                'text': '+FUEL',
-                'color': GREEN,
-                'size': 'medium'
-            },
-            'selection': {
-                'text': 'SELECT',
-                'color': YELLOW,
-                'size': 'small'
-            }
-        }
-        
-        if sound_name in sound_effects:
-            effect = sound_effects[sound_name]
+        effect = SOUND_EFFECTS.get(sound_name)
+        if effect:
             self.sound_feedback = effect['text']
             self.sound_feedback_color = effect['color']
             self.sound_feedback_size = effect['size']
@@ -392,129 +812,300 @@ class Game:
         
     def run(self):
         running = True
+        perf_counter = time.perf_counter
+        pipeline = self.pipeline
+        if pipeline:
+            pipeline.start()
+        # Console log output is written in idle time from here on
+        game_log.registry.defer_console()
+        self.scheduler.every('flush_logs', game_log.registry.flush_pending, PRIORITY_LOW, cost_ms=0.2)
         while running:
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    running = False
-                elif event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_F11:  # Toggle fullscreen
-                        self.toggle_fullscreen()
-                    # Remove the ESC handling from here - let each state handle it
-                
-                if self.state == "SPLASH":
-                    self.handle_splash_events(event)
-                elif self.state == "MENU":
-                    self.handle_menu_events(event)
-                elif self.state == "GAME":
-                    self.handle_game_events(event)
-                elif self.state == "PAUSED":
-                    self.handle_pause_events(event)
-                elif self.state == "CREDITS":
-                    self.handle_credits_events(event)
-                elif self.state == "HOW_TO_PLAY":
-                    self.handle_how_to_play_events(event)
-                elif self.state == "GAME_OVER":
-                    self.handle_game_over_events(event)
+            work_start = perf_counter()
+            self.perf.begin_frame()
+            frame_start = tracer.begin()
             
-            self.update()
-            self.draw()
+            start = tracer.begin()
+            events = pygame.event.get()
+            tracer.end('event.get', start)
+            if events:
+                with self.sim_lock:
+                    for event in events:
+                        if event.type == pygame.QUIT:
+                            running = False
+                        elif event.type == pygame.KEYDOWN:
+                            if event.key == pygame.K_F11:  # Toggle fullscreen
+                                self.toggle_fullscreen()
+                            elif event.key == pygame.K_F3:  # Toggle performance overlay
+                                self.perf.toggle()
+                            elif event.key == pygame.K_F9:  # Start/stop trace recording
+                                self.toggle_trace()
+                            elif event.key == pygame.K_F10:  # Capture a cProfile session
+                                profile_session.start(self.profile_seconds)
+                            # Remove the ESC handling from here - let each state handle it
+                        
+                        start = tracer.begin()
+                        state = self.state
+                        self.handle_event(event)
+                        tracer.end('handle_events', start, state)
+                    if pipeline:
+                        pipeline.publish()  # Show the effect of input without waiting for a step
+            self.perf.lap('events')
             
-            # Blit game surface to fullscreen and display
-            self.fullscreen.fill((0, 0, 0))  # Black background
-            self.fullscreen.blit(self.screen, (GAME_OFFSET_X, GAME_OFFSET_Y))
-            pygame.display.flip()
+            if pipeline:
+                # The simulation thread updates; draw its latest step
+                frame = pipeline.frame()
+                frame.frame_count = self.frame_count
+            else:
+                start = tracer.begin()
+                self.update()
+                tracer.end('update', start, self.state)
+                frame = self
+            start = tracer.begin()
+            if self.music:
+                self.music.update()  # Start any track whose decode just finished
+            if self.engine_sound:
+                # Engine only runs while driving; None fades it out
+                self.engine_sound.update(self.speed if self.state == "GAME" else None)
+            tracer.end('audio', start)
+            self.perf.lap('update')
+            
+            start = tracer.begin()
+            frame.draw()
+            self.frame_count = frame.frame_count
+            tracer.end('draw', start, frame.state)
+            self.perf.lap('draw')
+            if frame.state == "GAME":
+                start = tracer.begin()
+                self.instant_replay.capture(frame.screen, self.frame_count)
+                tracer.end('instant_replay.capture', start)
+            self.perf.draw(frame.screen, self.clock.get_fps(), frame.enemy_cars)
+            self.perf.lap('overlay')
+            
+            self.present()
+            self.perf.lap('present')
+            self.quality.record((perf_counter() - work_start) * 1000.0)
             
+            self.scheduler.run(work_start + 1.0 / FPS - IDLE_TASK_MARGIN)
+            self.perf.lap('tasks')
+            
+            start = tracer.begin()
             self.clock.tick(FPS)
-        
+            tracer.end('clock.tick', start)
+            self.perf.lap('idle')
+            self.perf.end_frame()
+            tracer.end('frame', frame_start)
+            profile_session.poll()
+        
+        if pipeline:
+            pipeline.stop()
+        self.track.stop()
+        self.scheduler.run_all()  # Pending saves
+        if tracer.enabled:
+            tracer.export(self.trace_file)
+        profile_session.stop()
         pygame.quit()
         sys.exit()
     
+    @property
+    def state(self):
+        """Name of the current scene"""
+        return self.scene.name
+    
+    def set_state(self, name):
+        """Leave the current scene and enter another, loading and releasing their assets"""
+        scene = self.scenes[name]
+        previous = self.scene
+        if scene is previous:
+            return
+        if previous is not None:
+            previous.exit(self)
+        self.scene = scene
+        self.text_cache = scene.text_cache
+        scene.enter(self)
+        state_log.debug("Scene %s -> %s", previous.name if previous else None, name)
+    
+    def handle_event(self, event):
+        """Pass an event to the handler for the current state"""
+        self.scene.handle_event(self, event)
+    
+    def capture_frame(self, previous):
+        return FrameSnapshot(self, previous)
+    
+    def toggle_trace(self):
+        """Start recording spans, or stop and export them as Chrome trace JSON"""
+        if tracer.enabled:
+            tracer.disable()
+            tracer.export()
+        else:
+            tracer.enable()
+    
+    def present(self):
+        """Upscale or blit the game surface onto the display (if not drawn there directly) and flip"""
+        start = tracer.begin()
+        if self.screen is not self.present_area:
+            if self.present_area is not None:
+                pygame.transform.scale(self.screen, self.present_area.get_size(), self.present_area)
+            elif self.present_buffer is not None:
+                pygame.transform.scale(self.screen, self.present_buffer.get_size(), self.present_buffer)
+                self.fullscreen.blit(self.present_buffer, (GAME_OFFSET_X, GAME_OFFSET_Y))
+            else:
+                self.fullscreen.blit(self.screen, (GAME_OFFSET_X, GAME_OFFSET_Y))
+        tracer.end('fullscreen.blit', start)
+        start = tracer.begin()
+        pygame.display.flip()
+        tracer.end('display.flip', start)
+    
     def update(self):
-        """Update game state"""
-        if self.state == "SPLASH":
-            self.update_splash()
-        elif self.state == "GAME":
-            self.update_game()
-        elif self.state == "HOW_TO_PLAY":
-            self.update_how_to_play()
-        # Note: PAUSED state doesn't update game logic
+        """Update game state (PAUSED, MENU, CREDITS and GAME_OVER have no per-frame logic)"""
+        self.scene.update(self)
+    
+    def toggle_fullscreen(self):
         """Toggle between fullscreen and windowed mode"""
         try:
             if pygame.display.get_surface().get_flags() & pygame.FULLSCREEN:
                 self.fullscreen = pygame.display.set_mode((GAME_AREA_WIDTH, GAME_AREA_HEIGHT))
-                self.screen = self.fullscreen
             else:
                 self.fullscreen = pygame.display.set_mode((FULLSCREEN_WIDTH, FULLSCREEN_HEIGHT), pygame.FULLSCREEN)
-                self.screen = pygame.Surface((GAME_AREA_WIDTH, GAME_AREA_HEIGHT))
+            self.setup_render_target()
         except Exception as e:
-            print(f"Could not toggle fullscreen: {e}")
+            display_log.error("Could not toggle fullscreen: %s", e)
     
-    def handle_splash_events(self, event):
-        """Handle splash screen events - REMOVED"""
-        pass
-    
-    def update_splash(self):
-        """Update splash screen - REMOVED"""
-        pass
+    def enter_splash(self):
+        self.splash_timer = 0
     
     def handle_splash_events(self, event):
         """Handle splash screen events"""
         if event.type == pygame.KEYDOWN:
             # Any key skips splash screen
-            self.state = "MENU"
+            self.set_state("MENU")
             self.play_sound('selection')
     
     def update_splash(self):
         """Update splash screen - auto-advance after 3 seconds"""
         self.splash_timer += 1
         if self.splash_timer >= 180:  # 3 seconds at 60 FPS
-            self.state = "MENU"
+            self.set_state("MENU")
     
     def game_over(self):
         """Transition to game over screen"""
-        print(f"Game Over! Final Score: {int(self.score)}, Distance: {int(self.distance)} km")
+        if self.state == "ATTRACT":
+            self.set_state("MENU")  # Demo runs don't score
+            return
+        
+        state_log.info("Game Over! Final Score: %d, Distance: %d km", self.score, self.distance)
         
-        # Add score to high scores
-        self.score_manager.add_score(self.score, self.distance)
+        # Add score to high scores; a new best run becomes the ghost to race
+        replay = Replay(self.run_seed, self.input_log.copy(), self.score, self.distance)
+        if self.score_manager.add_score(self.score, self.distance, self.ghost_recorder, replay):
+            self.ghost = GhostRun(recording=self.ghost_recorder.copy())
         
         # Update high score display
         self.high_score = self.score_manager.get_high_score()
         
-        self.state = "GAME_OVER"
-        self.game_over_timer = pygame.time.get_ticks()  # Start 10-second timer
-        self.stop_music()
-        self.play_menu_music()
+        self.set_state("GAME_OVER")
+        self.play_menu_music()  # Crossfades from the gameplay track
         
         if self.score_manager.is_high_score(self.score):
-            print(f"New high score achieved! Score: {int(self.score)}")
+            state_log.info("New high score achieved! Score: %d", self.score)
+    
+    def enter_game_over(self):
+        self.game_over_timer = pygame.time.get_ticks()  # Start 10-second timer
     
     def handle_pause_events(self, event):
         """Handle simple pause menu events"""
         if event.type == pygame.KEYDOWN:
             if event.key == pygame.K_p or event.key == pygame.K_ESCAPE:
                 # Resume game
-                self.state = "GAME"
+                self.set_state("GAME")
             elif event.key == pygame.K_r:
                 # Restart game
                 self.start_game()
             elif event.key == pygame.K_SPACE:
                 # Return to main menu
-                self.stop_music()
                 self.play_menu_music()
-                self.state = "MENU"
+                self.set_state("MENU")
     
     def handle_game_over_events(self, event):
         """Handle game over screen events"""
         if event.type == pygame.KEYDOWN:
             if event.key == pygame.K_SPACE or event.key == pygame.K_RETURN:
-                self.state = "MENU"
+                self.set_state("MENU")
                 self.play_sound('selection')
             elif event.key == pygame.K_r:
                 self.start_game()  # Restart game
                 self.play_sound('selection')
+            elif event.key == pygame.K_i:
+                self.open_instant_replay()
+    
+    def open_instant_replay(self):
+        """Watch the last seconds of the run, then come back to this scene"""
+        if not len(self.instant_replay):
+            return
+        self.replay_return = self.state
+        self.set_state("REPLAY")
+    
+    def enter_instant_replay(self):
+        self.replay_frames = self.instant_replay.snapshot()
+        self.replay_position = 0.0
+        self.replay_speed = REPLAY_SPEEDS.index(1.0)
+        self.replay_paused = False
+        self.replay_surface = self.instant_replay.surface()
+        self.replay_shown = None
+        self.replay_message = ""
+    
+    def handle_instant_replay_events(self, event):
+        if event.type == pygame.KEYDOWN:
+            if event.key in (pygame.K_ESCAPE, pygame.K_i):
+                self.set_state(self.replay_return)
+            elif event.key == pygame.K_LEFT:
+                self.replay_speed = max(0, self.replay_speed - 1)
+            elif event.key == pygame.K_RIGHT:
+                self.replay_speed = min(len(REPLAY_SPEEDS) - 1, self.replay_speed + 1)
+            elif event.key == pygame.K_SPACE:
+                self.replay_paused = not self.replay_paused
+            elif event.key == pygame.K_e:
+                folder = os.path.join(EXPORT_DIR, time.strftime("replay-%Y%m%d-%H%M%S"))
+                self.scheduler.add('export_replay', self.instant_replay.export(self.replay_frames, folder))
+                self.replay_message = f"Saving to {folder}"
+    
+    def update_instant_replay(self):
+        """Advance playback, looping at the end"""
+        if not self.replay_paused:
+            self.replay_position += REPLAY_SPEEDS[self.replay_speed] / CAPTURE_EVERY
+            if self.replay_position >= len(self.replay_frames):
+                self.replay_position = 0.0
+    
+    def enter_menu(self):
+        self.menu_idle = 0
+    
+    def update_menu(self):
+        """Start attract mode once the menu has sat idle long enough"""
+        self.menu_idle += 1
+        if self.menu_idle >= ATTRACT_IDLE_FRAMES:
+            self.start_attract()
+    
+    def start_attract(self):
+        """Let the autopilot play a run until a key is pressed"""
+        self.set_state("ATTRACT")
+        self.reset_run()
+        self.autopilot.reset()
+        self.attract_frames = 0
+    
+    def update_attract(self):
+        self.attract_frames += 1
+        if self.attract_frames >= ATTRACT_FRAMES:
+            self.set_state("MENU")
+            return
+        self.autopilot.drive(self)
+        self.update_game(self.autopilot)
+    
+    def handle_attract_events(self, event):
+        if event.type == pygame.KEYDOWN:
+            self.set_state("MENU")  # Any key ends the demo
     
     def handle_menu_events(self, event):
         if event.type == pygame.KEYDOWN:
+            self.menu_idle = 0
             if event.key == pygame.K_UP:
                 self.menu_selection = (self.menu_selection - 1) % 3
                 self.play_sound('selection')
@@ -526,8 +1117,9 @@ class Game:
                 if self.menu_selection == 0:  # Start Game
                     self.show_how_to_play()
                 elif self.menu_selection == 1:  # Credits
-                    self.state = "CREDITS"
+                    self.set_state("CREDITS")
                 elif self.menu_selection == 2:  # Exit
+                    self.scheduler.run_all()  # Pending saves
                     pygame.quit()
                     sys.exit()
     
@@ -535,34 +1127,45 @@ class Game:
         if event.type == pygame.KEYDOWN:
             if event.key == pygame.K_ESCAPE:
                 # Pause the game
-                self.state = "PAUSED"
+                self.set_state("PAUSED")
+            elif event.key == pygame.K_i:
+                self.open_instant_replay()
     
     def handle_credits_events(self, event):
         if event.type == pygame.KEYDOWN:
             if event.key == pygame.K_ESCAPE or event.key == pygame.K_RETURN:
                 self.play_sound('selection')  # Play selection sound
-                self.state = "MENU"
+                self.set_state("MENU")
     
     def handle_how_to_play_events(self, event):
         if event.type == pygame.KEYDOWN:
             if event.key == pygame.K_ESCAPE:
                 self.play_sound('selection')  # Play selection sound
-                self.state = "MENU"
+                self.set_state("MENU")
             elif event.key == pygame.K_SPACE:
                 self.play_sound('selection')  # Play selection sound
                 self.start_game()
     
     def show_how_to_play(self):
-        self.state = "HOW_TO_PLAY"
+        self.set_state("HOW_TO_PLAY")
+    
+    def enter_how_to_play(self):
         self.how_to_play_timer = pygame.time.get_ticks()
     
     def start_game(self):
-        self.state = "GAME"
+        self.set_state("GAME")
         
-        # Stop menu music and start background music
-        self.stop_music()
+        # Crossfade from menu music to background music
         self.play_background_music()
-        
+        self.reset_run()
+    
+    def reset_run(self, seed=None):
+        """Put the player at the start of a fresh run, replaying from `seed` if given"""
+        # Traffic and collision effects come from the random module; reseeding it
+        # makes the run repeatable from its seed and input log (see replay.py)
+        self.run_seed = random.getrandbits(SEED_BITS) if seed is None else seed
+        random.seed(self.run_seed)
+        self.input_log.clear()
         self.player = PlayerCar(SCREEN_WIDTH // 2, SCREEN_HEIGHT - 100, self.sprite_manager)
         self.enemy_cars = []
         self.fuel = 100
@@ -570,6 +1173,12 @@ class Game:
         self.distance = 0  # Reset distance
         self.speed = 2
         self.road_offset = 0
+        self.track.reset()
+        self.particles.clear()
+        self.ghost_recorder.clear()
+        self.run_steps = 0
+        self.instant_replay.clear()
+        self.replay_prompt = 0
         self.damage_flash = 0
         self.slide_effect = 0
         self.slide_direction = 0
@@ -582,21 +1191,25 @@ class Game:
         self.sound_feedback_color = WHITE
         self.sound_feedback_size = 'medium'
     
-    def update(self):
-        if self.state == "GAME":
-            self.update_game()
-        elif self.state == "HOW_TO_PLAY":
-            self.update_how_to_play()
-    
-    def update_game(self):
+    def update_game(self, keys=None):
+        """One simulation step of a run, steered by `keys` (the keyboard if None)"""
         # Update road scrolling
         self.road_offset += self.speed
-        if self.road_offset >= 40:
-            self.road_offset = 0
+        track = self.track
+        track.update(self.road_offset)
+        particles = self.particles
+        particles.update(self.speed, SCREEN_WIDTH, SCREEN_HEIGHT)
         
         # Update player
-        keys = pygame.key.get_pressed()
-        self.player.update(keys, self.slide_effect, self.slide_direction, self.control_loss, self.spin_angle)
+        if keys is None:
+            keys = self.read_keys()
+        self.input_log.record(keys)
+        player = self.player
+        player.update(keys, self.slide_effect, self.slide_direction, self.control_loss, self.spin_angle, track)
+        
+        # Exhaust from behind the player, thicker the faster the road goes
+        particles.stream(EXHAUST, player.x, player.y + player.height // 2 - 6, (self.speed - 1) * EXHAUST_RATE,
+                         10, EXHAUST_HEADING, EXHAUST_ANGLE)
         
         # Update damage effects
         if self.damage_flash > 0:
@@ -605,37 +1218,52 @@ class Game:
             self.slide_effect -= 1
         if self.control_loss > 0:
             self.control_loss -= 1
-            self.spin_angle += 15  # Spin during control loss
+            self.spin_angle += SPIN_STEP  # Spin during control loss
         if self.sound_feedback_timer > 0:
             self.sound_feedback_timer -= 1
+        if self.replay_prompt > 0:
+            self.replay_prompt -= 1
         
         # Spawn enemy cars
         if random.randint(1, 80) == 1:  # Reduced spawn rate for better performance
-            # Multiple lanes for wider road
-            lane = random.choice([450, 550, 650, 750, 850, 950])  # 6 lanes across wider road
+            # Any lane of the road where the car appears
+            lane = random.choice(track.lanes(-50))
             car_type = 'normal'  # Remove fuel from regular cars
             enemy_type = random.choice(['static', 'reactive', 'zigzag'])
             self.enemy_cars.append(EnemyCar(lane, -50, car_type, enemy_type, self.sprite_manager))
         
         # Spawn stationary fuel stations more frequently
         if random.randint(1, 200) == 1:  # More frequent fuel stations
-            lane = random.choice([500, 650, 800])  # 3 fuel lanes across road
+            lane = random.choice(track.lanes(-50))
             self.enemy_cars.append(EnemyCar(lane, -50, 'fuel', 'fuel_station', self.sprite_manager))
         
-        # Update enemy cars
-        for car in self.enemy_cars[:]:
-            car.update(self.speed, self.player)
+        # Update enemy cars (removing in place instead of iterating over a copy)
+        cars = self.enemy_cars
+        i = 0
+        while i < len(cars):
+            car = cars[i]
+            car.update(self.speed, self.player, track)
             if car.y > SCREEN_HEIGHT:
-                self.enemy_cars.remove(car)
+                del cars[i]
                 self.score += 10
-        
-        # Check collisions
-        for car in self.enemy_cars[:]:
-            if self.player.rect.colliderect(car.rect):
+            else:
+                i += 1
+        
+        # Check collisions: boxes first, then the sprites' opaque pixels where the boxes meet
+        hit_rect, hit_mask = player.hitbox(self.control_loss, self.spin_angle)
+        i = 0
+        while i < len(cars):
+            car = cars[i]
+            rect = car.rect
+            if (not hit_rect.colliderect(rect)
+                    or not hit_mask.overlap(car.mask, (rect.x - hit_rect.x, rect.y - hit_rect.y))):
+                i += 1
+            else:
                 if car.car_type == 'fuel':
                     self.fuel = min(100, self.fuel + 20)
                     self.play_sound('pickup')  # Changed from 'fuel' to 'pickup'
-                    self.enemy_cars.remove(car)
+                    particles.pickup(car.x, car.y)
+                    del cars[i]
                 else:
                     # Collision with enemy car - damage and effects
                     self.fuel -= 15
@@ -644,6 +1272,7 @@ class Game:
                     
                     # Enhanced collision effects
                     collision_severity = random.randint(1, 3)
+                    particles.crash((player.x + car.x) / 2, (player.y + car.y) / 2, collision_severity)
                     
                     if collision_severity == 1:  # Light collision
                         self.slide_effect = 30  # Short slide
@@ -657,10 +1286,15 @@ class Game:
                         self.slide_direction = random.choice([-1, 1])
                         self.control_loss = 60  # Significant control loss
                         self.spin_angle = 0  # Reset spin angle
+                        self.replay_prompt = REPLAY_PROMPT_FRAMES
                     
-                    self.enemy_cars.remove(car)
+                    del cars[i]
                     break
         
+        # Record the drive for the ghost
+        self.ghost_recorder.record(player.x, player.y, self.road_offset)
+        self.run_steps += 1
+        
         # Decrease fuel over time
         self.fuel -= 0.1
         
@@ -683,189 +1317,256 @@ class Game:
             self.start_game()
     
     def draw(self):
-        self.screen.fill(BLACK)
-        
-        if self.state == "SPLASH":
-            self.draw_splash()
-        elif self.state == "MENU":
-            self.draw_menu()
-        elif self.state == "GAME":
-            self.draw_game()
-        elif self.state == "PAUSED":
-            self.draw_pause()
-        elif self.state == "CREDITS":
-            self.draw_credits()
-        elif self.state == "HOW_TO_PLAY":
-            self.draw_how_to_play()
-        elif self.state == "GAME_OVER":
-            self.draw_game_over()
+        if self.scene.clear:
+            self.screen.fill(BLACK)
+        
+        # Changing HUD values are re-rendered every hud_interval frames while driving
+        self.frame_count += 1
+        self.hud_refresh = self.state not in ("GAME", "ATTRACT") or self.frame_count % self.hud_interval == 0
+        
+        self.scene.draw(self)
         
         # Note: pygame.display.flip() is now handled in run() method
     
+    def render_text(self, font, text, color):
+        """Render static text once and reuse the surface on later frames"""
+        key = (font, text, color)
+        surface = self.text_cache.get(key)
+        if surface is None:
+            if len(self.text_cache) >= TEXT_CACHE_SIZE:
+                self.text_cache.clear()
+            surface = font.render(text, True, color)
+            self.text_cache[key] = surface
+        return surface
+    
+    def render_value(self, slot, font, value, template, color):
+        """Render a changing value, re-rendering only when it differs from the last frame"""
+        cached = self.value_cache.get(slot)
+        if cached is None or (cached[0] != value and self.hud_refresh):
+            cached = (value, font.render(template.format(value), True, color))
+            self.value_cache[slot] = cached
+        return cached[1]
+    
     def draw_splash(self):
         """Draw simple splash screen with Amazon Q logo only"""
+        pt = self.view.pt
         # No background fill - let the transparent logo show on black screen
         self.screen.fill((0, 0, 0))
         
         # Amazon Q logo - centered, keeping original 1024x1024 size
         amazonQ_sprite = self.sprite_manager.get_sprite('amazonQ')
         if amazonQ_sprite:
-            logo_rect = amazonQ_sprite.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2))
+            logo_rect = amazonQ_sprite.get_rect(center=pt(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2))
             self.screen.blit(amazonQ_sprite, logo_rect)
     
     def draw_menu(self):
+        pt = self.view.pt
         # Title
-        title = self.font_large.render("ROAD FIGHTER", True, WHITE)
-        title_rect = title.get_rect(center=(SCREEN_WIDTH // 2, 150))
+        title = self.render_text(self.font_large, "ROAD FIGHTER", WHITE)
+        title_rect = title.get_rect(center=pt(SCREEN_WIDTH // 2, 150))
         self.screen.blit(title, title_rect)
         
         # Menu options
         options = ["1 PLAYER", "CREDITS", "EXIT"]
         for i, option in enumerate(options):
             color = YELLOW if i == self.menu_selection else WHITE
-            text = self.font_medium.render(option, True, color)
-            text_rect = text.get_rect(center=(SCREEN_WIDTH // 2, 300 + i * 60))
+            text = self.render_text(self.font_medium, option, color)
+            text_rect = text.get_rect(center=pt(SCREEN_WIDTH // 2, 300 + i * 60))
             self.screen.blit(text, text_rect)
         
         # Instructions
-        instruction = self.font_small.render("Use UP/DOWN arrows and ENTER to select", True, GRAY)
-        instruction_rect = instruction.get_rect(center=(SCREEN_WIDTH // 2, 500))
+        instruction = self.render_text(self.font_small, "Use UP/DOWN arrows and ENTER to select", GRAY)
+        instruction_rect = instruction.get_rect(center=pt(SCREEN_WIDTH // 2, 500))
         self.screen.blit(instruction, instruction_rect)
     
     def draw_game(self):
-        # Draw road
+        # Draw scenery and road
+        start = tracer.begin()
+        self.draw_scenery()
         self.draw_road()
+        tracer.end('draw_road', start)
+        self.perf.lap('road')
         
-        # Draw player (with damage flash effect)
-        if self.damage_flash > 0 and self.damage_flash % 6 < 3:
-            # Flash effect - don't draw player every few frames
-            pass
-        else:
-            self.player.draw(self.screen, self.control_loss, self.spin_angle)
+        # Draw particles on the ground under the cars, then the ghost
+        self.draw_particles()
+        self.draw_ghost()
         
-        # Draw enemy cars
-        for car in self.enemy_cars:
-            car.draw(self.screen)
+        # Draw player and enemy cars
+        self.draw_cars()
+        self.perf.lap('cars')
         
         # Draw UI
+        start = tracer.begin()
         self.draw_ui()
+        if self.replay_prompt and self.state == "GAME":
+            prompt = self.render_text(self.font_small, "I - INSTANT REPLAY", YELLOW)
+            self.screen.blit(prompt, prompt.get_rect(center=self.view.pt(SCREEN_WIDTH // 2, 40)))
+        tracer.end('draw_ui', start)
+        self.perf.lap('ui')
     
-    def draw_road(self):
-        # Road background - properly sized for fullscreen with room for UI
-        road_rect = pygame.Rect(350, 0, 700, SCREEN_HEIGHT)  # Wider road, moved right
-        pygame.draw.rect(self.screen, DARK_GRAY, road_rect)
-        
-        # Guardrails
-        # Left guardrail - moved right to make room for UI
-        left_guardrail = pygame.Rect(340, 0, 10, SCREEN_HEIGHT)
-        pygame.draw.rect(self.screen, WHITE, left_guardrail)
-        # Left guardrail posts
-        for y in range(0, SCREEN_HEIGHT, 30):
-            pygame.draw.rect(self.screen, GRAY, (335, y, 20, 5))
-        
-        # Right guardrail
-        right_guardrail = pygame.Rect(1050, 0, 10, SCREEN_HEIGHT)
-        pygame.draw.rect(self.screen, WHITE, right_guardrail)
-        # Right guardrail posts
-        for y in range(0, SCREEN_HEIGHT, 30):
-            pygame.draw.rect(self.screen, GRAY, (1045, y, 20, 5))
-        
-        # Road edges (inner lines)
-        pygame.draw.line(self.screen, WHITE, (350, 0), (350, SCREEN_HEIGHT), 2)
-        pygame.draw.line(self.screen, WHITE, (1050, 0), (1050, SCREEN_HEIGHT), 2)
-        
-        # Lane dividers - animated with multiple lanes
-        self.road_offset += self.speed
-        if self.road_offset > 80:
-            self.road_offset = 0
-        
-        # Multiple lane lines for wider road
-        lane_positions = [450, 550, 650, 750, 850, 950]  # 6 lanes
+    def draw_instant_replay(self):
+        """Draw the replay frame at the playback position over the whole game area"""
+        pt = self.view.pt
+        frames = self.replay_frames
+        index = min(int(self.replay_position), len(frames) - 1)
+        if index != self.replay_shown:
+            self.instant_replay.decode(frames[index][1], self.replay_surface)
+            self.replay_shown = index
+        pygame.transform.scale(self.replay_surface, self.screen.get_size(), self.screen)
+        
+        speed = REPLAY_SPEEDS[self.replay_speed]
+        title = f"INSTANT REPLAY  {speed:g}x" + ("  PAUSED" if self.replay_paused else "")
+        text = self.render_text(self.font_medium, title, YELLOW)
+        self.screen.blit(text, text.get_rect(center=pt(SCREEN_WIDTH // 2, 40)))
+        
+        # Progress through the buffer
+        pygame.draw.rect(self.screen, WHITE, self.view.rect(SCREEN_WIDTH // 4, 80, SCREEN_WIDTH // 2, 6), 1)
+        filled = (SCREEN_WIDTH // 2) * (index + 1) // len(frames)
+        pygame.draw.rect(self.screen, YELLOW, self.view.rect(SCREEN_WIDTH // 4, 80, filled, 6))
+        
+        # Controls under the bar, clear of the HUD panels in the captured frames
+        for i, line in enumerate(("LEFT/RIGHT - Speed   SPACE - Pause", "E - Export   ESC - Back")):
+            text = self.render_text(self.font_small, line, WHITE)
+            self.screen.blit(text, text.get_rect(center=pt(SCREEN_WIDTH // 2, 115 + i * 30)))
+        if self.replay_message:
+            message = self.render_text(self.font_small, self.replay_message, GREEN)
+            self.screen.blit(message, message.get_rect(center=pt(SCREEN_WIDTH // 2, 185)))
+    
+    def draw_particles(self):
+        self.particles.draw(self.screen)
+    
+    def draw_ghost(self):
+        """Draw the best run's car where it was at this point of its run"""
+        if self.ghost is None or not self.run_steps:
+            return
+        position = self.ghost.position(self.run_steps - 1, self.road_offset)
+        if position is None:
+            return
+        x, y = self.view.pt(*position)
+        sprite = self.ghost_sprite
+        self.screen.blit(sprite, (x - sprite.get_width() // 2, y - sprite.get_height() // 2))
+    
+    def draw_attract(self):
+        """Draw the demo run like a normal game, with a prompt to play"""
+        self.draw_game()
+        prompt = self.render_text(self.font_medium, "DEMO - PRESS ANY KEY", YELLOW)
+        self.screen.blit(prompt, prompt.get_rect(center=self.view.pt(SCREEN_WIDTH // 2, 40)))
+    
+    def draw_cars(self):
+        """Queue the player and traffic sprites and blit them in one batch"""
+        queue = self.render_queue
+        screen = self.screen
+        view = self.view
+        
+        # Lower quality tiers hold each spin-out pose for several frames
+        spin_angle = self.spin_angle
+        if self.effect_interval > 1:
+            spin_angle -= spin_angle % (SPIN_STEP * self.effect_interval)
+        
+        # Damage flash effect - don't draw player every few frames
+        if not (self.damage_flash > 0 and self.damage_flash % 6 < 3):
+            if not self.player.queue_draw(queue, self.control_loss, spin_angle, view):
+                self.player.draw(screen, self.control_loss, spin_angle, view)
         
-        for lane_x in lane_positions:
-            for y in range(-40, SCREEN_HEIGHT + 40, 80):
-                line_y = y + self.road_offset
-                if lane_x == 700:  # Center line
-                    pygame.draw.line(self.screen, YELLOW, (lane_x, line_y), (lane_x, line_y + 40), 4)
-                else:
-                    pygame.draw.line(self.screen, WHITE, (lane_x, line_y), (lane_x, line_y + 40), 2)
+        for car in self.enemy_cars:
+            if not car.queue_draw(queue, view):
+                queue.flush(screen)  # Keep the draw order for cars drawn with shapes
+                car.draw(screen, view)
+        queue.flush(screen)
+    
+    def draw_scenery(self):
+        """Parallax layers behind the road; the grass covers the whole game area"""
+        self.scenery.draw(self.screen, self.road_offset, self.scenery_layers)
+    
+    def draw_road(self):
+        """Blit the baked track chunks on screen (see track.py)"""
+        track = self.track
+        surfaces = track.surfaces
+        view = self.view
+        for index, top in track.visible(self.road_offset):
+            chunk = track.chunks.get(index)
+            if chunk is None:
+                continue  # Not generated yet; only possible if the worker falls far behind
+            dest = view.pt(chunk.x0, top)
+            surface = surfaces.get(index)
+            if surface is not None:
+                self.screen.blit(surface, dest)
+            else:
+                draw_chunk(self.screen, view, chunk, self.road_detail, dest)  # Bake still pending
     
     def draw_ui(self):
+        pt, px = self.view.pt, self.view.px
         # LEFT UI Panel - Fuel and Speed
-        left_panel = pygame.Rect(20, 10, 280, 300)
-        pygame.draw.rect(self.screen, (40, 40, 40), left_panel)
-        pygame.draw.rect(self.screen, WHITE, left_panel, 2)
+        pygame.draw.rect(self.screen, PANEL_COLOR, self.left_panel_rect)
+        pygame.draw.rect(self.screen, WHITE, self.left_panel_rect, px(2))
         
         # Fuel label
-        fuel_label = self.font_small.render("FUEL", True, WHITE)
-        self.screen.blit(fuel_label, (30, 30))
+        fuel_label = self.render_text(self.font_small, "FUEL", WHITE)
+        self.screen.blit(fuel_label, pt(30, 30))
         
         # Fuel percentage positioned at current position
-        fuel_percent = self.font_small.render(f"{int(self.fuel)}%", True, WHITE)
-        self.screen.blit(fuel_percent, (160, 60))  # Keep percentage at current position
+        fuel_percent = self.render_value('fuel', self.font_small, int(self.fuel), "{}%", WHITE)
+        self.screen.blit(fuel_percent, pt(160, 60))  # Keep percentage at current position
         
         # Fuel bar positioned back to original position (rolled back)
-        fuel_rect = pygame.Rect(30, 95, 120, 12)  # Rolled back to original y-position 95
-        pygame.draw.rect(self.screen, RED, fuel_rect)
-        fuel_fill = pygame.Rect(30, 95, int(120 * self.fuel / 100), 12)  # Rolled back to y-position 95
-        pygame.draw.rect(self.screen, GREEN, fuel_fill)
-        pygame.draw.rect(self.screen, WHITE, fuel_rect, 1)
+        fuel_bar = self.fuel_bar_rect
+        pygame.draw.rect(self.screen, RED, fuel_bar)
+        self.screen.fill(GREEN, (fuel_bar.x, fuel_bar.y, int(fuel_bar.width * self.fuel / 100), fuel_bar.height))
+        pygame.draw.rect(self.screen, WHITE, fuel_bar, 1)
         
         # Speed with more spacing between label and value
-        speed_label = self.font_small.render("SPEED", True, WHITE)
-        self.screen.blit(speed_label, (30, 110))
-        speed_value = self.font_small.render(f"{int(self.speed * 10)} KM/H", True, YELLOW)
-        self.screen.blit(speed_value, (30, 140))
+        speed_label = self.render_text(self.font_small, "SPEED", WHITE)
+        self.screen.blit(speed_label, pt(30, 110))
+        speed_value = self.render_value('speed', self.font_small, int(self.speed * 10), "{} KM/H", YELLOW)
+        self.screen.blit(speed_value, pt(30, 140))
         
         # Instructions moved to bottom area with larger panel
-        instruction_panel = pygame.Rect(20, SCREEN_HEIGHT - 140, 280, 120)  # Larger panel
-        pygame.draw.rect(self.screen, (40, 40, 40), instruction_panel)
-        pygame.draw.rect(self.screen, WHITE, instruction_panel, 2)
+        pygame.draw.rect(self.screen, PANEL_COLOR, self.instruction_panel_rect)  # Larger panel
+        pygame.draw.rect(self.screen, WHITE, self.instruction_panel_rect, px(2))
         
         instruction_y = SCREEN_HEIGHT - 130  # Moved up from -120 to -130 for better top spacing
-        esc_text = self.font_tiny.render("ESC - RETURN", True, WHITE)
-        self.screen.blit(esc_text, (30, instruction_y))
-        menu_text = self.font_tiny.render("TO MENU", True, WHITE)
-        self.screen.blit(menu_text, (30, instruction_y + 20))
+        esc_text = self.render_text(self.font_tiny, "ESC - RETURN", WHITE)
+        self.screen.blit(esc_text, pt(30, instruction_y))
+        menu_text = self.render_text(self.font_tiny, "TO MENU", WHITE)
+        self.screen.blit(menu_text, pt(30, instruction_y + 20))
         
-        arrow_text = self.font_tiny.render("ARROW KEYS", True, WHITE)
-        self.screen.blit(arrow_text, (30, instruction_y + 45))
-        move_text = self.font_tiny.render("TO MOVE", True, WHITE)
-        self.screen.blit(move_text, (30, instruction_y + 65))
+        arrow_text = self.render_text(self.font_tiny, "ARROW KEYS", WHITE)
+        self.screen.blit(arrow_text, pt(30, instruction_y + 45))
+        move_text = self.render_text(self.font_tiny, "TO MOVE", WHITE)
+        self.screen.blit(move_text, pt(30, instruction_y + 65))
         
         # RIGHT UI Panel - Distance and Score (outside right guardrail)
-        right_panel = pygame.Rect(1080, 10, 280, 300)
-        pygame.draw.rect(self.screen, (40, 40, 40), right_panel)
-        pygame.draw.rect(self.screen, WHITE, right_panel, 2)
+        pygame.draw.rect(self.screen, PANEL_COLOR, self.right_panel_rect)
+        pygame.draw.rect(self.screen, WHITE, self.right_panel_rect, px(2))
         
         # Score with more spacing between label and value
-        score_label = self.font_small.render("SCORE", True, WHITE)
-        self.screen.blit(score_label, (1090, 30))
-        score_value = self.font_small.render(f"{int(self.score)}", True, YELLOW)
-        self.screen.blit(score_value, (1090, 60))
+        score_label = self.render_text(self.font_small, "SCORE", WHITE)
+        self.screen.blit(score_label, pt(1090, 30))
+        score_value = self.render_value('score', self.font_small, int(self.score), "{}", YELLOW)
+        self.screen.blit(score_value, pt(1090, 60))
         
         # Distance with more spacing between label and value
-        distance_label = self.font_small.render("DISTANCE", True, WHITE)
-        self.screen.blit(distance_label, (1090, 120))
-        distance_value = self.font_small.render(f"{int(self.distance)} KM", True, YELLOW)
-        self.screen.blit(distance_value, (1090, 150))
+        distance_label = self.render_text(self.font_small, "DISTANCE", WHITE)
+        self.screen.blit(distance_label, pt(1090, 120))
+        distance_value = self.render_value('distance', self.font_small, int(self.distance), "{} KM", YELLOW)
+        self.screen.blit(distance_value, pt(1090, 150))
         
         # High Score with more spacing between label and value
-        high_score_label = self.font_small.render("HIGH SCORE", True, WHITE)
-        self.screen.blit(high_score_label, (1090, 210))
-        high_score_value = self.font_small.render(f"{int(self.high_score)}", True, YELLOW)
-        self.screen.blit(high_score_value, (1090, 240))
+        high_score_label = self.render_text(self.font_small, "HIGH SCORE", WHITE)
+        self.screen.blit(high_score_label, pt(1090, 210))
+        high_score_value = self.render_value('high_score', self.font_small, int(self.high_score), "{}", YELLOW)
+        self.screen.blit(high_score_value, pt(1090, 240))
         
         # Status messages moved to center screen to avoid UI overlap
         if self.damage_flash > 0:
-            damage_text = self.font_medium.render("COLLISION!", True, RED)
-            damage_rect = damage_text.get_rect(center=(SCREEN_WIDTH // 2, 100))
+            damage_text = self.render_text(self.font_medium, "COLLISION!", RED)
+            damage_rect = damage_text.get_rect(center=pt(SCREEN_WIDTH // 2, 100))
             self.screen.blit(damage_text, damage_rect)
         
         # Control loss indicator - center screen
         if self.control_loss > 0:
-            control_text = self.font_medium.render("SPINNING OUT!", True, RED)
-            control_rect = control_text.get_rect(center=(SCREEN_WIDTH // 2, 140))
+            control_text = self.render_text(self.font_medium, "SPINNING OUT!", RED)
+            control_rect = control_text.get_rect(center=pt(SCREEN_WIDTH // 2, 140))
             self.screen.blit(control_text, control_rect)
         
         # Visual sound feedback - center screen only
@@ -880,35 +1581,30 @@ class Game:
                 font = self.font_small
                 y_pos = 190
             
-            sound_text = font.render(self.sound_feedback, True, self.sound_feedback_color)
-            sound_rect = sound_text.get_rect(center=(SCREEN_WIDTH // 2, y_pos))
+            sound_text = self.render_text(font, self.sound_feedback, self.sound_feedback_color)
+            sound_rect = sound_text.get_rect(center=pt(SCREEN_WIDTH // 2, y_pos))
             self.screen.blit(sound_text, sound_rect)
     
     def draw_pause(self):
         """Draw simple pause menu overlay"""
+        pt = self.view.pt
         # First draw the game in the background (frozen)
+        self.draw_scenery()
         self.draw_road()
         
-        # Draw player and cars (frozen)
-        if self.damage_flash > 0 and self.damage_flash % 6 < 3:
-            pass
-        else:
-            self.player.draw(self.screen, self.control_loss, self.spin_angle)
-        
-        for car in self.enemy_cars:
-            car.draw(self.screen)
+        # Draw particles, the ghost, player and cars (frozen)
+        self.draw_particles()
+        self.draw_ghost()
+        self.draw_cars()
         
         self.draw_ui()
         
         # Draw semi-transparent overlay
-        overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
-        overlay.set_alpha(128)  # Semi-transparent
-        overlay.fill((0, 0, 0))
-        self.screen.blit(overlay, (0, 0))
+        self.screen.blit(self.pause_overlay, (0, 0))
         
         # Draw ONLY the pause content - nothing else
-        pause_title = self.font_large.render("PAUSED", True, WHITE)
-        pause_rect = pause_title.get_rect(center=(SCREEN_WIDTH // 2, 300))
+        pause_title = self.render_text(self.font_large, "PAUSED", WHITE)
+        pause_rect = pause_title.get_rect(center=pt(SCREEN_WIDTH // 2, 300))
         self.screen.blit(pause_title, pause_rect)
         
         # Simple instructions only
@@ -919,11 +1615,12 @@ class Game:
         ]
         
         for i, instruction in enumerate(instructions):
-            text = self.font_small.render(instruction, True, WHITE)
-            text_rect = text.get_rect(center=(SCREEN_WIDTH // 2, 400 + i * 40))
+            text = self.render_text(self.font_small, instruction, WHITE)
+            text_rect = text.get_rect(center=pt(SCREEN_WIDTH // 2, 400 + i * 40))
             self.screen.blit(text, text_rect)
     
     def draw_credits(self):
+        pt = self.view.pt
         credits_text = [
             "Road Fighter - Pygame Edition",
             "",
@@ -937,24 +1634,25 @@ class Game:
         for i, line in enumerate(credits_text):
             color = YELLOW if i == 0 else WHITE
             font = self.font_medium if i == 0 else self.font_small
-            text = font.render(line, True, color)
-            text_rect = text.get_rect(center=(SCREEN_WIDTH // 2, 150 + i * 30))
+            text = self.render_text(font, line, color)
+            text_rect = text.get_rect(center=pt(SCREEN_WIDTH // 2, 150 + i * 30))
             self.screen.blit(text, text_rect)
     
     def draw_how_to_play(self):
         """Completely recreated How to Play screen with better spacing and layout"""
+        pt = self.view.pt
         # Dark gradient background
         self.screen.fill((10, 20, 40))
         
         # Title - centered at top with more space
-        title_text = self.font_large.render("HOW TO PLAY", True, WHITE)
-        title_rect = title_text.get_rect(center=(GAME_AREA_WIDTH // 2, 100))
+        title_text = self.render_text(self.font_large, "HOW TO PLAY", WHITE)
+        title_rect = title_text.get_rect(center=pt(GAME_AREA_WIDTH // 2, 100))
         self.screen.blit(title_text, title_rect)
         
         # VEHICLES section
         vehicles_y = 200
-        vehicles_title = self.font_medium.render("VEHICLES", True, YELLOW)
-        vehicles_rect = vehicles_title.get_rect(center=(GAME_AREA_WIDTH // 2, vehicles_y))
+        vehicles_title = self.render_text(self.font_medium, "VEHICLES", YELLOW)
+        vehicles_rect = vehicles_title.get_rect(center=pt(GAME_AREA_WIDTH // 2, vehicles_y))
         self.screen.blit(vehicles_title, vehicles_rect)
         
         # Vehicle sprites display - moved to the right, keeping original spacing
@@ -967,7 +1665,7 @@ class Game:
         for i, sprite_name in enumerate(sprite_names):
             sprite = self.sprite_manager.get_sprite(sprite_name)
             if sprite:
-                sprite_rect = sprite.get_rect(center=(x_positions[i], sprite_y))
+                sprite_rect = sprite.get_rect(center=pt(x_positions[i], sprite_y))
                 self.screen.blit(sprite, sprite_rect)
         
         # Vehicle labels with better spacing - moved to match vehicle positions
@@ -975,25 +1673,25 @@ class Game:
         
         for i, desc in enumerate(descriptions):
             # Only description text - moved to match new vehicle positions
-            desc_text = self.font_tiny.render(desc, True, WHITE)
-            desc_rect = desc_text.get_rect(center=(x_positions[i], sprite_y + 80))
+            desc_text = self.render_text(self.font_tiny, desc, WHITE)
+            desc_rect = desc_text.get_rect(center=pt(x_positions[i], sprite_y + 80))
             self.screen.blit(desc_text, desc_rect)
         
         # FUEL STATION section - separate area
         fuel_y = sprite_y + 140  # Reduced spacing since we removed labels
-        fuel_title = self.font_medium.render("FUEL STATION", True, GREEN)
-        fuel_title_rect = fuel_title.get_rect(center=(GAME_AREA_WIDTH // 2, fuel_y))
+        fuel_title = self.render_text(self.font_medium, "FUEL STATION", GREEN)
+        fuel_title_rect = fuel_title.get_rect(center=pt(GAME_AREA_WIDTH // 2, fuel_y))
         self.screen.blit(fuel_title, fuel_title_rect)
         
         # Fuel station sprite - centered and prominent
         fuel_sprite = self.sprite_manager.get_sprite('fuel_station')
         if fuel_sprite:
-            fuel_rect = fuel_sprite.get_rect(center=(GAME_AREA_WIDTH // 2, fuel_y + 70))
+            fuel_rect = fuel_sprite.get_rect(center=pt(GAME_AREA_WIDTH // 2, fuel_y + 70))
             self.screen.blit(fuel_sprite, fuel_rect)
         
         # Fuel description
-        fuel_desc = self.font_small.render("COLLECT TO REFUEL YOUR CAR", True, GREEN)
-        fuel_desc_rect = fuel_desc.get_rect(center=(GAME_AREA_WIDTH // 2, fuel_y + 140))
+        fuel_desc = self.render_text(self.font_small, "COLLECT TO REFUEL YOUR CAR", GREEN)
+        fuel_desc_rect = fuel_desc.get_rect(center=pt(GAME_AREA_WIDTH // 2, fuel_y + 140))
         self.screen.blit(fuel_desc, fuel_desc_rect)
         
         # Bottom section - CONTROLS and OBJECTIVES side by side - moved up to avoid overlapping
@@ -1001,8 +1699,8 @@ class Game:
         
         # CONTROLS section - left side with more space and bottom padding
         controls_x = 300
-        controls_title = self.font_medium.render("CONTROLS", True, YELLOW)
-        self.screen.blit(controls_title, (controls_x, bottom_section_y))
+        controls_title = self.render_text(self.font_medium, "CONTROLS", YELLOW)
+        self.screen.blit(controls_title, pt(controls_x, bottom_section_y))
         
         # Control instructions with better spacing
         controls = [
@@ -1012,16 +1710,16 @@ class Game:
         ]
         
         for i, control in enumerate(controls):
-            control_text = self.font_tiny.render(control, True, WHITE)
-            self.screen.blit(control_text, (controls_x, bottom_section_y + 60 + (i * 35)))  # Changed from +50 to +60 for line space
+            control_text = self.render_text(self.font_tiny, control, WHITE)
+            self.screen.blit(control_text, pt(controls_x, bottom_section_y + 60 + (i * 35)))  # Changed from +50 to +60 for line space
         
         # Add 2px bottom padding for controls section
         controls_bottom = bottom_section_y + 60 + (len(controls) * 35) + 2  # Updated calculation
         
         # OBJECTIVES section - right side with more space and bottom padding
         objectives_x = 900
-        objectives_title = self.font_medium.render("OBJECTIVES", True, RED)
-        self.screen.blit(objectives_title, (objectives_x, bottom_section_y))
+        objectives_title = self.render_text(self.font_medium, "OBJECTIVES", RED)
+        self.screen.blit(objectives_title, pt(objectives_x, bottom_section_y))
         
         # Objective list with better spacing
         objectives = [
@@ -1031,8 +1729,8 @@ class Game:
         ]
         
         for i, objective in enumerate(objectives):
-            obj_text = self.font_tiny.render(objective, True, WHITE)
-            self.screen.blit(obj_text, (objectives_x, bottom_section_y + 60 + (i * 35)))  # Changed from +50 to +60 for line space
+            obj_text = self.render_text(self.font_tiny, objective, WHITE)
+            self.screen.blit(obj_text, pt(objectives_x, bottom_section_y + 60 + (i * 35)))  # Changed from +50 to +60 for line space
         
         # Add 2px bottom padding for objectives section
         objectives_bottom = bottom_section_y + 60 + (len(objectives) * 35) + 2  # Updated calculation for line space
@@ -1044,40 +1742,41 @@ class Game:
         instruction_y = sections_bottom + 50  # Reduced from 60 to 50 for tighter spacing
         
         # Main instruction - prominent
-        instruction_text = self.font_small.render("PRESS SPACE TO START GAME", True, YELLOW)
-        instruction_rect = instruction_text.get_rect(center=(GAME_AREA_WIDTH // 2, instruction_y))
+        instruction_text = self.render_text(self.font_small, "PRESS SPACE TO START GAME", YELLOW)
+        instruction_rect = instruction_text.get_rect(center=pt(GAME_AREA_WIDTH // 2, instruction_y))
         self.screen.blit(instruction_text, instruction_rect)
         
         # Secondary instruction
-        escape_text = self.font_tiny.render("PRESS ESC TO RETURN TO MENU", True, GRAY)
-        escape_rect = escape_text.get_rect(center=(GAME_AREA_WIDTH // 2, instruction_y + 40))
+        escape_text = self.render_text(self.font_tiny, "PRESS ESC TO RETURN TO MENU", GRAY)
+        escape_rect = escape_text.get_rect(center=pt(GAME_AREA_WIDTH // 2, instruction_y + 40))
         self.screen.blit(escape_text, escape_rect)
     
     def draw_game_over(self):
         """Draw game over screen with statistics"""
+        pt = self.view.pt
         self.screen.fill((40, 20, 20))  # Dark red background
         
         # Game Over title
-        game_over_text = self.font_large.render("GAME OVER", True, RED)
-        game_over_rect = game_over_text.get_rect(center=(GAME_AREA_WIDTH // 2, 100))
+        game_over_text = self.render_text(self.font_large, "GAME OVER", RED)
+        game_over_rect = game_over_text.get_rect(center=pt(GAME_AREA_WIDTH // 2, 100))
         self.screen.blit(game_over_text, game_over_rect)
         
         # Statistics
         stats_y = 200
         
         # Final Score
-        score_text = self.font_medium.render(f"Final Score: {int(self.score)}", True, WHITE)
-        score_rect = score_text.get_rect(center=(GAME_AREA_WIDTH // 2, stats_y))
+        score_text = self.render_value('final_score', self.font_medium, int(self.score), "Final Score: {}", WHITE)
+        score_rect = score_text.get_rect(center=pt(GAME_AREA_WIDTH // 2, stats_y))
         self.screen.blit(score_text, score_rect)
         
         # Distance Traveled
-        distance_text = self.font_medium.render(f"Distance: {int(self.distance)} km", True, WHITE)
-        distance_rect = distance_text.get_rect(center=(GAME_AREA_WIDTH // 2, stats_y + 50))
+        distance_text = self.render_value('final_distance', self.font_medium, int(self.distance), "Distance: {} km", WHITE)
+        distance_rect = distance_text.get_rect(center=pt(GAME_AREA_WIDTH // 2, stats_y + 50))
         self.screen.blit(distance_text, distance_rect)
         
         # High Score
-        high_score_text = self.font_medium.render(f"High Score: {int(self.high_score)}", True, YELLOW)
-        high_score_rect = high_score_text.get_rect(center=(GAME_AREA_WIDTH // 2, stats_y + 100))
+        high_score_text = self.render_value('final_high_score', self.font_medium, int(self.high_score), "High Score: {}", YELLOW)
+        high_score_rect = high_score_text.get_rect(center=pt(GAME_AREA_WIDTH // 2, stats_y + 100))
         self.screen.blit(high_score_text, high_score_rect)
         
         # Performance rating
@@ -1094,20 +1793,64 @@ class Game:
             rating = "TRY AGAIN"
             rating_color = RED
         
-        rating_text = self.font_medium.render(rating, True, rating_color)
-        rating_rect = rating_text.get_rect(center=(GAME_AREA_WIDTH // 2, stats_y + 150))
+        rating_text = self.render_text(self.font_medium, rating, rating_color)
+        rating_rect = rating_text.get_rect(center=pt(GAME_AREA_WIDTH // 2, stats_y + 150))
         self.screen.blit(rating_text, rating_rect)
         
         # Instructions
-        restart_text = self.font_small.render("Press R to Restart", True, GREEN)
-        restart_rect = restart_text.get_rect(center=(GAME_AREA_WIDTH // 2, 450))
+        restart_text = self.render_text(self.font_small, "Press R to Restart, I for Instant Replay", GREEN)
+        restart_rect = restart_text.get_rect(center=pt(GAME_AREA_WIDTH // 2, 450))
         self.screen.blit(restart_text, restart_rect)
         
-        menu_text = self.font_small.render("Press SPACE to Return to Menu", True, WHITE)
-        menu_rect = menu_text.get_rect(center=(GAME_AREA_WIDTH // 2, 480))
+        menu_text = self.render_text(self.font_small, "Press SPACE to Return to Menu", WHITE)
+        menu_rect = menu_text.get_rect(center=pt(GAME_AREA_WIDTH // 2, 480))
         self.screen.blit(menu_text, menu_rect)
 
+class FrameSnapshot(Game):
+    """The game as one simulation step left it, drawn on the main thread (see pipeline.py)
+
+    A shallow copy: the player and cars are copied so later steps can't move
+    them mid-draw, while surfaces, fonts and caches are shared with the game.
+    """
+    
+    def __init__(self, game, previous):
+        self.__dict__.update(game.__dict__)
+        self.time = time.perf_counter()
+        self.positions = {}  # Car -> position at this step, where the next snapshot moves it from
+        self.moves = []  # (copy, start x, start y, x, y) for cars that moved since the previous snapshot
+        last_positions = previous.positions if previous is not None else {}
+        # The road scrolls smoothly too, except when a new run starts it over
+        self.road_end = game.road_offset
+        self.road_start = previous.road_end if previous is not None and previous.road_end <= game.road_offset else game.road_offset
+        if game.player is not None:
+            self.player = self.copy_car(game.player, last_positions)
+        self.enemy_cars = [self.copy_car(car, last_positions) for car in game.enemy_cars]
+        self.particles = game.particles.capture()
+    
+    def copy_car(self, car, last_positions):
+        position = (car.x, car.y)
+        self.positions[car] = position
+        start = last_positions.get(car, position)
+        car = copy.copy(car)
+        if start != position:
+            self.moves.append((car, start[0], start[1], position[0], position[1]))
+        return car
+    
+    def interpolate(self, alpha):
+        """Place moving cars and the road `alpha` of the way from their previous to their current position"""
+        self.road_offset = self.road_start + (self.road_end - self.road_start) * alpha
+        for car, start_x, start_y, x, y in self.moves:
+            car.x = start_x + (x - start_x) * alpha
+            car.y = start_y + (y - start_y) * alpha
+    
+    def draw_particles(self):
+        # Particles are where this step left them; move them back with the road
+        self.particles.draw(self.screen, self.road_offset - self.road_end)
+
+
 class PlayerCar:
+    rng = random  # Source of the spin-out jitter (simulated copies use their own, see sim_state.py)
+    
     def __init__(self, x, y, sprite_manager):
         self.x = x
         self.y = y
@@ -1116,9 +1859,11 @@ class PlayerCar:
         self.speed = 5
         self.rect = pygame.Rect(x - self.width // 2, y - self.height // 2, self.width, self.height)
         self.sprite_manager = sprite_manager
-        self.sprite = sprite_manager.get_sprite('player_car')
+        self.mask = sprite_manager.collision_mask('player_car', self.rect.size)
+        self.draw_rect = pygame.Rect(0, 0, 0, 0)  # Blit position, reused every frame
+        self.load_sprites()
     
-    def update(self, keys, slide_effect, slide_direction, control_loss, spin_angle):
+    def update(self, keys, slide_effect, slide_direction, control_loss, spin_angle, track):
         # Calculate control factor based on effects
         if control_loss > 0:
             control_factor = 0.1  # Very little control during spin out
@@ -1135,71 +1880,177 @@ class PlayerCar:
         # Apply random movement during control loss
         if control_loss > 0:
             # Random jerky movement during spin out
-            self.x += random.randint(-2, 2)
-            self.y += random.randint(-1, 1)
+            self.x += self.rng.randint(-2, 2)
+            self.y += self.rng.randint(-1, 1)
         
         # Movement with control factor
         move_speed = self.speed * control_factor
         
-        if keys[pygame.K_LEFT] and self.x > 400:  # Adjusted for new road boundaries (350 + 50 margin)
+        if keys[pygame.K_LEFT]:
             self.x -= move_speed
-        if keys[pygame.K_RIGHT] and self.x < 1000:  # Adjusted for new road boundaries (1050 - 50 margin)
+        if keys[pygame.K_RIGHT]:
             self.x += move_speed
         if keys[pygame.K_UP] and self.y > 75:  # Adjusted for larger cars
             self.y -= move_speed
         if keys[pygame.K_DOWN] and self.y < SCREEN_HEIGHT - 75:  # Adjusted for larger cars
             self.y += move_speed
         
-        # Keep player within road boundaries
-        self.x = max(400, min(1000, self.x))  # Adjusted for new road boundaries
+        # Keep player on the road (edges and median of the row it is on)
         self.y = max(75, min(SCREEN_HEIGHT - 75, self.y))  # Adjusted for larger cars
+        self.x = track.clamp(self.x, self.y, PLAYER_ROAD_MARGIN)
         
         # Update rect
         self.rect.center = (self.x, self.y)
     
-    def draw(self, screen, control_loss, spin_angle):
+    def hitbox(self, control_loss, spin_angle):
+        """Rect and collision mask of the car as drawn, turned while it spins out"""
+        if control_loss <= 0:
+            return self.rect, self.mask
+        mask = self.sprite_manager.collision_mask('player_car', self.rect.size, spin_angle % 360)
+        return mask.get_rect(center=self.rect.center), mask
+    
+    def load_sprites(self):
+        """Fetch sprites at the sprite manager's current render scale"""
+        self.sprite = self.sprite_manager.get_sprite('player_car')
+        self.fallback_sprite = self.sprite_manager.fallback_player()
+        self.spin_cache = [None, None]  # Last rotation: angle, rotated sprite (shared with frame snapshots)
+    
+    def draw(self, screen, control_loss, spin_angle, view=UNSCALED):
         if self.sprite:
             # Use sprite if available
             if control_loss > 0:
                 # Rotate sprite during control loss
                 rotated_sprite = pygame.transform.rotate(self.sprite, spin_angle % 360)
-                sprite_rect = rotated_sprite.get_rect(center=(self.x, self.y))
+                sprite_rect = rotated_sprite.get_rect(center=view.pt(self.x, self.y))
                 screen.blit(rotated_sprite, sprite_rect)
             else:
                 # Normal sprite drawing
-                sprite_rect = self.sprite.get_rect(center=(self.x, self.y))
+                sprite_rect = self.sprite.get_rect(center=view.pt(self.x, self.y))
                 screen.blit(self.sprite, sprite_rect)
         else:
             # Fallback to original drawing if no sprite
             if control_loss > 0:
                 # During control loss, draw a simple rotated rectangle
-                simple_surface = pygame.Surface((40, 60), pygame.SRCALPHA)
-                pygame.draw.rect(simple_surface, BLUE, (5, 5, 30, 50))
-                pygame.draw.rect(simple_surface, WHITE, (10, 10, 20, 12))  # Windshield
-                pygame.draw.rect(simple_surface, RED, (12, 47, 16, 6))     # Taillights
+                simple_surface = pygame.Surface(view.size(40, 60), pygame.SRCALPHA)
+                pygame.draw.rect(simple_surface, BLUE, view.rect(5, 5, 30, 50))
+                pygame.draw.rect(simple_surface, WHITE, view.rect(10, 10, 20, 12))  # Windshield
+                pygame.draw.rect(simple_surface, RED, view.rect(12, 47, 16, 6))     # Taillights
                 
                 rotated_surface = pygame.transform.rotate(simple_surface, spin_angle % 360)
-                rotated_rect = rotated_surface.get_rect(center=(self.x, self.y))
+                rotated_rect = rotated_surface.get_rect(center=view.pt(self.x, self.y))
                 screen.blit(rotated_surface, rotated_rect)
             else:
-                # Normal drawing - simplified for performance
-                car_rect = pygame.Rect(self.x - 37, self.y - 37, 75, 75)  # Updated for square cars
-                pygame.draw.rect(screen, BLUE, car_rect)
-                
-                # Windshield
-                pygame.draw.rect(screen, (173, 216, 230), (self.x - 25, self.y - 30, 50, 20))
-                # Rear window
-                pygame.draw.rect(screen, (173, 216, 230), (self.x - 25, self.y + 10, 50, 15))
-                
-                # Headlights
-                pygame.draw.circle(screen, YELLOW, (int(self.x - 15), int(self.y - 33)), 5)
-                pygame.draw.circle(screen, YELLOW, (int(self.x + 15), int(self.y - 33)), 5)
-                
-                # Taillights
-                pygame.draw.rect(screen, RED, (self.x - 20, self.y + 27, 15, 8))
-                pygame.draw.rect(screen, RED, (self.x + 5, self.y + 27, 15, 8))
+                draw_player_shapes(screen, view, self.x, self.y)
+    
+    def queue_draw(self, queue, control_loss, spin_angle, view=UNSCALED):
+        """Add this frame's sprite to the render queue; False if it has to be drawn directly"""
+        x, y = view.pt(self.x, self.y)
+        if self.sprite:
+            if control_loss > 0:
+                angle = spin_angle % 360
+                spin_cache = self.spin_cache
+                if angle != spin_cache[0]:  # Held poses reuse the last rotation
+                    spin_cache[:] = angle, pygame.transform.rotate(self.sprite, angle)
+                sprite = spin_cache[1]
+                queue.add(sprite, sprite.get_rect(center=(x, y)), LAYER_PLAYER)
+            else:
+                self.draw_rect.topleft = (x - self.sprite.get_width() // 2, y - self.sprite.get_height() // 2)
+                queue.add(self.sprite, self.draw_rect, LAYER_PLAYER)
+            return True
+        if control_loss > 0:
+            return False  # The spinning fallback is rotated from a different shape
+        sprite, (offset_x, offset_y) = self.fallback_sprite
+        self.draw_rect.topleft = (x + offset_x, y + offset_y)
+        queue.add(sprite, self.draw_rect, LAYER_PLAYER)
+        return True
+
+
+def draw_player_shapes(screen, view, x, y):
+    """Fallback player car drawing, used when player_car.png is missing"""
+    pt, px, rect = view.pt, view.px, view.rect
+    car_rect = rect(x - 37, y - 37, 75, 75)  # Updated for square cars
+    pygame.draw.rect(screen, BLUE, car_rect)
+    
+    # Windshield
+    pygame.draw.rect(screen, (173, 216, 230), rect(x - 25, y - 30, 50, 20))
+    # Rear window
+    pygame.draw.rect(screen, (173, 216, 230), rect(x - 25, y + 10, 50, 15))
+    
+    # Headlights
+    pygame.draw.circle(screen, YELLOW, pt(int(x - 15), int(y - 33)), px(5))
+    pygame.draw.circle(screen, YELLOW, pt(int(x + 15), int(y - 33)), px(5))
+    
+    # Taillights
+    pygame.draw.rect(screen, RED, rect(x - 20, y + 27, 15, 8))
+    pygame.draw.rect(screen, RED, rect(x + 5, y + 27, 15, 8))
+
+
+def draw_enemy_shapes(screen, view, x, y, car_type, enemy_type, color, zigzag_direction):
+    """Fallback enemy car and fuel station drawing, used when their sprites are missing"""
+    pt, px, rect = view.pt, view.px, view.rect
+    if car_type == 'fuel':
+        if enemy_type == 'fuel_station':
+            # Stationary fuel station - simple design (larger)
+            station_rect = rect(x - 50, y - 50, 100, 100)
+            pygame.draw.rect(screen, GREEN, station_rect)
+            
+            # Fuel symbol (large and clear)
+            pygame.draw.circle(screen, BLACK, pt(int(x), int(y)), px(25))
+            pygame.draw.circle(screen, WHITE, pt(int(x), int(y)), px(20))
+            
+            # "F" for fuel (rendered once per size and shared by all stations)
+            font_size = view.font_size(48)
+            fuel_text = EnemyCar.fuel_labels.get(font_size)
+            if fuel_text is None:
+                fuel_text = pygame.font.Font(None, font_size).render("F", True, BLACK)
+                EnemyCar.fuel_labels[font_size] = fuel_text
+            text_rect = fuel_text.get_rect(center=pt(x, y))
+            screen.blit(fuel_text, text_rect)
+            
+        else:
+            # Moving fuel truck - simplified (larger)
+            truck_rect = rect(x - 37, y - 37, 75, 75)
+            pygame.draw.rect(screen, GREEN, truck_rect)
+            
+            # Fuel symbol
+            pygame.draw.circle(screen, BLACK, pt(int(x), int(y)), px(18))
+            pygame.draw.circle(screen, WHITE, pt(int(x), int(y)), px(15))
+            
+    else:
+        # Regular enemy car - simplified (square)
+        car_rect = rect(x - 37, y - 37, 75, 75)
+        pygame.draw.rect(screen, color, car_rect)
+        
+        # Windshield
+        pygame.draw.rect(screen, (173, 216, 230), rect(x - 25, y - 30, 50, 20))
+        
+        # Car type indicators (simplified)
+        if enemy_type == 'reactive':
+            # Police lights
+            pygame.draw.rect(screen, RED, rect(x - 15, y - 40, 10, 6))
+            pygame.draw.rect(screen, BLUE, rect(x + 5, y - 40, 10, 6))
+            
+        elif enemy_type == 'zigzag':
+            # Racing stripe
+            pygame.draw.line(screen, WHITE, pt(x, y - 37), pt(x, y + 37), px(6))
+            
+            # Direction arrow (simplified)
+            if zigzag_direction == 1:  # Moving right
+                pygame.draw.polygon(screen, WHITE, [
+                    pt(x + 20, y), pt(x + 30, y - 6), pt(x + 30, y + 6)
+                ])
+            else:  # Moving left
+                pygame.draw.polygon(screen, WHITE, [
+                    pt(x - 20, y), pt(x - 30, y - 6), pt(x - 30, y + 6)
+                ])
+        
+        # Headlights for all cars
+        pygame.draw.circle(screen, WHITE, pt(int(x - 15), int(y - 33)), px(4))
+        pygame.draw.circle(screen, WHITE, pt(int(x + 15), int(y - 33)), px(4))
 
 class EnemyCar:
+    fuel_labels = {}  # Shared "F" text for the fallback fuel station drawing, by font size
+    
     def __init__(self, x, y, car_type='normal', enemy_type='static', sprite_manager=None):
         self.x = x
         self.y = y
@@ -1210,22 +2061,22 @@ class EnemyCar:
             self.width = 75  # Cars are square
             self.height = 75
         self.speed = random.randint(1, 3)
+        self.road_margin = max(ENEMY_ROAD_MARGIN, self.width // 2)
         self.car_type = car_type
         self.enemy_type = enemy_type
         self.rect = pygame.Rect(x - self.width // 2, y - self.height // 2, self.width, self.height)
         self.sprite_manager = sprite_manager
         
-        # Load appropriate sprite
-        self.sprite = None
-        if sprite_manager:
-            if car_type == 'fuel' and enemy_type == 'fuel_station':
-                self.sprite = sprite_manager.get_sprite('fuel_station')
-            elif enemy_type == 'static':
-                self.sprite = sprite_manager.get_sprite('enemy_static')
-            elif enemy_type == 'reactive':
-                self.sprite = sprite_manager.get_sprite('enemy_police')
-            elif enemy_type == 'zigzag':
-                self.sprite = sprite_manager.get_sprite('enemy_sports')
+        # Pick the appropriate sprite (loaded in load_sprites)
+        self.sprite_name = None
+        if car_type == 'fuel' and enemy_type == 'fuel_station':
+            self.sprite_name = 'fuel_station'
+        elif enemy_type == 'static':
+            self.sprite_name = 'enemy_static'
+        elif enemy_type == 'reactive':
+            self.sprite_name = 'enemy_police'
+        elif enemy_type == 'zigzag':
+            self.sprite_name = 'enemy_sports'
         
         # For zigzag movement
         self.zigzag_direction = random.choice([-1, 1])  # -1 for left, 1 for right
@@ -1240,20 +2091,41 @@ class EnemyCar:
         if car_type == 'fuel':
             self.color = GREEN
         else:
-            if enemy_type == 'static':
-                self.color = random.choice([RED, YELLOW, ORANGE])
-            elif enemy_type == 'reactive':
-                self.color = random.choice([WHITE, GRAY])
-            elif enemy_type == 'zigzag':
-                self.color = random.choice([BLUE, (128, 0, 128)])  # Blue or Purple
-    
-    def update(self, road_speed, player):
+            if enemy_type in ENEMY_COLORS:
+                self.color = random.choice(ENEMY_COLORS[enemy_type])
+        
+        # Opaque pixels of the sprite, aligned with rect
+        if sprite_manager:
+            self.mask = sprite_manager.collision_mask(self.sprite_name, self.rect.size)
+        else:
+            self.mask = pygame.Mask(self.rect.size, fill=True)
+        
+        # Blit position (reused every frame), sprite and pre-baked fallback drawings
+        self.draw_rect = pygame.Rect(0, 0, 0, 0)
+        self.sprite = None
+        self.sprite_offset = (0, 0)
+        self.fallback_sprites = None
+        if sprite_manager:
+            self.load_sprites()
+    
+    def load_sprites(self):
+        """Fetch sprites at the sprite manager's current render scale"""
+        self.sprite = self.sprite_manager.get_sprite(self.sprite_name) if self.sprite_name else None
+        if self.sprite:
+            self.sprite_offset = (-(self.sprite.get_width() // 2), -(self.sprite.get_height() // 2))
+        self.fallback_sprites = self.sprite_manager.fallback_enemy(self.car_type, self.enemy_type, self.color)
+    
+    def update(self, road_speed, player, track):
+        # Follow bends: shift sideways as much as the road's center does under the car
+        center = track.center(self.y)
+        
         # Fuel stations don't move
         if self.enemy_type == 'fuel_station':
             self.y += road_speed  # Only move with road speed, no additional movement
         else:
             # Basic downward movement for other cars
             self.y += road_speed + self.speed
+        self.x += track.center(self.y) - center
         
         # Apply specific enemy behavior (only for non-fuel-station cars)
         if self.enemy_type == 'static':
@@ -1273,10 +2145,7 @@ class EnemyCar:
                 else:
                     # Player is to the left, move right
                     self.x += self.side_speed
-                
-                # Keep within road boundaries (updated for new road)
-                self.x = max(220, min(580, self.x))
-                
+            
         elif self.enemy_type == 'zigzag':
             # Zigzag enemy - moves left and right while coming down
             self.zigzag_counter += 1
@@ -1288,82 +2157,64 @@ class EnemyCar:
             
             # Apply horizontal movement
             self.x += self.zigzag_direction * self.zigzag_speed
-            
-            # Keep within road boundaries and bounce off edges (updated for new road)
-            if self.x <= 220:
-                self.x = 220
-                self.zigzag_direction = 1
-            elif self.x >= 580:
-                self.x = 580
-                self.zigzag_direction = -1
+        
+        # Keep within the road, zigzag cars bouncing off its edges and the median
+        x = track.clamp(self.x, self.y, self.road_margin)
+        if x != self.x:
+            if self.enemy_type == 'zigzag':
+                self.zigzag_direction = 1 if x > self.x else -1
+            self.x = x
         
         # Update rect position
         self.rect.center = (self.x, self.y)
     
-    def draw(self, screen):
+    def draw(self, screen, view=UNSCALED):
         if self.sprite:
             # Use sprite if available
-            sprite_rect = self.sprite.get_rect(center=(self.x, self.y))
+            sprite_rect = self.sprite.get_rect(center=view.pt(self.x, self.y))
             screen.blit(self.sprite, sprite_rect)
         else:
             # Fallback to original drawing if no sprite
-            if self.car_type == 'fuel':
-                if self.enemy_type == 'fuel_station':
-                    # Stationary fuel station - simple design (larger)
-                    station_rect = pygame.Rect(self.x - 50, self.y - 50, 100, 100)
-                    pygame.draw.rect(screen, GREEN, station_rect)
-                    
-                    # Fuel symbol (large and clear)
-                    pygame.draw.circle(screen, BLACK, (int(self.x), int(self.y)), 25)
-                    pygame.draw.circle(screen, WHITE, (int(self.x), int(self.y)), 20)
-                    
-                    # "F" for fuel
-                    font = pygame.font.Font(None, 48)
-                    fuel_text = font.render("F", True, BLACK)
-                    text_rect = fuel_text.get_rect(center=(self.x, self.y))
-                    screen.blit(fuel_text, text_rect)
-                    
-                else:
-                    # Moving fuel truck - simplified (larger)
-                    truck_rect = pygame.Rect(self.x - 37, self.y - 37, 75, 75)
-                    pygame.draw.rect(screen, GREEN, truck_rect)
-                    
-                    # Fuel symbol
-                    pygame.draw.circle(screen, BLACK, (int(self.x), int(self.y)), 18)
-                    pygame.draw.circle(screen, WHITE, (int(self.x), int(self.y)), 15)
-                    
-            else:
-                # Regular enemy car - simplified (square)
-                car_rect = pygame.Rect(self.x - 37, self.y - 37, 75, 75)
-                pygame.draw.rect(screen, self.color, car_rect)
-                
-                # Windshield
-                pygame.draw.rect(screen, (173, 216, 230), (self.x - 25, self.y - 30, 50, 20))
-                
-                # Car type indicators (simplified)
-                if self.enemy_type == 'reactive':
-                    # Police lights
-                    pygame.draw.rect(screen, RED, (self.x - 15, self.y - 40, 10, 6))
-                    pygame.draw.rect(screen, BLUE, (self.x + 5, self.y - 40, 10, 6))
-                    
-                elif self.enemy_type == 'zigzag':
-                    # Racing stripe
-                    pygame.draw.line(screen, WHITE, (self.x, self.y - 37), (self.x, self.y + 37), 6)
-                    
-                    # Direction arrow (simplified)
-                    if self.zigzag_direction == 1:  # Moving right
-                        pygame.draw.polygon(screen, WHITE, [
-                            (self.x + 20, self.y), (self.x + 30, self.y - 6), (self.x + 30, self.y + 6)
-                        ])
-                    else:  # Moving left
-                        pygame.draw.polygon(screen, WHITE, [
-                            (self.x - 20, self.y), (self.x - 30, self.y - 6), (self.x - 30, self.y + 6)
-                        ])
-                
-                # Headlights for all cars
-                pygame.draw.circle(screen, WHITE, (int(self.x - 15), int(self.y - 33)), 4)
-                pygame.draw.circle(screen, WHITE, (int(self.x + 15), int(self.y - 33)), 4)
+            draw_enemy_shapes(screen, view, self.x, self.y, self.car_type, self.enemy_type,
+                              self.color, self.zigzag_direction)
+    
+    def queue_draw(self, queue, view=UNSCALED):
+        """Add this car's sprite to the render queue; False if it has to be drawn with shapes"""
+        if self.sprite is not None:
+            sprite = self.sprite
+            offset_x, offset_y = self.sprite_offset
+        elif self.fallback_sprites is not None:
+            sprite, (offset_x, offset_y) = self.fallback_sprites[self.zigzag_direction]
+        else:
+            return False
+        x, y = view.pt(self.x, self.y)
+        self.draw_rect.topleft = (x + offset_x, y + offset_y)
+        queue.add(sprite, self.draw_rect, LAYER_TRAFFIC)
+        return True
 
 if __name__ == "__main__":
-    game = Game()
+    import argparse
+    parser = argparse.ArgumentParser(description="Road Fighter - Pygame Edition")
+    parser.add_argument("--trace", metavar="FILE", nargs="?", const="",
+                        help="record spans from startup and export Chrome trace JSON at exit")
+    parser.add_argument("--cprofile", metavar="SECONDS", type=float,
+                        help="capture a cProfile session for the first SECONDS of play")
+    parser.add_argument("--profile-seconds", type=float, default=10,
+                        help="length of F10 cProfile captures (default 10)")
+    parser.add_argument("--render-scale", type=float, choices=RENDER_SCALES, default=1.0,
+                        help="internal render resolution as a fraction of 1400x900 (default 1.0)")
+    parser.add_argument("--quality", choices=['auto'] + TIER_NAMES, default='auto',
+                        help="fixed quality tier, or 'auto' to adapt to frame time (default)")
+    parser.add_argument("--pipelined", action="store_true",
+                        help="run the simulation on its own thread and draw interpolated snapshots")
+    args = parser.parse_args()
+    
+    game_log.registry.install_crash_handler()  # Dump recent log records if the game crashes
+    if args.trace is not None:
+        tracer.enable()
+    game = Game(render_scale=args.render_scale, quality=args.quality, pipelined=args.pipelined)
+    game.trace_file = args.trace or None
+    game.profile_seconds = args.profile_seconds
+    if args.cprofile:
+        profile_session.start(args.cprofile)
     game.run()
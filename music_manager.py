@@ -0,0 +1,126 @@
+import io
+import threading
+import pygame
+from game_log import get_logger
+from profiler import tracer
+
+log = get_logger('audio')
+
+
+class MusicManager:
+    """Background music player that never touches the disk on the frame thread.
+
+    Every track is read and decoded into a pygame Sound by a worker thread as
+    soon as the manager is created. Tracks are played on two reserved mixer
+    channels so a state change is just a crossfade between them.
+    """
+
+    def __init__(self, music_files, crossfade_ms=800):
+        self.music_files = {name: path for name, path in music_files.items() if path}
+        self.crossfade_ms = crossfade_ms
+        self.current = None  # Name of the track currently playing
+        self.pending = None  # (name, volume) waiting for its decode to finish
+
+        # Decoded tracks (name -> Sound) and raw bytes for streaming fallback
+        self._decoded = {}
+        self._raw = {}
+        self._failed = set()
+        self._lock = threading.Lock()
+        self._streaming = False
+
+        # Reserve the first two channels so sound effects never steal them
+        if pygame.mixer.get_num_channels() < 8:
+            pygame.mixer.set_num_channels(8)
+        pygame.mixer.set_reserved(2)
+        self._channels = [pygame.mixer.Channel(0), pygame.mixer.Channel(1)]
+        self._active = 0  # Index of the channel holding the current track
+
+        self._worker = threading.Thread(target=self._preload_all, name="music-preload", daemon=True)
+        self._worker.start()
+
+    def _preload_all(self):
+        """Read and decode every track (runs on the worker thread)"""
+        for name, path in self.music_files.items():
+            try:
+                with tracer.span('music.read', name), open(path, 'rb') as f:
+                    data = f.read()
+            except Exception as e:
+                log.warning("Could not read music file %s: %s", path, e)
+                with self._lock:
+                    self._failed.add(name)
+                continue
+
+            try:
+                with tracer.span('music.decode', name):
+                    sound = pygame.mixer.Sound(file=io.BytesIO(data))
+                with self._lock:
+                    self._decoded[name] = sound
+                log.info("Pre-decoded music track: %s", path)
+            except Exception as e:
+                # Keep the bytes so the track can still be streamed from memory
+                log.warning("Could not decode %s, will stream it from memory: %s", path, e)
+                with self._lock:
+                    self._raw[name] = data
+
+    def is_ready(self, name):
+        """Check if a track has finished preloading"""
+        with self._lock:
+            return name in self._decoded or name in self._raw or name in self._failed
+
+    def wait_until_loaded(self, timeout=None):
+        """Block until the preload worker is done (for tools, not the game loop)"""
+        self._worker.join(timeout)
+
+    def play(self, name, volume=1.0):
+        """Crossfade to a looping track, deferring it if it is still being decoded"""
+        if name == self.current and self.pending is None:
+            return
+        if not self.is_ready(name):
+            self.pending = (name, volume)
+            return
+        self.pending = None
+        self._start(name, volume)
+
+    def stop(self):
+        """Fade out whatever is playing"""
+        self.pending = None
+        self.current = None
+        self._channels[self._active].fadeout(self.crossfade_ms)
+        if self._streaming:
+            pygame.mixer.music.fadeout(self.crossfade_ms)
+            self._streaming = False
+
+    def update(self):
+        """Start a deferred track once its decode has finished (call once per frame)"""
+        if self.pending and self.is_ready(self.pending[0]):
+            name, volume = self.pending
+            self.pending = None
+            self._start(name, volume)
+
+    def _start(self, name, volume):
+        with self._lock:
+            sound = self._decoded.get(name)
+            data = self._raw.get(name)
+
+        if sound is None and data is None:
+            log.warning("Music track not available: %s", name)
+            return
+
+        # Fade out the old track on its own channel while the new one fades in
+        self._channels[self._active].fadeout(self.crossfade_ms)
+        if self._streaming:
+            pygame.mixer.music.fadeout(self.crossfade_ms)
+            self._streaming = False
+
+        if sound is not None:
+            self._active = 1 - self._active
+            sound.set_volume(volume)
+            self._channels[self._active].play(sound, loops=-1, fade_ms=self.crossfade_ms)
+        else:
+            # Streaming fallback: bytes are already in memory, no file I/O here
+            pygame.mixer.music.load(io.BytesIO(data))
+            pygame.mixer.music.set_volume(volume)
+            pygame.mixer.music.play(-1, fade_ms=self.crossfade_ms)
+            self._streaming = True
+
+        self.current = name
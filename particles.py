@@ -0,0 +1,297 @@
+"""
+Particle effects for Road Fighter: crash debris and smoke, fuel pickup
+sparkles and exhaust.
+
+Particles live in preallocated NumPy columns (position, velocity, age,
+lifetime, drag and sprite) rather than in one Python object each. Live
+particles are always the first `count` rows, so integrating them is a
+handful of in-place array operations and culling copies the survivors
+down over the dead ones. MAX_PARTICLES is a hard cap: emitting into a full
+system drops the new particles.
+
+Sprites are baked once per render scale, FRAMES per kind and colour,
+fading and growing or shrinking over a particle's life. Only smoke and
+exhaust are translucent: blending costs several times a plain colour-keyed
+blit, so debris and sparkles fade by darkening instead. Drawing picks every live
+particle's sprite from its age and submits the whole set in one
+Surface.blits call.
+
+Particles lie on the ground, so they scroll with the road as well as
+moving under their own velocity.
+"""
+
+import math
+
+import pygame
+
+from game_log import get_logger
+from render_queue import FAST_BLITS
+from render_scale import View
+
+try:
+    import numpy as np
+except ImportError:  # No particle effects without numpy; the game plays the same
+    np = None
+
+log = get_logger('display')
+
+PARTICLE_SEED = 1984
+MAX_PARTICLES = 4096
+FRAMES = 8  # Sprites per kind over a particle's life
+CULL_MARGIN = 32  # Particles this far outside the game area are dropped
+CLEAR_COLOR = (255, 0, 255)  # Colour key of particle sprites
+
+DEBRIS = 0
+SMOKE = 1
+SPARKLE = 2
+EXHAUST = 3
+
+# life and speed are (low, high) ranges; a particle's direction is random unless
+# the emitter gives a heading, then within `angle` radians of it
+PARTICLE_KINDS = [
+    {'name': 'debris', 'life': (30, 60), 'speed': (2.0, 7.0), 'drag': 0.88, 'size': 8,
+     'colors': ((200, 200, 210), (240, 150, 40), (90, 90, 100))},
+    {'name': 'smoke', 'life': (40, 80), 'speed': (0.3, 1.5), 'drag': 0.96, 'size': 28,
+     'colors': ((110, 110, 110),)},
+    {'name': 'sparkle', 'life': (20, 40), 'speed': (1.0, 4.0), 'drag': 0.90, 'size': 12,
+     'colors': ((255, 240, 120), (255, 255, 255))},
+    {'name': 'exhaust', 'life': (16, 28), 'speed': (0.5, 1.5), 'drag': 0.92, 'size': 12,
+     'colors': ((150, 150, 160),)},
+]
+
+EXHAUST_HEADING = math.pi / 2  # Straight down the screen, behind the car
+EXHAUST_ANGLE = 0.35
+
+# Burst sizes per collision severity (1-3)
+CRASH_DEBRIS = (12, 24, 40)
+CRASH_SMOKE = (4, 10, 20)
+PICKUP_SPARKLES = 24
+
+
+def sprite_bases():
+    """Index of each kind's first sprite: FRAMES sprites per colour, kinds in order"""
+    bases = []
+    index = 0
+    for kind in PARTICLE_KINDS:
+        bases.append(index)
+        index += len(kind['colors']) * FRAMES
+    return bases
+
+
+SPRITE_BASES = sprite_bases()
+
+
+def darken(color, t):
+    return tuple(int(c * (1.0 - 0.6 * t)) for c in color)
+
+
+def paint_debris(surface, view, t, color, size):
+    side = size * (1.0 - 0.5 * t)
+    offset = (size - side) / 2
+    pygame.draw.rect(surface, darken(color, t), view.rect(offset, offset, side, side))
+
+
+def paint_smoke(surface, view, t, color, size):
+    radius = size / 2 * (0.35 + 0.65 * t)
+    pygame.draw.circle(surface, color, view.pt(size / 2, size / 2), view.px(radius))
+    return int(150 * (1.0 - t))
+
+
+def paint_sparkle(surface, view, t, color, size):
+    arm = size / 2 * (1.0 - 0.6 * t)
+    center = size / 2
+    width = view.px(2)
+    color = darken(color, t)
+    pygame.draw.line(surface, color, view.pt(center - arm, center), view.pt(center + arm, center), width)
+    pygame.draw.line(surface, color, view.pt(center, center - arm), view.pt(center, center + arm), width)
+
+
+def paint_exhaust(surface, view, t, color, size):
+    radius = size / 2 * (0.3 + 0.7 * t)
+    pygame.draw.circle(surface, color, view.pt(size / 2, size / 2), view.px(radius))
+    return int(120 * (1.0 - t))
+
+
+PAINTERS = [paint_debris, paint_smoke, paint_sparkle, paint_exhaust]
+
+
+def bake_sprites(view):
+    """Sprites for every kind, colour and age frame (see SPRITE_BASES), with their half sizes in pixels"""
+    sprites = []
+    for kind, painter in zip(PARTICLE_KINDS, PAINTERS):
+        size = kind['size']
+        for color in kind['colors']:
+            for frame in range(FRAMES):
+                sprite = pygame.Surface(view.size(size, size))
+                sprite.fill(CLEAR_COLOR)
+                alpha = painter(sprite, view, frame / (FRAMES - 1), color, size)
+                sprite.set_colorkey(CLEAR_COLOR, pygame.RLEACCEL)
+                if alpha is not None:
+                    sprite.set_alpha(alpha)
+                sprites.append(sprite)
+    half = np.array([sprite.get_width() // 2 for sprite in sprites], dtype=np.int64)
+    return sprites, half
+
+
+class ParticleSystem:
+    COLUMNS = ('x', 'y', 'vx', 'vy', 'age', 'life', 'drag', 'sprite')
+
+    def __init__(self, capacity=MAX_PARTICLES, seed=PARTICLE_SEED):
+        self.enabled = np is not None
+        self.capacity = capacity if self.enabled else 0
+        self.count = 0
+        self.density = 1.0  # Share of requested particles emitted (quality tiers lower it)
+        self.view = None
+        self.sprites = None
+        self.half = None  # Half sprite width in pixels, per sprite
+        if not self.enabled:
+            log.info("Particle effects disabled - numpy not available")
+            return
+        self.rng = np.random.default_rng(seed)
+        self.carry = [0.0] * len(PARTICLE_KINDS)  # Fractional particles owed by stream()
+        self.x = np.zeros(capacity)
+        self.y = np.zeros(capacity)
+        self.vx = np.zeros(capacity)
+        self.vy = np.zeros(capacity)
+        self.age = np.zeros(capacity, dtype=np.int32)
+        self.life = np.ones(capacity, dtype=np.int32)
+        self.drag = np.ones(capacity)
+        self.sprite = np.zeros(capacity, dtype=np.int64)  # First sprite of the particle's colour
+        self.frame = np.zeros(capacity, dtype=np.int64)  # Scratch for draw()
+        self.alive = np.zeros(capacity, dtype=bool)  # Scratch for update()
+
+    def __len__(self):
+        return self.count
+
+    def set_scale(self, scale):
+        """Bake the sprites for a render scale"""
+        if not self.enabled or (self.view is not None and self.view.scale == scale):
+            return
+        self.view = View(scale)
+        self.sprites, self.half = bake_sprites(self.view)
+
+    def clear(self):
+        self.count = 0
+        if self.enabled:
+            self.carry = [0.0] * len(PARTICLE_KINDS)
+
+    def emit(self, kind, x, y, count, spread=0.0, heading=None, angle=math.pi):
+        """Start `count` particles of a kind around (x, y), `spread` logical pixels either way"""
+        if self.enabled:
+            self.spawn(kind, x, y, int(count * self.density), spread, heading, angle)
+
+    def spawn(self, kind, x, y, count, spread, heading, angle):
+        count = min(count, self.capacity - self.count)
+        if count <= 0:
+            return
+        rng = self.rng
+        params = PARTICLE_KINDS[kind]
+        start = self.count
+        end = start + count
+        self.count = end
+        if heading is None:
+            directions = rng.uniform(-math.pi, math.pi, count)
+        else:
+            directions = rng.uniform(heading - angle, heading + angle, count)
+        speeds = rng.uniform(*params['speed'], count)
+        self.x[start:end] = rng.uniform(x - spread, x + spread, count)
+        self.y[start:end] = rng.uniform(y - spread, y + spread, count)
+        self.vx[start:end] = np.cos(directions) * speeds
+        self.vy[start:end] = np.sin(directions) * speeds
+        self.age[start:end] = 0
+        self.life[start:end] = rng.integers(params['life'][0], params['life'][1], count, endpoint=True)
+        self.drag[start:end] = params['drag']
+        colors = rng.integers(0, len(params['colors']), count)
+        self.sprite[start:end] = SPRITE_BASES[kind] + colors * FRAMES
+
+    def stream(self, kind, x, y, rate, spread=0.0, heading=None, angle=math.pi):
+        """Emit `rate` particles per call on average, carrying fractions over to later calls"""
+        if not self.enabled:
+            return
+        owed = self.carry[kind] + rate * self.density
+        whole = int(owed)
+        self.carry[kind] = owed - whole
+        if whole:
+            self.spawn(kind, x, y, whole, spread, heading, angle)
+
+    def crash(self, x, y, severity):
+        self.emit(DEBRIS, x, y, CRASH_DEBRIS[severity - 1], 12)
+        self.emit(SMOKE, x, y, CRASH_SMOKE[severity - 1], 16)
+
+    def pickup(self, x, y):
+        self.emit(SPARKLE, x, y, PICKUP_SPARKLES, 20)
+
+    def update(self, scroll, width, height):
+        """Move every particle one frame, the road having scrolled `scroll`, and drop the dead"""
+        n = self.count
+        if not n:
+            return
+        x, y, vx, vy = self.x[:n], self.y[:n], self.vx[:n], self.vy[:n]
+        drag = self.drag[:n]
+        x += vx
+        y += vy
+        y += scroll
+        vx *= drag
+        vy *= drag
+        age = self.age[:n]
+        age += 1
+
+        # Culling: survivors are copied down over the dead, keeping their order
+        alive = self.alive[:n]
+        np.less(age, self.life[:n], out=alive)
+        alive &= y < height + CULL_MARGIN
+        alive &= x > -CULL_MARGIN
+        alive &= x < width + CULL_MARGIN
+        live = int(np.count_nonzero(alive))
+        if live == n:
+            return
+        for name in self.COLUMNS:
+            column = getattr(self, name)
+            column[:live] = column[:n][alive]
+        self.count = live
+
+    def capture(self):
+        """A copy of the live particles that later updates won't touch (for pipelined drawing)"""
+        snapshot = object.__new__(ParticleSystem)
+        snapshot.__dict__.update(self.__dict__)
+        if self.enabled:
+            n = self.count
+            for name in self.COLUMNS:
+                setattr(snapshot, name, getattr(self, name)[:n].copy())
+            snapshot.frame = np.zeros(n, dtype=np.int64)
+        return snapshot
+
+    def sprite_indices(self):
+        """Sprite index of every live particle, from its colour and how far through its life it is"""
+        n = self.count
+        frame = self.frame[:n]
+        np.multiply(self.age[:n], FRAMES, out=frame)
+        frame //= self.life[:n]
+        np.minimum(frame, FRAMES - 1, out=frame)
+        frame += self.sprite[:n]
+        return frame
+
+    def draw(self, screen, shift=0.0):
+        """Blit every live particle in one batch, `shift` logical pixels further down"""
+        n = self.count
+        if not n:
+            return
+        indices = self.sprite_indices()
+        half = self.half[indices]
+        # Centered on the particle and landing on the pixels View.pt gives: at scale 1
+        # it passes floats on for blit to truncate, below 1 it rounds half-up
+        scale = self.view.scale
+        if scale == 1:
+            left = self.x[:n].astype(np.int64)
+            top = (self.y[:n] + shift).astype(np.int64)
+        else:
+            left = np.floor(self.x[:n] * scale + 0.5).astype(np.int64)
+            top = np.floor((self.y[:n] + shift) * scale + 0.5).astype(np.int64)
+        left -= half
+        top -= half
+        sprites = self.sprites
+        items = zip(map(sprites.__getitem__, indices.tolist()), zip(left.tolist(), top.tolist()))
+        if FAST_BLITS:
+            screen.fblits(items)
+        else:
+            screen.blits(items, doreturn=False)
@@ -0,0 +1,139 @@
+import collections
+import time
+import pygame
+
+# Frame phases in the order they happen in Game.run (draw_game adds road/cars/ui)
+PHASES = ('events', 'update', 'road', 'cars', 'ui', 'draw', 'overlay', 'present', 'tasks', 'idle')
+FRAME_BUDGET_MS = 1000.0 / 60
+
+GRAPH_WIDTH = 300
+GRAPH_HEIGHT = 60
+GRAPH_MAX_MS = 33.3  # Top of the graph (two frame budgets)
+REFRESH_FRAMES = 30  # Text is re-rendered twice a second at 60 FPS
+
+PANEL_BG = (20, 20, 20)
+TEXT_COLOR = (255, 255, 255)
+GOOD_COLOR = (0, 200, 0)
+WARN_COLOR = (255, 200, 0)
+BAD_COLOR = (255, 0, 0)
+BUDGET_COLOR = (120, 120, 255)
+
+
+def _noop(*args, **kwargs):
+    pass
+
+
+class PerfOverlay:
+    """Toggleable frame-time overlay (F3).
+
+    While hidden every hook is bound to a no-op, so the instrumentation in
+    the game loop costs nothing. While visible the text lines are only
+    re-rendered every REFRESH_FRAMES frames and the graph is updated by
+    scrolling it one pixel and drawing a single new column.
+    """
+
+    def __init__(self, history=GRAPH_WIDTH):
+        self.font = pygame.font.Font(None, 20)
+        self.visible = False
+        self.frame_ms = collections.deque(maxlen=history)  # Work time per frame (excludes idle)
+        self.phase_ms = dict.fromkeys(PHASES, 0.0)  # Current frame
+        self.phase_sums = dict.fromkeys(PHASES, 0.0)  # Accumulated since last text refresh
+        self.frames_since_refresh = 0
+        self.text_surfaces = []
+        self.panel_width = GRAPH_WIDTH + 20
+        self.graph = pygame.Surface((GRAPH_WIDTH, GRAPH_HEIGHT))
+        self.budget_y = GRAPH_HEIGHT - int(GRAPH_HEIGHT * FRAME_BUDGET_MS / GRAPH_MAX_MS)
+        self._last = 0.0
+        self._bind()
+
+    def _bind(self):
+        if self.visible:
+            self.begin_frame = self._begin_frame
+            self.lap = self._lap
+            self.end_frame = self._end_frame
+            self.draw = self._draw
+        else:
+            self.begin_frame = self.lap = self.end_frame = self.draw = _noop
+
+    def toggle(self):
+        """Show or hide the overlay, resetting its history"""
+        self.visible = not self.visible
+        self.frame_ms.clear()
+        self.phase_sums = dict.fromkeys(PHASES, 0.0)
+        self.frames_since_refresh = REFRESH_FRAMES  # Render text on the first visible frame
+        self.graph.fill((0, 0, 0))
+        self._bind()
+
+    def _begin_frame(self):
+        self._last = time.perf_counter()
+        for phase in PHASES:
+            self.phase_ms[phase] = 0.0
+
+    def _lap(self, phase):
+        """Charge the time since the previous lap to `phase`"""
+        now = time.perf_counter()
+        self.phase_ms[phase] += (now - self._last) * 1000.0
+        self._last = now
+
+    def _end_frame(self):
+        work_ms = sum(self.phase_ms.values()) - self.phase_ms['idle']
+        self.frame_ms.append(work_ms)
+        for phase, ms in self.phase_ms.items():
+            self.phase_sums[phase] += ms
+        self.frames_since_refresh += 1
+        self._add_graph_column(work_ms)
+
+    def _add_graph_column(self, work_ms):
+        # Scroll left by one pixel and draw only the newest frame
+        self.graph.scroll(-1, 0)
+        x = GRAPH_WIDTH - 1
+        pygame.draw.line(self.graph, (0, 0, 0), (x, 0), (x, GRAPH_HEIGHT - 1))
+        height = min(GRAPH_HEIGHT, int(GRAPH_HEIGHT * work_ms / GRAPH_MAX_MS))
+        if work_ms < FRAME_BUDGET_MS * 0.75:
+            color = GOOD_COLOR
+        elif work_ms < FRAME_BUDGET_MS:
+            color = WARN_COLOR
+        else:
+            color = BAD_COLOR
+        if height:
+            pygame.draw.line(self.graph, color, (x, GRAPH_HEIGHT - height), (x, GRAPH_HEIGHT - 1))
+        self.graph.set_at((x, self.budget_y), BUDGET_COLOR)
+
+    def _refresh_text(self, fps, enemy_cars):
+        frames = self.frames_since_refresh or 1
+        ordered = sorted(self.frame_ms)
+
+        def percentile(p):
+            if not ordered:
+                return 0.0
+            return ordered[min(len(ordered) - 1, int(len(ordered) * p))]
+
+        cars = sum(1 for car in enemy_cars if car.car_type != 'fuel')
+        lines = [
+            f"FPS {fps:5.1f}   work {sum(ordered) / max(1, len(ordered)):5.2f} ms",
+            f"p50 {percentile(0.50):5.2f}  p95 {percentile(0.95):5.2f}  p99 {percentile(0.99):5.2f}  max {percentile(1.0):5.2f}",
+            f"entities {len(enemy_cars)}  (cars {cars}, fuel {len(enemy_cars) - cars})",
+        ]
+        phases = [f"{phase} {self.phase_sums[phase] / frames:5.2f}" for phase in PHASES]
+        for start in range(0, len(phases), 3):
+            lines.append("   ".join(phases[start:start + 3]))
+
+        self.text_surfaces = [self.font.render(line, True, TEXT_COLOR) for line in lines]
+        self.panel_width = max([GRAPH_WIDTH] + [text.get_width() for text in self.text_surfaces]) + 20
+        self.phase_sums = dict.fromkeys(PHASES, 0.0)
+        self.frames_since_refresh = 0
+
+    def _draw(self, surface, fps, enemy_cars):
+        if self.frames_since_refresh >= REFRESH_FRAMES:
+            self._refresh_text(fps, enemy_cars)
+
+        line_height = self.font.get_linesize()
+        width = self.panel_width
+        height = GRAPH_HEIGHT + 20 + line_height * len(self.text_surfaces)
+        x = surface.get_width() - width - 20
+        y = surface.get_height() - height - 20
+
+        surface.fill(PANEL_BG, (x, y, width, height))
+        for i, text in enumerate(self.text_surfaces):
+            surface.blit(text, (x + 10, y + 10 + i * line_height))
+        surface.blit(self.graph, (x + 10, y + height - GRAPH_HEIGHT - 10))
@@ -0,0 +1,80 @@
+"""
+Pipelined simulation for Road Fighter (--pipelined).
+
+A daemon thread steps the simulation at a fixed rate and, after every step,
+publishes a snapshot of the game that the step will never touch again. The
+main thread draws the newest snapshot while the next step runs; pygame
+releases the GIL inside blits, fills, transforms and the display flip, so
+on a multi-core machine drawing and simulating overlap instead of taking
+turns.
+
+Snapshots are double buffered: `front` is the last published one and the
+thread builds its replacement from the live game, then swaps the reference.
+The renderer draws one step behind the simulation, moving cars between
+their previous and current positions by how far it is into the next step,
+so motion stays smooth when the render and simulation rates drift apart.
+
+Anything else that changes the game (input events, quality changes) must
+hold `lock` and call publish() so the next frame shows it.
+"""
+
+import threading
+import time
+
+MAX_LAG_STEPS = 5  # Further behind than this, skip ahead instead of catching up
+
+
+class SimulationPipeline:
+    def __init__(self, step, capture, rate):
+        self.step = step  # Advance the game by one simulation step
+        self.capture = capture  # capture(previous snapshot) -> new snapshot
+        self.interval = 1.0 / rate
+        self.lock = threading.Lock()
+        self.front = None
+        self.error = None
+        self.running = False
+        self.thread = None
+
+    def start(self):
+        self.publish()
+        self.running = True
+        self.thread = threading.Thread(target=self._run, name="simulation", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.running = False
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+
+    def publish(self):
+        """Snapshot the game as it is now (call with `lock` held, or before start)"""
+        self.front = self.capture(self.front)
+
+    def _run(self):
+        perf_counter = time.perf_counter
+        interval = self.interval
+        next_step = perf_counter()
+        try:
+            while self.running:
+                with self.lock:
+                    self.step()
+                    self.publish()
+                next_step += interval
+                delay = next_step - perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                elif delay < -interval * MAX_LAG_STEPS:
+                    next_step = perf_counter()
+        except BaseException as e:
+            self.error = e  # Re-raised on the main thread by frame()
+            self.running = False
+
+    def frame(self):
+        """Return the newest snapshot, interpolated for the current time"""
+        if self.error is not None:
+            raise self.error
+        snapshot = self.front
+        alpha = (time.perf_counter() - snapshot.time) / self.interval
+        snapshot.interpolate(min(1.0, alpha))
+        return snapshot
@@ -0,0 +1,160 @@
+"""
+Look-ahead planning bot for Road Fighter.
+
+Where the autopilot scores lanes from where the traffic is now, the planner
+tries inputs out: it captures the game into a SimState and plays candidate
+input sequences HORIZON steps ahead with the same update logic the game
+runs, then drives the first part of the safest one.
+
+A candidate holds one of ACTIONS for the first SPLIT steps, then holds or
+steers (one of the first SECOND_ACTIONS) for the rest. Candidates sharing
+a first action share the simulation of those steps: the state after them
+is cloned once per second action, so a plan is len(ACTIONS) short
+rollouts plus len(ACTIONS) * SECOND_ACTIONS longer ones, and a clone
+costs microseconds. Last plan's choice is tried first and planning
+stops when `budget` seconds are spent, so a crowded road gets a shorter,
+still useful search instead of a missed frame.
+
+A rollout scores what happened in it: a hit ends it with a penalty that is
+larger the sooner it comes, pickups earn a bonus (a large one when fuel is
+low), and sitting low on the screen, with more time to see traffic coming,
+earns a little. Fuel stations usually appear further up the road than a
+rollout reaches, so ending a rollout lined up with one ahead counts too. Traffic that would spawn during the look-ahead isn't known
+and isn't simulated.
+"""
+
+import random
+import time
+
+from sim_state import InputKeys, SimState
+from track import TrackView
+
+HORIZON = 60  # Simulated steps per candidate (1 s at 60 FPS)
+SPLIT = 12  # Steps the first action of a candidate is held
+PLAN_INTERVAL = 4  # Steps between plans; the chosen first action is held meanwhile
+PLAN_BUDGET = 0.008  # Seconds of planning per plan, half a 60 FPS frame
+PLANNER_SEED = 1984  # Collision effects and spin-out jitter inside the look-ahead
+
+HIT_PENALTY = 100.0  # ...doubled for a hit right away, falling to this at the horizon
+EMPTY_PENALTY = 200.0  # Running out of fuel
+FUEL_BONUS = 5.0
+LOW_FUEL_BONUS = 40.0
+LOW_FUEL = 50
+DEPTH_BONUS = 0.01  # Per pixel of the player's y at the end of a rollout
+AIM_COST = 0.02  # Per pixel sideways from the nearest fuel station ahead...
+LOW_FUEL_AIM_COST = 0.1  # ...or this much when fuel is low
+
+ACTIONS = [
+    InputKeys(),
+    InputKeys(left=True),
+    InputKeys(right=True),
+    InputKeys(up=True),
+    InputKeys(down=True),
+]
+SECOND_ACTIONS = 3  # Holding, left and right
+
+
+class Planner:
+    def __init__(self, horizon=HORIZON, split=SPLIT, budget=PLAN_BUDGET, seed=PLANNER_SEED):
+        self.horizon = horizon
+        self.split = split
+        self.budget = budget
+        self.rng = random.Random(seed)
+        self.view = None
+        self.track = None
+        self.best = (0, 0)  # Indices into ACTIONS of the last choice
+        self.rollouts = 0  # Rollouts completed by the last plan
+
+    def score(self, state, fuel):
+        """Value of a finished rollout"""
+        value = state.player.y * DEPTH_BONUS
+        low = fuel < LOW_FUEL
+        value += state.pickups * (LOW_FUEL_BONUS if low else FUEL_BONUS)
+        player = state.player
+        aim = min((abs(car.x - player.x) for car in state.cars if car.car_type == 'fuel' and car.y < player.y),
+                  default=0.0)
+        value -= aim * (LOW_FUEL_AIM_COST if low else AIM_COST)
+        if state.crashes:
+            value -= HIT_PENALTY * (2.0 - state.steps / self.horizon)
+        elif state.over:
+            value -= EMPTY_PENALTY
+        return value
+
+    def run(self, state, keys, steps, view, deadline):
+        """Step `state` with `keys` held until `steps` have been simulated, a hit or an empty tank;
+        False if the deadline came first"""
+        clock = time.perf_counter
+        while state.steps < steps and not state.crashes and not state.over:
+            if clock() > deadline:
+                return False
+            state.step(keys, view)
+        return True
+
+    def plan(self, game):
+        """(first, second) indices into ACTIONS of the best candidate found within the budget
+
+        Rollouts cut short by the deadline aren't scored; with none finished the last choice stands.
+        """
+        deadline = time.perf_counter() + self.budget
+        if self.track is not game.track:
+            self.track = game.track
+            self.view = TrackView(game.track)
+        view = self.view
+        start = SimState.capture(game, self.rng)
+        fuel = game.fuel
+
+        first_best, second_best = self.best
+        firsts = [first_best] + [i for i in range(len(ACTIONS)) if i != first_best]
+        seconds = [second_best] + [i for i in range(SECOND_ACTIONS) if i != second_best]
+        best = None
+        best_value = 0.0
+        rollouts = 0
+        finished = True
+        for first in firsts:
+            prefix = start.clone()
+            finished = self.run(prefix, ACTIONS[first], self.split, view, deadline)
+            for second in seconds:
+                if not finished:
+                    break
+                if prefix.crashes or prefix.over:
+                    state = prefix  # Over already; the second action makes no difference
+                else:
+                    state = prefix.clone()
+                    finished = self.run(state, ACTIONS[second], self.horizon, view, deadline)
+                    if not finished:
+                        break
+                rollouts += 1
+                value = self.score(state, fuel)
+                if best is None or value > best_value:
+                    best, best_value = (first, second), value
+                if state is prefix:
+                    break
+            if not finished:
+                break
+        self.rollouts = rollouts
+        if best is not None:
+            self.best = best
+        return self.best
+
+
+class PlannerBot:
+    """Drives with a Planner, read like the keyboard state (see Autopilot)"""
+
+    def __init__(self, planner=None):
+        self.planner = planner if planner is not None else Planner()
+        self.keys = ACTIONS[0]
+        self.steps = 0
+
+    def reset(self):
+        self.keys = ACTIONS[0]
+        self.steps = 0
+        self.planner.best = (0, 0)
+
+    def __getitem__(self, key):
+        return self.keys[key]
+
+    def drive(self, game):
+        """Choose this step's keys"""
+        if self.steps % PLAN_INTERVAL == 0:
+            self.keys = ACTIONS[self.planner.plan(game)[0]]
+        self.steps += 1
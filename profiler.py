@@ -0,0 +1,189 @@
+"""
+Built-in instrumentation for diagnosing stutters on a cabinet.
+
+Tracer records spans (main loop phases, asset/music/score I/O) into a
+fixed-size ring buffer and exports them as Chrome trace-event JSON, which
+opens in chrome://tracing or https://ui.perfetto.dev as a flame chart.
+While tracing is off, begin()/end() are bound to no-ops.
+
+ProfileSession captures a cProfile run of N seconds and saves it as a
+.prof file (view with `python -m pstats` or snakeviz).
+
+Both are shared module-level objects so any module can record spans:
+    from profiler import tracer
+    start = tracer.begin()
+    ...
+    tracer.end('update', start)
+
+    with tracer.span('save_scores'):   # convenience for cold paths
+        ...
+"""
+
+import array
+import contextlib
+import cProfile
+import io
+import json
+import pstats
+import threading
+import time
+
+from game_log import get_logger
+
+log = get_logger('perf')
+
+TRACE_CAPACITY = 65536  # About 90 seconds of frames at ~12 spans per frame
+
+_null_span = contextlib.nullcontext()
+
+
+def _begin_disabled():
+    return 0.0
+
+
+def _end_disabled(name, start, arg=None):
+    pass
+
+
+def _span_disabled(name, arg=None):
+    return _null_span
+
+
+def timestamped_filename(prefix, extension):
+    return time.strftime(f"{prefix}_%Y%m%d_%H%M%S.{extension}")
+
+
+class Tracer:
+    def __init__(self, capacity=TRACE_CAPACITY):
+        self.capacity = capacity
+        # Preallocated ring buffer, one column per field
+        self.names = [None] * capacity
+        self.args = [None] * capacity
+        self.starts = array.array('d', bytes(8 * capacity))
+        self.durations = array.array('d', bytes(8 * capacity))
+        self.threads = array.array('Q', bytes(8 * capacity))
+        self.count = 0  # Total spans recorded since enable(); index is count % capacity
+        self.thread_names = {}
+        self.origin = time.perf_counter()
+        self.enabled = False
+        self._lock = threading.Lock()
+        self._bind()
+
+    def _bind(self):
+        if self.enabled:
+            self.begin = time.perf_counter
+            self.end = self._end
+            self.span = self._span
+        else:
+            self.begin = _begin_disabled
+            self.end = _end_disabled
+            self.span = _span_disabled
+
+    def enable(self):
+        """Start recording into an empty buffer"""
+        self.count = 0
+        self.thread_names = {}
+        self.origin = time.perf_counter()
+        self.enabled = True
+        self._bind()
+        log.info("Trace recording started (%d span buffer)", self.capacity)
+
+    def disable(self):
+        self.enabled = False
+        self._bind()
+
+    def _end(self, name, start, arg=None):
+        """Record a span that started at `start` (a value returned by begin())"""
+        end = time.perf_counter()
+        tid = threading.get_ident()
+        if tid not in self.thread_names:
+            self.thread_names[tid] = threading.current_thread().name
+        with self._lock:
+            i = self.count % self.capacity
+            self.count += 1
+        self.names[i] = name
+        self.args[i] = arg
+        self.starts[i] = start
+        self.durations[i] = end - start
+        self.threads[i] = tid
+
+    @contextlib.contextmanager
+    def _span(self, name, arg=None):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._end(name, start, arg)
+
+    def to_chrome_trace(self):
+        """Build a Chrome trace-event dict from the spans still in the buffer"""
+        recorded = min(self.count, self.capacity)
+        first = self.count - recorded
+        events = []
+        for n in range(first, self.count):
+            i = n % self.capacity
+            event = {
+                'name': self.names[i],
+                'ph': 'X',
+                'ts': (self.starts[i] - self.origin) * 1e6,
+                'dur': self.durations[i] * 1e6,
+                'pid': 1,
+                'tid': self.threads[i],
+            }
+            if self.args[i] is not None:
+                event['args'] = {'detail': str(self.args[i])}
+            events.append(event)
+        for tid, thread_name in self.thread_names.items():
+            events.append({'name': 'thread_name', 'ph': 'M', 'pid': 1, 'tid': tid,
+                           'args': {'name': thread_name}})
+        return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+    def export(self, path=None):
+        """Write the buffer as Chrome trace JSON and return the file name"""
+        path = path or timestamped_filename("trace", "json")
+        with open(path, 'w') as f:
+            json.dump(self.to_chrome_trace(), f)
+        log.info("Wrote %d trace spans to %s", min(self.count, self.capacity), path)
+        return path
+
+
+class ProfileSession:
+    """cProfile capture that stops itself after a number of seconds"""
+
+    def __init__(self):
+        self.profile = None
+        self.stop_at = 0.0
+        self.path = None
+
+    @property
+    def active(self):
+        return self.profile is not None
+
+    def start(self, seconds, path=None):
+        if self.active:
+            return
+        self.path = path or timestamped_filename("profile", "prof")
+        self.stop_at = time.perf_counter() + seconds
+        self.profile = cProfile.Profile()
+        self.profile.enable()
+        log.info("cProfile capture started for %g seconds", seconds)
+
+    def poll(self):
+        """Finish the capture once its time is up (call once per frame)"""
+        if self.profile is not None and time.perf_counter() >= self.stop_at:
+            self.stop()
+
+    def stop(self):
+        if self.profile is None:
+            return
+        self.profile.disable()
+        self.profile.dump_stats(self.path)
+
+        summary = io.StringIO()
+        pstats.Stats(self.profile, stream=summary).sort_stats('cumulative').print_stats(15)
+        log.info("cProfile capture saved to %s\n%s", self.path, summary.getvalue())
+        self.profile = None
+
+
+tracer = Tracer()
+profile_session = ProfileSession()
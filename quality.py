@@ -0,0 +1,108 @@
+"""
+Adaptive quality tiers for Road Fighter.
+
+The QualityController watches how long each frame's work takes (everything
+except the clock.tick wait) against the 60 FPS budget. When the rolling
+mean stays above the budget it steps down a tier, and when there is plenty
+of headroom for several windows in a row it steps back up. The thresholds
+for stepping down and stepping up are far apart, and a tier that had to be
+left soon after stepping up is retried less eagerly. Together these keep
+the controller from flapping between two tiers.
+
+Tiers are ordered from best looking to cheapest:
+    road_detail       ROAD_FULL, ROAD_NO_POSTS or ROAD_MINIMAL
+    effect_interval   frames between spin-out pose updates
+    render_scale      internal render resolution (capped by --render-scale)
+    hud_interval      frames between re-renders of changing HUD values
+    scenery_layers    parallax scenery layers drawn (grass, trees, buildings)
+    particle_density  share of requested particles emitted
+"""
+
+import collections
+
+from game_log import get_logger
+
+log = get_logger('display')
+
+FRAME_BUDGET_MS = 1000.0 / 60
+
+ROAD_MINIMAL = 0  # Road, guardrails and every other lane divider
+ROAD_NO_POSTS = 1  # No guardrail posts
+ROAD_FULL = 2
+
+QUALITY_TIERS = [
+    {'name': 'high', 'road_detail': ROAD_FULL, 'effect_interval': 1, 'render_scale': 1.0, 'hud_interval': 1,
+     'scenery_layers': 3, 'particle_density': 1.0},
+    {'name': 'medium', 'road_detail': ROAD_FULL, 'effect_interval': 2, 'render_scale': 1.0, 'hud_interval': 4,
+     'scenery_layers': 3, 'particle_density': 1.0},
+    {'name': 'low', 'road_detail': ROAD_NO_POSTS, 'effect_interval': 3, 'render_scale': 0.75, 'hud_interval': 8,
+     'scenery_layers': 2, 'particle_density': 0.5},
+    {'name': 'lowest', 'road_detail': ROAD_MINIMAL, 'effect_interval': 4, 'render_scale': 0.5, 'hud_interval': 12,
+     'scenery_layers': 1, 'particle_density': 0.25},
+]
+TIER_NAMES = [tier['name'] for tier in QUALITY_TIERS]
+
+WINDOW_FRAMES = 90  # Frames averaged per decision (1.5 seconds at 60 FPS)
+DOWN_RATIO = 0.90  # Step down when the mean uses more than this share of the budget
+UP_RATIO = 0.55  # Step up only below this share...
+UP_WINDOWS = 4  # ...for this many windows in a row
+MAX_UP_WINDOWS = 32  # Longest wait after repeatedly failing the tier above
+
+
+class QualityController:
+    def __init__(self, apply, tier=0, adaptive=True, budget_ms=FRAME_BUDGET_MS):
+        self.apply = apply  # Called with the tier dict whenever the tier changes
+        self.tier = tier
+        self.adaptive = adaptive
+        self.budget_ms = budget_ms
+        self.window = collections.deque(maxlen=WINDOW_FRAMES)
+        self.good_windows = 0
+        self.up_windows = UP_WINDOWS
+        self.windows_since_up = None  # Windows since the last step up, None if stepping down since
+        if not adaptive:
+            self.record = self._ignore
+        log.info("Quality tier %s (%s)", TIER_NAMES[tier], "adaptive" if adaptive else "fixed")
+
+    @property
+    def current(self):
+        return QUALITY_TIERS[self.tier]
+
+    def _ignore(self, work_ms):
+        pass
+
+    def record(self, work_ms):
+        """Add one frame's work time and change tier at the end of each window"""
+        window = self.window
+        window.append(work_ms)
+        if len(window) < WINDOW_FRAMES:
+            return
+        mean_ms = sum(window) / WINDOW_FRAMES
+        window.clear()
+        if self.windows_since_up is not None:
+            self.windows_since_up += 1
+
+        if mean_ms > self.budget_ms * DOWN_RATIO and self.tier < len(QUALITY_TIERS) - 1:
+            if self.windows_since_up is not None and self.windows_since_up <= UP_WINDOWS:
+                # The tier above could not hold the budget; wait longer before retrying it
+                self.up_windows = min(MAX_UP_WINDOWS, self.up_windows * 2)
+            self.windows_since_up = None
+            self.set_tier(self.tier + 1, mean_ms)
+        elif mean_ms < self.budget_ms * UP_RATIO and self.tier > 0:
+            self.good_windows += 1
+            if self.good_windows >= self.up_windows:
+                self.windows_since_up = 0
+                self.set_tier(self.tier - 1, mean_ms)
+        else:
+            self.good_windows = 0
+
+    def set_tier(self, tier, mean_ms=None):
+        previous = self.tier
+        self.tier = tier
+        self.good_windows = 0
+        self.window.clear()
+        if mean_ms is None:
+            log.info("Quality tier %s", TIER_NAMES[tier])
+        else:
+            log.info("Quality tier %s -> %s (mean frame work %.2f ms of %.2f ms budget)",
+                     TIER_NAMES[previous], TIER_NAMES[tier], mean_ms, self.budget_ms)
+        self.apply(QUALITY_TIERS[tier])
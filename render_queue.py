@@ -0,0 +1,50 @@
+"""
+Per-frame sprite batching.
+
+Draw code adds (surface, destination) pairs with a layer number instead of
+blitting them one by one; flush() submits everything with a single
+Surface.fblits (pygame-ce) or Surface.blits call, so the per-sprite cost is
+paid in C instead of in a Python method call per car.
+"""
+
+import pygame
+
+# Lower layers are drawn first
+LAYER_PLAYER = 10
+LAYER_TRAFFIC = 20
+
+FAST_BLITS = hasattr(pygame.Surface, 'fblits')
+
+
+class RenderQueue:
+    def __init__(self):
+        self.items = []  # (surface, dest) pairs in submission order
+        self.layers = []
+        self.needs_sort = False
+
+    def __len__(self):
+        return len(self.items)
+
+    def add(self, surface, dest, layer=0):
+        if self.layers and layer < self.layers[-1]:
+            self.needs_sort = True
+        self.items.append((surface, dest))
+        self.layers.append(layer)
+
+    def flush(self, target):
+        """Blit everything queued onto `target` in layer order and empty the queue"""
+        items = self.items
+        if not items:
+            return
+        if self.needs_sort:
+            # Stable, so sprites within a layer keep the order they were added in
+            layers = self.layers
+            order = sorted(range(len(items)), key=layers.__getitem__)
+            items = [items[i] for i in order]
+        if FAST_BLITS:
+            target.fblits(items)
+        else:
+            target.blits(items, doreturn=False)
+        self.items.clear()
+        self.layers.clear()
+        self.needs_sort = False
@@ -0,0 +1,73 @@
+"""
+Internal render scale.
+
+Gameplay and layout code works in the 1400x900 logical space. A View maps
+logical coordinates and sizes onto the internal render surface, which is
+smaller than the game area at scales below 1; Game.present() upscales it
+once per frame. At scale 1 every method is bound to a pass-through so the
+full-resolution path costs nothing extra.
+"""
+
+import math
+
+import pygame
+
+RENDER_SCALES = (0.5, 0.75, 1.0)
+
+
+def _point(x, y):
+    return (x, y)
+
+
+def _length(n):
+    return n
+
+
+def _rect(x, y, width, height):
+    return pygame.Rect(x, y, width, height)
+
+
+def _round(value):
+    # Half-up rather than Python's half-to-even, so a shape drawn at another
+    # position lands on the same pixels relative to its center
+    return math.floor(value + 0.5)
+
+
+class View:
+    def __init__(self, scale=1.0):
+        self.scale = scale
+        if scale == 1:
+            self.pt = _point
+            self.px = _length
+            self.rect = _rect
+        else:
+            self.pt = self._scaled_point
+            self.px = self._scaled_length
+            self.rect = self._scaled_rect
+
+    def _scaled_point(self, x, y):
+        scale = self.scale
+        return (_round(x * scale), _round(y * scale))
+
+    def _scaled_length(self, n):
+        """Line widths and radii, never thinner than one pixel"""
+        return max(1, _round(n * self.scale))
+
+    def _scaled_rect(self, x, y, width, height):
+        # Scale the edges rather than the size so neighbouring shapes still meet
+        scale = self.scale
+        left, top = _round(x * scale), _round(y * scale)
+        return pygame.Rect(left, top, _round((x + width) * scale) - left, _round((y + height) * scale) - top)
+
+    def size(self, width, height):
+        """Pixel size of a logical width and height"""
+        return (max(1, round(width * self.scale)), max(1, round(height * self.scale)))
+
+    def scale_rect(self, rect):
+        return self.rect(*rect)
+
+    def font_size(self, size):
+        return max(1, round(size * self.scale))
+
+
+UNSCALED = View(1.0)
@@ -0,0 +1,244 @@
+"""
+Offline rendering of Road Fighter sessions to disk.
+
+Plays a session headlessly - a replay file (see replay.py) or a seeded run
+driven by one of the bots - draws every simulation step through the game's
+normal draw paths and writes the frames out as a PNG sequence or a raw
+YUV4MPEG2 (.y4m) video, which ffmpeg and most players read directly.
+
+    python render_session.py --replay high_scores_replays/run-1234.replay --out clip.y4m
+    python render_session.py --seed 3 --bot planner --refuel --seconds 300 --out frames/
+    python render_session.py --seed 3 --bot autopilot --out clip.y4m --workers 8 --render-scale 0.5
+
+Drawing stays in this process; encoding runs on a process pool. Frames
+travel through shared memory: the screen is blitted into one of `slots`
+frame-sized buffers (under a millisecond) and the pool is told which slot
+to encode. A frame waits for a free slot, so a slow pool holds the
+renderer back instead of frames piling up in memory. PNG workers save
+their frame to its own file; Y4M frames have a fixed size, so each worker
+writes its frame at the frame's offset in the file and frames needn't
+arrive in order. Y4M output needs numpy.
+"""
+
+import argparse
+import collections
+import concurrent.futures
+import multiprocessing
+import os
+import time
+from multiprocessing import shared_memory
+
+from headless import create_game, main, pygame
+from autopilot import Autopilot
+from planner import PlannerBot
+from replay import ReplayKeys, decode_replay
+
+try:
+    import numpy as np
+except ImportError:  # PNG output only
+    np = None
+
+FRAME_FORMAT = 'RGBX'  # Pixel layout of the shared frame buffers
+SLOTS_PER_WORKER = 2
+PROGRESS_EVERY = 600  # Frames between progress lines
+
+
+def y4m_size(width, height):
+    """Frame size of a 4:2:0 video for a screen: dimensions rounded down to even"""
+    return width - width % 2, height - height % 2
+
+
+def y4m_header(width, height, fps):
+    return f"YUV4MPEG2 W{width} H{height} F{fps}:1 Ip A1:1 C420jpeg\n".encode('ascii')
+
+
+def rgb_to_yuv420(pixels, size):
+    """BT.601 limited-range planar 4:2:0 bytes from an RGBX frame of `size`"""
+    width, height = y4m_size(*size)
+    frame = np.frombuffer(pixels, np.uint8).reshape(size[1], size[0], 4)[:height, :width]
+    r, g, b = frame[..., 0], frame[..., 1], frame[..., 2]
+    y = np.multiply(r, 66, dtype=np.uint16)
+    y += np.multiply(g, 129, dtype=np.uint16)
+    y += np.multiply(b, 25, dtype=np.uint16)
+    y += 128
+    y >>= 8
+    y += 16
+
+    def quad(channel):
+        """Sum of each 2x2 block"""
+        total = channel[0::2, 0::2].astype(np.int32)
+        total += channel[1::2, 0::2]
+        total += channel[0::2, 1::2]
+        total += channel[1::2, 1::2]
+        return total
+
+    r4, g4, b4 = quad(r), quad(g), quad(b)
+    u = (-38 * r4 - 74 * g4 + 112 * b4 + 512) >> 10
+    u += 128
+    v = (112 * r4 - 94 * g4 - 18 * b4 + 512) >> 10
+    v += 128
+    return b''.join(plane.astype(np.uint8).tobytes() for plane in (y, u, v))
+
+
+# Encoding workers: each attaches to the shared frame buffers once, in the initializer
+
+worker = None
+
+
+class EncodeWorker:
+    def __init__(self, memory_name, size, slots, output, video):
+        self.memory = shared_memory.SharedMemory(memory_name)
+        self.size = size
+        self.frame_bytes = size[0] * size[1] * 4
+        self.slots = slots
+        self.output = output
+        self.video = None
+        if video:
+            self.header_bytes = len(y4m_header(*y4m_size(*size), main.FPS))
+            self.video = open(output, 'r+b')
+
+    def pixels(self, slot):
+        return self.memory.buf[slot * self.frame_bytes:(slot + 1) * self.frame_bytes]
+
+    def encode(self, slot, index):
+        pixels = self.pixels(slot)
+        try:
+            if self.video is not None:
+                data = b"FRAME\n" + rgb_to_yuv420(pixels, self.size)
+                self.video.seek(self.header_bytes + index * len(data))
+                self.video.write(data)
+                self.video.flush()
+            else:
+                surface = pygame.image.frombuffer(pixels, self.size, FRAME_FORMAT)
+                pygame.image.save(surface, os.path.join(self.output, f"frame-{index:06d}.png"))
+                del surface
+        finally:
+            pixels.release()
+        return slot
+
+
+def init_worker(memory_name, size, slots, output, video):
+    global worker
+    worker = EncodeWorker(memory_name, size, slots, output, video)
+
+
+def encode_frame(slot, index):
+    return worker.encode(slot, index)
+
+
+class Session:
+    """Inputs for each step of a session: a replay's keys or a bot's"""
+
+    def __init__(self, game, seed, replay=None, bot=None, refuel=False):
+        self.game = game
+        self.replay = replay
+        self.bot = bot
+        self.refuel = refuel
+        self.keys = ReplayKeys()
+        self.step = 0
+        game.start_game()
+        game.reset_run(seed if replay is None else replay.seed)
+        if bot is not None:
+            bot.reset()
+
+    def finished(self, limit):
+        if self.game.state != "GAME" or self.step >= limit:
+            return True
+        return self.replay is not None and self.step >= len(self.replay.inputs)
+
+    def advance(self):
+        game = self.game
+        if self.replay is not None:
+            self.keys.mask = self.replay.inputs.steps[self.step]
+            keys = self.keys
+        else:
+            self.bot.drive(game)
+            keys = self.bot
+            if self.refuel:
+                game.fuel = 100
+        self.step += 1
+        game.update_game(keys)
+
+
+def render(session, output, video, workers, slots, limit):
+    game = session.game
+    screen = game.screen
+    size = screen.get_size()
+    frame_bytes = size[0] * size[1] * 4
+    if video:
+        with open(output, 'wb') as f:
+            f.write(y4m_header(*y4m_size(*size), main.FPS))
+    else:
+        os.makedirs(output, exist_ok=True)
+
+    memory = shared_memory.SharedMemory(create=True, size=slots * frame_bytes)
+    buffers = [pygame.image.frombuffer(memory.buf[slot * frame_bytes:(slot + 1) * frame_bytes], size, FRAME_FORMAT)
+               for slot in range(slots)]
+    free = collections.deque(range(slots))
+    pending = set()
+    frames = 0
+    waited = 0.0
+    start = time.perf_counter()
+    try:
+        # Spawned, not forked: this process runs the game's threads
+        with concurrent.futures.ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context('spawn'),
+                                                    initializer=init_worker,
+                                                    initargs=(memory.name, size, slots, output, video)) as pool:
+            while not session.finished(limit):
+                session.advance()
+                game.draw()
+                if not free:
+                    wait_start = time.perf_counter()
+                    done, pending = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+                    free.extend(future.result() for future in done)
+                    waited += time.perf_counter() - wait_start
+                slot = free.popleft()
+                buffers[slot].blit(screen, (0, 0))
+                pending.add(pool.submit(encode_frame, slot, frames))
+                frames += 1
+                if frames % PROGRESS_EVERY == 0:
+                    print(f"  {frames} frames, {time.perf_counter() - start:.1f} s")
+            for future in pending:
+                future.result()
+    finally:
+        del buffers
+        memory.close()
+        memory.unlink()
+    return frames, time.perf_counter() - start, waited
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--replay", help="replay file to render")
+    parser.add_argument("--seed", type=int, default=0, help="seed of a bot session")
+    parser.add_argument("--bot", choices=("autopilot", "planner"), default="autopilot")
+    parser.add_argument("--refuel", action="store_true", help="keep a bot's tank full so the session runs --seconds")
+    parser.add_argument("--seconds", type=float, default=300.0, help="longest session to render")
+    parser.add_argument("--out", required=True, help="a .y4m file, or a folder for a PNG sequence")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="encoding processes")
+    parser.add_argument("--render-scale", type=float, default=1.0, choices=main.RENDER_SCALES)
+    args = parser.parse_args()
+
+    video = args.out.endswith('.y4m')
+    if video and np is None:
+        parser.error("y4m output needs numpy; write a PNG sequence instead")
+    game = create_game(args.seed, args.render_scale)
+    if args.replay:
+        with open(args.replay, 'rb') as f:
+            session = Session(game, args.seed, replay=decode_replay(f.read()))
+    else:
+        session = Session(game, args.seed, bot=Autopilot() if args.bot == "autopilot" else PlannerBot(), refuel=args.refuel)
+
+    frames, elapsed, waited = render(session, args.out, video, args.workers, args.workers * SLOTS_PER_WORKER,
+                                     int(args.seconds * main.FPS))
+    length = frames / main.FPS
+    print(f"Rendered {frames} frames ({length:.1f} s of play) to {args.out} in {elapsed:.1f} s: "
+          f"{frames / elapsed:.0f} frames/s, {length / elapsed:.2f}x real time, "
+          f"{waited:.1f} s waiting for encoders ({args.workers} workers)")
+    return 0
+
+
+if __name__ == "__main__":
+    exit_code = main_cli()
+    pygame.quit()
+    raise SystemExit(exit_code)
@@ -0,0 +1,96 @@
+"""
+Replays of Road Fighter runs, so submitted scores can be verified.
+
+A run is decided by two things: the seed the game's random stream is
+reseeded with when the run starts (Game.reset_run), which drives traffic
+and collision effects, and the arrow keys held at every simulation step.
+The course, scenery and particles draw from generators of their own, so
+playing the same keys from the same seed ends with the same score and
+distance.
+
+InputLog keeps one byte per step, a bit per arrow key. A replay file is a
+header (seed, steps and the score and distance the run claims) followed by
+the zlib compressed key bytes; keys are held for long stretches, so a
+ten-minute run compresses to a few kilobytes. verify_replays.py plays
+replay files back headlessly and checks the claims.
+"""
+
+import os
+import struct
+import zlib
+from array import array
+
+import pygame
+
+MAGIC = b'RFREPLY1'
+HEADER = struct.Struct('<8sQIqd')  # Magic, seed, steps, score, distance
+SEED_BITS = 32
+
+KEY_BITS = {pygame.K_LEFT: 1, pygame.K_RIGHT: 2, pygame.K_UP: 4, pygame.K_DOWN: 8}
+
+
+class InputLog:
+    """Held arrow keys, one byte per simulation step"""
+
+    def __init__(self):
+        self.steps = array('B')
+
+    def __len__(self):
+        return len(self.steps)
+
+    def clear(self):
+        del self.steps[:]
+
+    def record(self, keys):
+        self.steps.append(keys[pygame.K_LEFT] | keys[pygame.K_RIGHT] << 1 | keys[pygame.K_UP] << 2
+                          | keys[pygame.K_DOWN] << 3)
+
+    def copy(self):
+        log = InputLog()
+        log.steps = array('B', self.steps)
+        return log
+
+
+class ReplayKeys:
+    """One step of an input log, read like pygame.key.get_pressed()"""
+
+    __slots__ = ('mask',)
+
+    def __init__(self, mask=0):
+        self.mask = mask
+
+    def __getitem__(self, key):
+        return self.mask & KEY_BITS.get(key, 0) != 0
+
+
+class Replay:
+    """A run to verify: its seed, its input log and the result it claims"""
+
+    def __init__(self, seed, inputs, score, distance):
+        self.seed = seed
+        self.inputs = inputs
+        self.score = score
+        self.distance = distance
+
+    def encode(self):
+        header = HEADER.pack(MAGIC, self.seed, len(self.inputs), self.score, self.distance)
+        return header + zlib.compress(self.inputs.steps.tobytes())
+
+
+def decode_replay(data):
+    magic, seed, steps, score, distance = HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError("not a replay file")
+    inputs = InputLog()
+    inputs.steps.frombytes(zlib.decompress(data[HEADER.size:]))
+    if len(inputs) != steps:
+        raise ValueError(f"replay holds {len(inputs)} steps, expected {steps}")
+    return Replay(seed, inputs, score, distance)
+
+
+def write_replay(path, data):
+    # Written beside the final name and swapped in, like ghost files
+    temp_path = path + '.tmp'
+    with open(temp_path, 'wb') as f:
+        f.write(data)
+    os.replace(temp_path, path)
@@ -0,0 +1,171 @@
+"""
+Parallax roadside scenery for Road Fighter.
+
+Three layers sit behind the road: a grass ground, trees along the verges
+and rooftops at the outer edges. Each layer's tiles are painted once per
+render scale and laid out (from a fixed seed) into wrapping strips
+STRIP_HEIGHT tall, one per horizontal span of the layer. Strips are
+colour-keyed and RLE encoded, so a frame costs two blits per strip that
+only touch the pixels with something on them.
+
+Layers scroll at `rate` times the road's scroll, so they move with the
+game's speed. The camera looks straight down, so taller things are closer
+to it and pass faster: rooftops outrun the treetops, which outrun the
+ground.
+
+The ground is a fill in the grass colour under a strip of speckles. It
+covers the whole game area, so scenes that draw the scenery skip clearing
+the screen first; the fill replaces the black one rather than adding a
+screen-sized copy. Layout coordinates are multiples of 4 so tiles
+land on whole pixels at every render scale.
+"""
+
+import random
+
+import pygame
+
+from render_scale import View
+
+SCENERY_SEED = 1984
+STRIP_HEIGHT = 960  # Taller than the screen and a whole number of grass tiles
+CLEAR_COLOR = (255, 0, 255)  # Colour key of tiles and strips
+
+GRASS_COLOR = (38, 96, 38)
+GRASS_SPECKLES = ((30, 80, 30), (52, 116, 48), (64, 128, 56))
+TREE_SHADOW = (20, 52, 20)
+TREE_COLORS = ((28, 110, 40), (40, 124, 36), (24, 96, 56))
+TREE_HIGHLIGHT = (76, 160, 72)
+ROOF_COLORS = ((120, 60, 50), (96, 96, 104), (136, 120, 96), (80, 88, 72))
+ROOF_EDGE = (48, 48, 52)
+
+SCENERY_LAYERS = [
+    {'name': 'grass', 'rate': 1.0, 'spans': ((0, 1400),), 'layout': 'grid', 'fill': GRASS_COLOR,
+     'tiles': [('grass', (64, 64))] * 4},
+    # Verges either side of the widest road; the fork median stays grass
+    {'name': 'trees', 'rate': 1.1, 'spans': ((288, 472), (928, 1112)), 'layout': 'scatter', 'count': 14,
+     'tiles': [('tree', (48, 48)), ('tree', (64, 64)), ('tree', (40, 40))]},
+    {'name': 'buildings', 'rate': 1.25, 'spans': ((0, 288), (1112, 1400)), 'layout': 'column',
+     'tiles': [('roof', (96, 128)), ('roof', (128, 96)), ('roof', (112, 112)), ('roof', (96, 96))]},
+]
+
+
+def paint_grass(surface, view, rng, size):
+    surface.fill(CLEAR_COLOR)  # Speckles only; the ground colour is filled under them
+    width, height = size
+    for _ in range(12):
+        x, y = rng.randrange(0, width, 4), rng.randrange(0, height, 4)
+        pygame.draw.rect(surface, rng.choice(GRASS_SPECKLES), view.rect(x, y, 4, rng.choice((4, 8))))
+
+
+def paint_tree(surface, view, rng, size):
+    surface.fill(CLEAR_COLOR)
+    radius = size[0] // 2 - 4
+    center = size[0] // 2
+    pygame.draw.circle(surface, TREE_SHADOW, view.pt(center + 3, center + 3), view.px(radius))
+    pygame.draw.circle(surface, rng.choice(TREE_COLORS), view.pt(center, center), view.px(radius))
+    pygame.draw.circle(surface, TREE_HIGHLIGHT, view.pt(center - radius // 3, center - radius // 3),
+                       view.px(radius // 3))
+
+
+def paint_roof(surface, view, rng, size):
+    width, height = size
+    surface.fill(rng.choice(ROOF_COLORS))
+    pygame.draw.rect(surface, ROOF_EDGE, view.rect(0, 0, width, height), view.px(4))
+    if width >= height:
+        pygame.draw.line(surface, ROOF_EDGE, view.pt(8, height // 2), view.pt(width - 8, height // 2), view.px(2))
+    else:
+        pygame.draw.line(surface, ROOF_EDGE, view.pt(width // 2, 8), view.pt(width // 2, height - 8), view.px(2))
+    # Air conditioning units
+    for _ in range(rng.randint(0, 2)):
+        x, y = rng.randrange(12, width - 24, 4), rng.randrange(12, height - 24, 4)
+        pygame.draw.rect(surface, ROOF_EDGE, view.rect(x, y, 12, 12))
+
+
+PAINTERS = {'grass': paint_grass, 'tree': paint_tree, 'roof': paint_roof}
+
+
+def lay_out(layer, span_width, rng):
+    """Tile placements (tile index, x, y) within one strip of a layer"""
+    tiles = layer['tiles']
+    placements = []
+    if layer['layout'] == 'grid':
+        tile_width, tile_height = tiles[0][1]
+        for y in range(0, STRIP_HEIGHT, tile_height):
+            for x in range(0, span_width, tile_width):
+                placements.append((rng.randrange(len(tiles)), x, y))
+    elif layer['layout'] == 'scatter':
+        for _ in range(layer['count']):
+            index = rng.randrange(len(tiles))
+            tile_width, tile_height = tiles[index][1]
+            if tile_width > span_width:
+                continue
+            placements.append((index, rng.randrange(0, span_width - tile_width + 1, 4),
+                               rng.randrange(0, STRIP_HEIGHT - tile_height + 1, 4)))
+    else:
+        # Buildings stacked down the strip with gaps between them
+        y = rng.randrange(0, 64, 4)
+        while True:
+            index = rng.randrange(len(tiles))
+            tile_width, tile_height = tiles[index][1]
+            if y + tile_height > STRIP_HEIGHT:
+                break
+            if tile_width <= span_width:
+                placements.append((index, rng.randrange(0, span_width - tile_width + 1, 4), y))
+            y += tile_height + rng.randrange(16, 96, 4)
+    return placements
+
+
+class Scenery:
+    def __init__(self, seed=SCENERY_SEED):
+        self.seed = seed
+        rng = random.Random(seed)
+        # (left, width, placements) per strip of each layer, in logical units
+        self.layouts = [[(left, right - left, lay_out(layer, right - left, rng)) for left, right in layer['spans']]
+                        for layer in SCENERY_LAYERS]
+        self.scale = None
+        self.view = None
+        self.tiles = None  # Painted tiles per layer at the current scale
+        self.strips = None  # (left, strip surface) per layer at the current scale
+
+    def set_scale(self, scale):
+        """Paint the tiles and bake the strips for a render scale"""
+        if scale == self.scale:
+            return
+        self.scale = scale
+        self.view = view = View(scale)
+        self.tiles = [self.paint_tiles(layer, view) for layer in SCENERY_LAYERS]
+        self.strips = []
+        for layer, layout, tiles in zip(SCENERY_LAYERS, self.layouts, self.tiles):
+            strips = []
+            for left, width, placements in layout:
+                strip = pygame.Surface(view.size(width, STRIP_HEIGHT))
+                strip.fill(CLEAR_COLOR)
+                strip.blits([(tiles[index], view.pt(x, y)) for index, x, y in placements], False)
+                strip.set_colorkey(CLEAR_COLOR, pygame.RLEACCEL)
+                strips.append((left, strip))
+            self.strips.append(strips)
+
+    def paint_tiles(self, layer, view):
+        tiles = []
+        for i, (painter, size) in enumerate(layer['tiles']):
+            tile = pygame.Surface(view.size(*size))
+            # Seeded per tile so every scale paints the same pattern
+            PAINTERS[painter](tile, view, random.Random(f"{self.seed}-{layer['name']}-{i}"), size)
+            tile.set_colorkey(CLEAR_COLOR)
+            tiles.append(tile)
+        return tiles
+
+    def offset(self, layer, scroll):
+        """Logical y of a layer's strips for a road scroll position"""
+        return scroll * layer['rate'] % STRIP_HEIGHT
+
+    def draw(self, screen, scroll, layers=len(SCENERY_LAYERS)):
+        """Draw the first `layers` layers: two blits per strip, wrapping at STRIP_HEIGHT"""
+        pt = self.view.pt
+        for layer, strips in zip(SCENERY_LAYERS[:layers], self.strips):
+            if 'fill' in layer:
+                screen.fill(layer['fill'])
+            y = self.offset(layer, scroll)
+            for left, strip in strips:
+                screen.blit(strip, pt(left, y))
+                screen.blit(strip, pt(left, y - STRIP_HEIGHT))
@@ -0,0 +1,44 @@
+"""
+Scene objects for Road Fighter's game states.
+
+Each state (SPLASH, MENU, GAME, ...) is a Scene holding its event, update
+and draw handlers, so Game dispatches with one attribute lookup instead of
+walking an if/elif chain every frame. Handlers are plain functions taking
+the game as their first argument, so a frame snapshot of the game (see
+pipeline.py) is drawn by the same scene table. A scene also owns what it needs while
+active: the sprites listed in `sprites` are loaded on enter and dropped on
+exit, and its text cache is emptied on exit unless `keep_text` is set
+(scenes that are revisited constantly keep their renders). Scenes that
+paint every pixel themselves set `clear` to False to skip the black fill.
+"""
+
+
+def _ignore(*args):
+    pass
+
+
+class Scene:
+    def __init__(self, name, draw, handle_event=_ignore, update=_ignore, on_enter=_ignore, on_exit=_ignore,
+                 sprites=(), text_cache=None, keep_text=True, clear=True):
+        self.name = name
+        self.draw = draw
+        self.handle_event = handle_event
+        self.update = update
+        self.on_enter = on_enter
+        self.on_exit = on_exit
+        self.sprites = sprites  # SpriteManager names loaded only while this scene is active
+        self.text_cache = {} if text_cache is None else text_cache  # Scenes may share one
+        self.keep_text = keep_text
+        self.clear = clear
+
+    def enter(self, game):
+        if self.sprites:
+            game.sprite_manager.preload(self.sprites)
+        self.on_enter(game)
+
+    def exit(self, game):
+        self.on_exit(game)
+        if self.sprites:
+            game.sprite_manager.release(self.sprites)
+        if not self.keep_text:
+            self.text_cache.clear()
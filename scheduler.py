@@ -0,0 +1,132 @@
+"""
+Idle-time task scheduler for Road Fighter.
+
+Housekeeping (saving scores, writing log output, warming caches) is queued
+here instead of running where it is triggered. After a frame is drawn and
+presented, Game.run() calls run() with the time the frame has to be done
+by, and tasks only run while there is slack left before that deadline.
+
+A task is either a callable, run once, or a generator, which is advanced
+one slice (one `next()`) at a time until it is exhausted. Repeating tasks
+(every()) are called at most once per frame for as long as they stay
+registered. The scheduler keeps a running estimate of each task's slice
+time and only starts a slice that is expected to fit in the remaining
+budget.
+
+Lower priority numbers run first. Waiting tasks age: a task gains one
+priority level for every AGING_FRAMES frames it is passed over, so a busy
+high-priority task can't starve a low-priority one. A task that has waited
+OVERDUE_FRAMES frames runs in the next frame with any slack left, even if
+its estimate says it won't fit. That can cost one long frame, but without
+it a large enough save could never run.
+"""
+
+import collections
+import time
+
+from profiler import tracer
+
+PRIORITY_HIGH = 0
+PRIORITY_NORMAL = 1
+PRIORITY_LOW = 2
+
+AGING_FRAMES = 60  # One priority level per second of waiting at 60 FPS
+OVERDUE_FRAMES = 600
+DEFAULT_COST_MS = 1.0  # Slice estimate for a task that has never run
+COST_DECAY = 0.9  # Estimates rise to a slow slice at once and fall back gradually
+
+
+class IdleTask:
+    def __init__(self, name, work, priority, cost_ms, repeat):
+        self.name = name
+        self.priority = priority
+        self.cost_ms = cost_ms
+        self.repeat = repeat
+        self.waited = 0  # Frames since this task last ran
+        if hasattr(work, '__next__'):
+            self.step = lambda: next(work, StopIteration) is not StopIteration
+        else:
+            self.step = work
+
+    def rank(self):
+        return (self.priority - self.waited // AGING_FRAMES, -self.waited)
+
+
+class IdleScheduler:
+    def __init__(self):
+        self.tasks = {}
+        self.incoming = collections.deque()  # add() may be called from the simulation thread
+
+    def __len__(self):
+        return len(self.tasks) + len(self.incoming)
+
+    def add(self, name, work, priority=PRIORITY_NORMAL, cost_ms=DEFAULT_COST_MS):
+        """Queue a one-off task; a pending task with the same name is replaced"""
+        self.incoming.append(IdleTask(name, work, priority, cost_ms, False))
+
+    def every(self, name, work, priority=PRIORITY_LOW, cost_ms=DEFAULT_COST_MS):
+        """Call `work` in every frame with slack for it"""
+        self.incoming.append(IdleTask(name, work, priority, cost_ms, True))
+
+    def cancel(self, name):
+        self._take_incoming()
+        self.tasks.pop(name, None)
+
+    def _take_incoming(self):
+        tasks = self.tasks
+        incoming = self.incoming
+        while incoming:
+            task = incoming.popleft()
+            previous = tasks.get(task.name)
+            if previous is not None:
+                # Keep what the scheduler learned about the task it replaces
+                task.waited = previous.waited
+                task.cost_ms = max(task.cost_ms, previous.cost_ms)
+            tasks[task.name] = task
+
+    def run(self, deadline):
+        """Run task slices until the next one would overrun `deadline` (a perf_counter time)"""
+        if self.incoming:
+            self._take_incoming()
+        tasks = self.tasks
+        if not tasks:
+            return
+        for task in tasks.values():
+            task.waited += 1
+
+        perf_counter = time.perf_counter
+        ran = set()  # Repeating tasks that already ran this frame
+        while True:
+            now = perf_counter()
+            if now >= deadline:
+                break
+            remaining_ms = (deadline - now) * 1000.0
+            task = None
+            for candidate in tasks.values():
+                if candidate.name in ran:
+                    continue
+                if candidate.cost_ms > remaining_ms and candidate.waited < OVERDUE_FRAMES:
+                    continue
+                if task is None or candidate.rank() < task.rank():
+                    task = candidate
+            if task is None:
+                break
+
+            more = task.step()
+            elapsed_ms = (perf_counter() - now) * 1000.0
+            tracer.end('idle_task', now, task.name)
+            task.cost_ms = max(elapsed_ms, task.cost_ms * COST_DECAY + elapsed_ms * (1.0 - COST_DECAY))
+            task.waited = 0
+            if task.repeat:
+                ran.add(task.name)
+            elif not more:
+                del tasks[task.name]
+
+    def run_all(self):
+        """Finish every one-off task regardless of time (at exit)"""
+        self._take_incoming()
+        for task in list(self.tasks.values()):
+            if not task.repeat:
+                while task.step():
+                    pass
+        self.tasks = {name: task for name, task in self.tasks.items() if task.repeat}
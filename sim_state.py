@@ -0,0 +1,173 @@
+"""
+Compact, clonable game state for simulating Road Fighter ahead.
+
+Game can't be copied cheaply: the player and traffic hold sprites, and the
+game holds the screen, the mixer and every cache. SimState keeps only what
+a simulation step reads and writes - the player, the traffic, fuel, score,
+speed, scroll and the collision effect timers - in slotted objects, so
+clone() is a handful of attribute copies per car (microseconds on a
+normal road).
+
+The cars borrow PlayerCar.update and EnemyCar.update, so a simulated car
+moves exactly like the real one. step() mirrors Game.update_game without
+what a look-ahead can't know or doesn't need: no new traffic spawns, and
+there are no sounds, particles or ghost recording. Random collision
+effects and spin-out jitter come from the state's own Random, so
+simulating never draws from the game's random stream.
+"""
+
+import random
+
+import pygame
+
+from main import EnemyCar, PlayerCar, SCREEN_HEIGHT, SPIN_STEP
+
+
+class InputKeys:
+    """Held arrow keys, read like pygame.key.get_pressed()"""
+
+    __slots__ = ('left', 'right', 'up', 'down')
+
+    def __init__(self, left=False, right=False, up=False, down=False):
+        self.left = left
+        self.right = right
+        self.up = up
+        self.down = down
+
+    def __getitem__(self, key):
+        if key == pygame.K_LEFT:
+            return self.left
+        if key == pygame.K_RIGHT:
+            return self.right
+        if key == pygame.K_UP:
+            return self.up
+        if key == pygame.K_DOWN:
+            return self.down
+        return False
+
+
+def copy_slots(source, cls):
+    """A `cls` with every slot copied from `source`, and a rect of its own"""
+    target = cls.__new__(cls)
+    for name in cls.__slots__:
+        setattr(target, name, getattr(source, name))
+    target.rect = source.rect.copy()
+    return target
+
+
+class SimPlayer:
+    __slots__ = ('x', 'y', 'speed', 'rect', 'rng', 'mask', 'sprite_manager')
+
+    update = PlayerCar.update
+    hitbox = PlayerCar.hitbox
+
+    def clone(self):
+        return copy_slots(self, SimPlayer)
+
+
+class SimCar:
+    __slots__ = ('x', 'y', 'speed', 'car_type', 'enemy_type', 'road_margin', 'zigzag_direction', 'zigzag_speed',
+                 'zigzag_counter', 'reaction_distance', 'side_speed', 'rect', 'mask')
+
+    update = EnemyCar.update
+
+    def clone(self):
+        return copy_slots(self, SimCar)
+
+
+class SimState:
+    __slots__ = ('player', 'cars', 'fuel', 'score', 'speed', 'distance', 'road_offset', 'damage_flash',
+                 'slide_effect', 'slide_direction', 'control_loss', 'spin_angle', 'rng', 'steps', 'crashes',
+                 'pickups', 'over')
+    # Copied by clone(); the first ten are the game's own attributes
+    VALUES = ('fuel', 'score', 'speed', 'distance', 'road_offset', 'damage_flash', 'slide_effect',
+              'slide_direction', 'control_loss', 'spin_angle', 'rng', 'steps', 'crashes', 'pickups', 'over')
+
+    @classmethod
+    def capture(cls, game, rng=None):
+        """The state of a game in progress, with copies of its cars"""
+        state = cls.__new__(cls)
+        rng = rng if rng is not None else random.Random(0)
+        state.player = copy_slots(game.player, SimPlayer)
+        state.player.rng = rng
+        state.cars = [copy_slots(car, SimCar) for car in game.enemy_cars]
+        for name in cls.VALUES[:10]:
+            setattr(state, name, getattr(game, name))
+        state.rng = rng
+        state.steps = 0
+        state.crashes = 0
+        state.pickups = 0
+        state.over = False
+        return state
+
+    def clone(self):
+        state = SimState.__new__(SimState)
+        state.player = self.player.clone()
+        state.cars = [car.clone() for car in self.cars]
+        for name in SimState.VALUES:
+            setattr(state, name, getattr(self, name))
+        return state
+
+    def step(self, keys, view):
+        """One step of Game.update_game with `keys` held; `view` is a track.TrackView of the game's track"""
+        self.steps += 1
+        self.road_offset += self.speed
+        view.scroll = self.road_offset
+        player = self.player
+        player.update(keys, self.slide_effect, self.slide_direction, self.control_loss, self.spin_angle, view)
+
+        if self.damage_flash > 0:
+            self.damage_flash -= 1
+        if self.slide_effect > 0:
+            self.slide_effect -= 1
+        if self.control_loss > 0:
+            self.control_loss -= 1
+            self.spin_angle += SPIN_STEP
+
+        cars = self.cars
+        i = 0
+        while i < len(cars):
+            car = cars[i]
+            car.update(self.speed, player, view)
+            if car.y > SCREEN_HEIGHT:
+                del cars[i]
+                self.score += 10
+            else:
+                i += 1
+
+        # Collisions, with the same effects as the game's but drawn from this state's Random
+        hit_rect, hit_mask = player.hitbox(self.control_loss, self.spin_angle)
+        i = 0
+        while i < len(cars):
+            car = cars[i]
+            rect = car.rect
+            if (not hit_rect.colliderect(rect)
+                    or not hit_mask.overlap(car.mask, (rect.x - hit_rect.x, rect.y - hit_rect.y))):
+                i += 1
+                continue
+            del cars[i]
+            if car.car_type == 'fuel':
+                self.fuel = min(100, self.fuel + 20)
+                self.pickups += 1
+                continue
+            self.fuel -= 15
+            self.damage_flash = 30
+            self.crashes += 1
+            rng = self.rng
+            severity = rng.randint(1, 3)
+            self.slide_effect = 30 * severity
+            self.slide_direction = rng.choice((-1, 1))
+            if severity == 2:
+                self.control_loss = 45
+            elif severity == 3:
+                self.control_loss = 60
+                self.spin_angle = 0
+            break
+
+        self.fuel -= 0.1
+        self.distance += self.speed * 0.1
+        if self.fuel <= 0:
+            self.fuel = 0
+            self.over = True
+            return
+        self.speed = min(5, 2 + self.score / 1000)
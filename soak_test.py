@@ -0,0 +1,262 @@
+"""
+Long-run soak test for Road Fighter.
+
+Cycles the game headlessly through menu -> how to play -> game -> game over
+-> restart (with the occasional pause and credits visit) for a very large
+number of simulated frames. Every --sample-every frames it records RSS,
+live objects by type, the sizes of the game's long-lived containers and
+frame times for the window, then checks each series for steady growth.
+
+    python soak_test.py                          # one million frames
+    python soak_test.py --frames 5000000 --csv soak.csv
+    python soak_test.py --draw-every 4           # faster: render one frame in four
+
+A series counts as growing when the medians of each quarter of the run
+(after warmup) strictly increase and the total rise is above its noise
+floor. Exits with status 1 if anything grows.
+"""
+
+import argparse
+import collections
+import csv
+import gc
+import time
+
+from headless import create_game, key_event, main, pygame
+from benchmark import percentile, read_rss_kb
+import game_log
+
+SAMPLE_EVERY = 5000
+WARMUP_FRAMES = 20000  # Samples ignored while caches fill and the score table reaches ten entries
+SEGMENTS = 4
+MIN_SAMPLES = 2 * SEGMENTS
+
+# Rise (last quarter median minus first) needed before growth is reported
+RSS_NOISE_KB = 2048
+OBJECT_NOISE = 100
+CONTAINER_NOISE = 1
+FRAME_NOISE_MS = 0.25
+FRAME_NOISE_RATIO = 0.10
+TOP_TYPES = 40  # Object types tracked, by count at the first sample
+# The crash log ring only fills after hours of play at its normal size, which
+# reads as growth; a small ring is full before warmup ends
+LOG_RING_SIZE = 32
+
+# Frames the driver spends in each screen before pressing a key
+MENU_FRAMES = 90
+HOW_TO_PLAY_FRAMES = 60
+CREDITS_FRAMES = 120
+GAME_OVER_FRAMES = 150
+PAUSE_AT_FRAME = 400
+PAUSE_FRAMES = 60
+MAX_GAME_FRAMES = 3600  # Run out of fuel after a minute so cycles stay varied
+
+
+class SoakDriver:
+    """Plays the game like an attendant on a loop, one decision per frame"""
+
+    def __init__(self, game):
+        self.game = game
+        self.cycle = 0  # Completed games
+        self.state = None
+        self.state_frames = 0
+
+    def send(self, key):
+        self.game.handle_event(key_event(key))
+
+    def step(self):
+        game = self.game
+        if game.state != self.state:
+            if game.state == "GAME_OVER":
+                self.cycle += 1
+            self.state = game.state
+            self.state_frames = 0
+        frames = self.state_frames
+        self.state_frames += 1
+
+        if game.state == "MENU" and frames >= MENU_FRAMES:
+            # Every fifth cycle looks at the credits instead of starting a game
+            target = 1 if self.cycle % 5 == 4 and frames == MENU_FRAMES else 0
+            if game.menu_selection != target:
+                self.send(pygame.K_DOWN if game.menu_selection < target else pygame.K_UP)
+            else:
+                self.send(pygame.K_RETURN)
+        elif game.state == "CREDITS" and frames >= CREDITS_FRAMES:
+            self.send(pygame.K_ESCAPE)
+        elif game.state == "HOW_TO_PLAY" and frames >= HOW_TO_PLAY_FRAMES:
+            self.send(pygame.K_SPACE)
+        elif game.state == "GAME":
+            self.drive(frames)
+        elif game.state == "PAUSED" and frames >= PAUSE_FRAMES:
+            self.send(pygame.K_ESCAPE)
+        elif game.state == "GAME_OVER" and frames >= GAME_OVER_FRAMES:
+            # Alternate between a quick restart and going back through the menu
+            self.send(pygame.K_r if self.cycle % 2 else pygame.K_SPACE)
+
+    def drive(self, frames):
+        game = self.game
+        phase = (frames // 45) % 4
+        if phase == 0:
+            game.keys.press(pygame.K_LEFT)
+        elif phase == 2:
+            game.keys.press(pygame.K_RIGHT)
+        else:
+            game.keys.release()
+        if frames == PAUSE_AT_FRAME and self.cycle % 3 == 1:
+            game.keys.release()
+            self.send(pygame.K_ESCAPE)
+        elif frames >= MAX_GAME_FRAMES:
+            game.fuel = 0
+
+
+def busy_channels():
+    if not pygame.mixer.get_init():
+        return 0
+    return sum(1 for i in range(pygame.mixer.get_num_channels()) if pygame.mixer.Channel(i).get_busy())
+
+
+def container_sizes(game):
+    """Sizes of the long-lived collections a leak would show up in"""
+    text_caches = {id(scene.text_cache): scene.text_cache for scene in game.scenes.values()}
+    return {
+        'enemy_cars': len(game.enemy_cars),
+        'text_cache': sum(len(cache) for cache in text_caches.values()),
+        'value_cache': len(game.value_cache),
+        'high_scores': len(game.score_manager.high_scores),
+        'sprites': len(game.sprite_manager.sprites),
+        'track_chunks': len(game.track.chunks),
+        'particles': len(game.particles),
+        'busy_channels': busy_channels(),
+        'log_ring': len(game_log.registry.ring),
+    }
+
+
+def count_objects():
+    return collections.Counter(type(obj).__name__ for obj in gc.get_objects())
+
+
+def median(values):
+    ordered = sorted(values)
+    return ordered[len(ordered) // 2]
+
+
+def steady_growth(values, noise, ratio=0.0):
+    """Return the rise if every quarter's median is above the previous one, else None"""
+    if len(values) < MIN_SAMPLES:
+        return None
+    size = len(values) // SEGMENTS
+    medians = [median(values[i * size:(i + 1) * size]) for i in range(SEGMENTS)]
+    if any(later <= earlier for earlier, later in zip(medians, medians[1:])):
+        return None
+    rise = medians[-1] - medians[0]
+    if rise <= max(noise, abs(medians[0]) * ratio):
+        return None
+    return rise
+
+
+class SoakRecorder:
+    def __init__(self):
+        self.samples = []
+        self.tracked_types = None
+        self.container_keys = ()
+
+    def sample(self, frame, cycle, game, frame_ms):
+        ordered = sorted(frame_ms)
+        row = {
+            'frame': frame,
+            'cycle': cycle,
+            'rss_kb': read_rss_kb() or 0,
+            'frame_mean_ms': sum(ordered) / len(ordered),
+            'frame_p95_ms': percentile(ordered, 0.95),
+            'frame_max_ms': ordered[-1],
+        }
+        containers = container_sizes(game)
+        self.container_keys = tuple(containers)
+        row.update(containers)
+        objects = count_objects()
+        if self.tracked_types is None:
+            self.tracked_types = [name for name, _ in objects.most_common(TOP_TYPES)]
+        for name in self.tracked_types:
+            row['objects.' + name] = objects[name]
+        self.samples.append(row)
+        return row
+
+    def series(self, key):
+        return [row[key] for row in self.samples if row['frame'] > WARMUP_FRAMES]
+
+    def findings(self):
+        """Return (metric, rise, unit) for every series that grows steadily"""
+        checks = [('rss_kb', RSS_NOISE_KB, 0.0, 'KB')]
+        checks += [(key, CONTAINER_NOISE, 0.0, 'items') for key in self.container_keys]
+        checks += [('objects.' + name, OBJECT_NOISE, 0.0, 'objects') for name in self.tracked_types or ()]
+        checks += [(key, FRAME_NOISE_MS, FRAME_NOISE_RATIO, 'ms') for key in ('frame_mean_ms', 'frame_p95_ms')]
+        found = []
+        for key, noise, ratio, unit in checks:
+            rise = steady_growth(self.series(key), noise, ratio)
+            if rise is not None:
+                found.append((key, rise, unit))
+        return found
+
+    def write_csv(self, path):
+        with open(path, 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=list(self.samples[0]))
+            writer.writeheader()
+            writer.writerows(self.samples)
+
+
+def soak(frames, sample_every, draw_every, seed=0, progress=print):
+    game_log.configure(ring_size=LOG_RING_SIZE)
+    game = create_game(seed)
+    game.set_state("MENU")
+    driver = SoakDriver(game)
+    recorder = SoakRecorder()
+    perf = time.perf_counter
+    frame_ms = []
+
+    for frame in range(1, frames + 1):
+        driver.step()
+        start = perf()
+        game.update()
+        if frame % draw_every == 0:
+            game.draw()
+            game.present()
+        frame_ms.append((perf() - start) * 1000.0)
+
+        if frame % sample_every == 0:
+            row = recorder.sample(frame, driver.cycle, game, frame_ms)
+            frame_ms.clear()
+            progress(f"frame {frame:>9}  cycle {driver.cycle:>5}  rss {row['rss_kb']:>7} KB  "
+                     f"frame mean {row['frame_mean_ms']:.2f} ms  p95 {row['frame_p95_ms']:.2f} ms")
+    return recorder
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--frames", type=int, default=1_000_000, help="simulated frames to run")
+    parser.add_argument("--sample-every", type=int, default=SAMPLE_EVERY)
+    parser.add_argument("--draw-every", type=int, default=1, help="render one frame in N")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--csv", help="write every sample to this file")
+    args = parser.parse_args()
+
+    recorder = soak(args.frames, args.sample_every, args.draw_every, args.seed)
+    if args.csv and recorder.samples:
+        recorder.write_csv(args.csv)
+        print(f"Wrote {len(recorder.samples)} samples to {args.csv}")
+
+    if len(recorder.series('frame')) < MIN_SAMPLES:
+        print(f"Only {len(recorder.samples)} samples - run more frames to check for growth")
+        return 0
+    findings = recorder.findings()
+    for key, rise, unit in findings:
+        print(f"GROWTH {key}: +{rise:g} {unit} from first to last quarter")
+    if findings:
+        return 1
+    print("No steady growth detected")
+    return 0
+
+
+if __name__ == "__main__":
+    exit_code = main_cli()
+    pygame.quit()
+    raise SystemExit(exit_code)
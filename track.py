@@ -0,0 +1,501 @@
+"""
+Procedural, streamed track for Road Fighter.
+
+The course is cut into CHUNK_ROWS-long chunks. A chunk holds one lookup
+row per pixel of track: the road's left and right edges, the edges of the
+median island while the road is forked, and the lane centers. Spawning,
+player clamping and enemy steering read those rows instead of fixed lane
+positions.
+
+Chunks are generated in order from a seeded TrackGenerator, so the course
+is the same every run, like the original's. A worker thread keeps
+AHEAD_CHUNKS chunks built past the top of the screen and bakes each chunk's
+road surface at the current render scale and road detail. Drawing the road
+is then one colour-keyed blit per visible chunk. The frame thread only
+draws a chunk with shapes itself when its bake isn't ready yet (right
+after a render scale or quality change).
+
+Track rows are counted from the start of the course upwards; `scroll` is
+how far the course has moved down the screen. The row at screen position y
+is scroll + screen_height - 1 - y. The first OPENING_CHUNKS chunks are kept
+for the whole session, so starting a new game never waits for generation.
+"""
+
+import array
+import math
+import queue
+import random
+import threading
+
+import pygame
+
+from game_log import get_logger
+from quality import ROAD_FULL, ROAD_NO_POSTS
+from render_scale import View
+
+log = get_logger('assets')
+
+TRACK_SEED = 1984
+CHUNK_ROWS = 300
+AHEAD_CHUNKS = 3  # Built beyond the spawn row at the top of the screen
+OPENING_CHUNKS = 4  # Start of the course (first screen and spawn row), kept for restarts
+SPAWN_MARGIN = 50  # Cars appear this far above the screen
+
+ROAD_LEFT_LIMIT = 350  # Outer edges of the road, clear of the HUD panels
+ROAD_RIGHT_LIMIT = 1050
+ROAD_WIDTHS = (420, 500, 600, 700)
+FORK_MIN_WIDTH = 600
+LANE_WIDTH = 100
+MAX_LANES = 8
+
+RAIL_WIDTH = 10
+POST_SPACING = 30
+DASH_PERIOD = 80
+DASH_LENGTH = 40
+OUTLINE_STEP = 10  # Rows between outline points of the baked road shapes
+
+ROAD_COLOR = (64, 64, 64)
+RAIL_COLOR = (255, 255, 255)
+POST_COLOR = (128, 128, 128)
+LINE_COLOR = (255, 255, 255)
+CLEAR_COLOR = (0, 0, 0)  # Colour key: off-road parts of a baked chunk
+
+# Used for rows outside the built course (they should never be asked for)
+DEFAULT_ROW = (ROAD_LEFT_LIMIT, ROAD_RIGHT_LIMIT, 700, 700)
+DEFAULT_LANES = (400, 500, 600, 700, 800, 900, 1000)
+
+
+def lane_centers(row):
+    """Lane centers across a row's carriageways"""
+    left, right, median_left, median_right = row
+    if median_left < median_right:
+        spans = ((left, median_left), (median_right, right))
+    else:
+        spans = ((left, right),)
+    centers = []
+    for start, end in spans:
+        count = max(1, round((end - start) / LANE_WIDTH))
+        centers.extend(round(start + (i + 0.5) * (end - start) / count) for i in range(count))
+    return tuple(centers)
+
+
+def dividers(row, detail):
+    """Lane dividers of a row as (carriageway, fraction of its width)"""
+    left, right, median_left, median_right = row
+    if median_left < median_right:
+        spans = ((0, left, median_left), (1, median_right, right))
+    else:
+        spans = ((0, left, right),)
+    result = []
+    for span, start, end in spans:
+        count = max(1, round((end - start) / LANE_WIDTH))
+        step = 2 if detail < ROAD_NO_POSTS else 1  # Minimal detail: every other divider
+        result.extend((span, i / count) for i in range(step, count, step))
+    return result
+
+
+def span_x(row, span, fraction):
+    left, right, median_left, median_right = row
+    if span == 0:
+        end = median_left if median_left < median_right else right
+        return left + (end - left) * fraction
+    return median_right + (right - median_right) * fraction
+
+
+class TrackChunk:
+    """Lookup tables for CHUNK_ROWS rows of track, bottom row first
+
+    Columns are typed arrays rather than a tuple per row, so a chunk is a
+    handful of objects however winding the road is. Lane centers are stored
+    flat, MAX_LANES slots per row, with the number used in `lane_count`.
+    """
+
+    __slots__ = ('index', 'left', 'right', 'median_left', 'median_right', 'lane_count', 'lane_x',
+                 'x0', 'x1', 'forked')
+
+    def __init__(self, index, rows):
+        self.index = index
+        self.left = array.array('h', [row[0] for row in rows])
+        self.right = array.array('h', [row[1] for row in rows])
+        self.median_left = array.array('h', [row[2] for row in rows])
+        self.median_right = array.array('h', [row[3] for row in rows])
+        self.lane_count = array.array('b', bytes(CHUNK_ROWS))
+        self.lane_x = array.array('h', bytes(2 * CHUNK_ROWS * MAX_LANES))
+        last_row = centers = None
+        for r, row in enumerate(rows):
+            if row != last_row:
+                last_row, centers = row, lane_centers(row)[:MAX_LANES]
+            self.lane_count[r] = len(centers)
+            self.lane_x[r * MAX_LANES:r * MAX_LANES + len(centers)] = array.array('h', centers)
+        self.x0 = min(self.left) - RAIL_WIDTH - 10  # Room for the posts
+        self.x1 = max(self.right) + RAIL_WIDTH + 10
+        self.forked = any(a < b for a, b in zip(self.median_left, self.median_right))
+
+    def row(self, r):
+        return (self.left[r], self.right[r], self.median_left[r], self.median_right[r])
+
+    def lanes(self, r):
+        start = r * MAX_LANES
+        return tuple(self.lane_x[start:start + self.lane_count[r]])
+
+
+class TrackGenerator:
+    """Produces the course one chunk at a time from a list of sections
+
+    A section eases the road's center, width and median half-width from
+    their values at its start to its targets over its length.
+    """
+
+    def __init__(self, seed=TRACK_SEED):
+        self.rng = random.Random(seed)
+        self.index = 0  # Next chunk to generate
+        self.center = 700.0
+        self.width = 700.0
+        self.median = 0.0
+        self.start = (self.center, self.width, self.median)
+        self.target = self.start
+        self.length = 1200  # Open on a straight full-width road
+        self.row = 0
+        self.pending = []  # Sections queued after the current one
+
+    def state(self):
+        return (self.rng.getstate(), self.index, self.center, self.width, self.median,
+                self.start, self.target, self.length, self.row, list(self.pending))
+
+    def restore(self, state):
+        (rng_state, self.index, self.center, self.width, self.median,
+         self.start, self.target, self.length, self.row, pending) = state
+        self.rng.setstate(rng_state)
+        self.pending = list(pending)
+
+    def next_chunk(self):
+        chunk = TrackChunk(self.index, [self.next_row() for _ in range(CHUNK_ROWS)])
+        self.index += 1
+        return chunk
+
+    def next_row(self):
+        if self.row >= self.length:
+            self.begin_section()
+        self.row += 1
+        # Cosine easing so bends and width changes start and end gently
+        t = 0.5 - 0.5 * math.cos(math.pi * self.row / self.length)
+        (center0, width0, median0), (center1, width1, median1) = self.start, self.target
+        self.center = center0 + (center1 - center0) * t
+        self.width = width0 + (width1 - width0) * t
+        self.median = median0 + (median1 - median0) * t
+        half = self.width / 2
+        if self.median < 1:
+            middle = round(self.center)
+            return (round(self.center - half), round(self.center + half), middle, middle)
+        return (round(self.center - half), round(self.center + half),
+                round(self.center - self.median), round(self.center + self.median))
+
+    def begin_section(self):
+        if not self.pending:
+            self.plan()
+        self.start = (self.center, self.width, self.median)
+        self.length, self.target = self.pending.pop(0)
+        self.row = 0
+
+    def centers_for(self, width):
+        return ROAD_LEFT_LIMIT + width / 2, ROAD_RIGHT_LIMIT - width / 2
+
+    def plan(self):
+        """Queue the next stretch of road"""
+        rng = self.rng
+        center, width = self.center, self.width
+        pending = self.pending
+        choice = rng.random()
+        if choice < 0.3:
+            # Straight
+            pending.append((rng.randint(300, 900), (center, width, 0.0)))
+        elif choice < 0.65:
+            # Bend: narrow first if the road is too wide to move
+            low, high = self.centers_for(width)
+            if high - low < 100:
+                width = rng.choice(ROAD_WIDTHS[:2])
+                pending.append((rng.randint(300, 500), (center, width, 0.0)))
+                low, high = self.centers_for(width)
+            pending.append((rng.randint(400, 800), (rng.uniform(low, high), width, 0.0)))
+        elif choice < 0.9:
+            # Narrowing or widening, shifting the center back inside the limits if needed
+            width = rng.choice(ROAD_WIDTHS)
+            low, high = self.centers_for(width)
+            pending.append((rng.randint(300, 600), (min(high, max(low, center)), width, 0.0)))
+        else:
+            # Fork: widen if needed, open a median island, hold it, close it again
+            if width < FORK_MIN_WIDTH:
+                width = rng.choice(ROAD_WIDTHS[2:])
+                low, high = self.centers_for(width)
+                center = min(high, max(low, center))
+                pending.append((rng.randint(300, 500), (center, width, 0.0)))
+            median = rng.choice((40, 50, 60))
+            pending.append((300, (center, width, median)))
+            pending.append((rng.randint(600, 1200), (center, width, median)))
+            pending.append((300, (center, width, 0.0)))
+
+
+def draw_chunk(surface, view, chunk, detail, offset=(0, 0)):
+    """Draw a chunk's road with its top-left at `offset` (render pixels) on `surface`"""
+    rows = [chunk.row(r) for r in range(CHUNK_ROWS)]
+    x0 = chunk.x0
+    offset_x, offset_y = offset
+    scaled_point = view.pt
+    bottom = view.size(1, CHUNK_ROWS)[1] - 1  # Rounding must not spill onto the chunk below
+
+    def point(x, y):
+        x, y = scaled_point(x - x0, y)
+        return (x + offset_x, min(y, bottom) + offset_y)
+
+    def rect(x, y, width, height):
+        return view.rect(x - x0, y, width, height).move(offset_x, offset_y)
+
+    # Outline samples: (row, y) from the bottom pixel row of the chunk to its top one
+    samples = [(rows[r], CHUNK_ROWS - 1 - r) for r in range(0, CHUNK_ROWS, OUTLINE_STEP)]
+    samples.append((rows[-1], 0))
+    up = samples
+    down = samples[::-1]
+
+    def edge(column, shift=0):
+        return [point(row[column] + shift, y) for row, y in up]
+
+    def band(column_a, shift_a, column_b, shift_b):
+        return ([point(row[column_a] + shift_a, y) for row, y in up] +
+                [point(row[column_b] + shift_b, y) for row, y in down])
+
+    pygame.draw.polygon(surface, ROAD_COLOR, band(0, 0, 1, 0))
+    if chunk.forked:
+        pygame.draw.polygon(surface, CLEAR_COLOR, band(2, 0, 3, 0))
+    pygame.draw.polygon(surface, RAIL_COLOR, band(0, -RAIL_WIDTH, 0, 0))
+    pygame.draw.polygon(surface, RAIL_COLOR, band(1, 0, 1, RAIL_WIDTH))
+
+    # Guardrail posts, anchored to the course so they move with the road
+    if detail == ROAD_FULL:
+        base = chunk.index * CHUNK_ROWS
+        for r in range(-base % POST_SPACING, CHUNK_ROWS, POST_SPACING):
+            left, right = rows[r][0], rows[r][1]
+            y = CHUNK_ROWS - 1 - r
+            pygame.draw.rect(surface, POST_COLOR, rect(left - 15, y - 4, 20, 5))
+            pygame.draw.rect(surface, POST_COLOR, rect(right - 5, y - 4, 20, 5))
+
+    # Road edges (inner lines), plus the median's while forked
+    line_width = view.px(2)
+    pygame.draw.lines(surface, LINE_COLOR, False, edge(0), line_width)
+    pygame.draw.lines(surface, LINE_COLOR, False, edge(1), line_width)
+    if chunk.forked:
+        pygame.draw.lines(surface, LINE_COLOR, False, edge(2), line_width)
+        pygame.draw.lines(surface, LINE_COLOR, False, edge(3), line_width)
+
+    # Lane dividers: dashes anchored to the course, cut at the chunk's edges
+    base = chunk.index * CHUNK_ROWS
+    for start in range(base - base % DASH_PERIOD, base + CHUNK_ROWS, DASH_PERIOD):
+        first = max(start, base) - base
+        last = min(start + DASH_LENGTH, base + CHUNK_ROWS) - 1 - base
+        if first > last:
+            continue
+        row_a, row_b = rows[first], rows[last]
+        if (row_a[2] < row_a[3]) != (row_b[2] < row_b[3]):
+            row_b = row_a  # Fork opens or closes within the dash
+        for span, fraction in dividers(row_a, detail):
+            pygame.draw.line(surface, LINE_COLOR,
+                             point(span_x(row_a, span, fraction), CHUNK_ROWS - 1 - first),
+                             point(span_x(row_b, span, fraction), CHUNK_ROWS - 1 - last), line_width)
+
+
+def bake_chunk(chunk, scale, detail):
+    """Road surface for a chunk; off-road pixels are transparent through the colour key"""
+    view = View(scale)
+    surface = pygame.Surface(view.size(chunk.x1 - chunk.x0, CHUNK_ROWS))
+    surface.fill(CLEAR_COLOR)
+    draw_chunk(surface, view, chunk, detail)
+    surface.set_colorkey(CLEAR_COLOR, pygame.RLEACCEL)
+    return surface
+
+
+class Track:
+    def __init__(self, screen_height, seed=TRACK_SEED, threaded=True):
+        self.screen_height = screen_height
+        self.generator = TrackGenerator(seed)
+        self.opening_state = None  # Generator state after the opening chunks
+        self.chunks = {}  # Index -> TrackChunk
+        self.surfaces = {}  # Index -> baked road for the current style
+        self.style = (1.0, ROAD_FULL)  # (render scale, road detail) of the baked surfaces
+        self.scroll = 0
+        self.epoch = 0  # Bumped by reset(); work for an older run is thrown away
+        self.requested = -1  # Highest chunk index asked for
+        self.next_drop = OPENING_CHUNKS  # Lowest chunk that may still be live
+        self.lock = threading.Lock()  # Guards chunks, surfaces and epoch between the threads
+        self.requests = queue.SimpleQueue()
+        self.baking = True  # Off for tools that simulate runs without drawing them
+        self.keep_all = False  # Keep every chunk built across runs instead of only the opening ones
+        self.thread = None
+        if threaded:
+            self.thread = threading.Thread(target=self._run, name="track", daemon=True)
+            self.thread.start()
+        self.request(OPENING_CHUNKS - 1)
+
+    def stop(self):
+        """Let the worker finish what it is doing and exit"""
+        if self.thread is not None:
+            self.requests.put(None)
+            self.thread.join()
+            self.thread = None
+
+    def run_inline(self):
+        """Stop the worker and build on the calling thread from now on (deterministic tools)"""
+        self.stop()
+        self._build(self.epoch, self.requested)
+
+    def simulate_only(self):
+        """Build inline, never bake, and keep the course built (tools replaying many runs, drawing none)"""
+        self.run_inline()
+        self.baking = False
+        self.keep_all = True
+        with self.lock:
+            self.surfaces.clear()
+
+    def _submit(self, message):
+        if self.thread is not None:
+            self.requests.put(message)
+        else:
+            self._handle(message)
+
+    def _run(self):
+        while True:
+            message = self.requests.get()
+            if message is None:
+                return
+            try:
+                self._handle(message)
+            except Exception:
+                log.exception("Track worker failed on %r", message)
+
+    def _handle(self, message):
+        if message[0] == 'reset':
+            if self.opening_state is not None:
+                self.generator.restore(self.opening_state)
+        else:
+            self._build(*message[1:])
+
+    def _build(self, epoch, last):
+        """Generate chunks up to `last`, then bake every live chunk missing a surface"""
+        generator = self.generator
+        while generator.index <= last:
+            if epoch != self.epoch and generator.index >= OPENING_CHUNKS:
+                return
+            chunk = generator.next_chunk()
+            if generator.index == OPENING_CHUNKS:
+                self.opening_state = generator.state()
+            with self.lock:
+                if epoch == self.epoch or chunk.index < OPENING_CHUNKS:
+                    self.chunks[chunk.index] = chunk
+        if not self.baking:
+            return
+        with self.lock:
+            indices = sorted(self.chunks)
+        for index in indices:
+            style = self.style
+            chunk = self.chunks.get(index)
+            if chunk is None or index in self.surfaces:
+                continue
+            surface = bake_chunk(chunk, *style)
+            with self.lock:
+                if style == self.style and self.chunks.get(index) is chunk:
+                    self.surfaces[index] = surface
+
+    def request(self, last):
+        if last > self.requested:
+            self.requested = last
+            self._submit(('build', self.epoch, last))
+
+    def reset(self):
+        """Back to the start of the course for a new game"""
+        if self.keep_all:
+            self.update(0)
+            return
+        with self.lock:
+            self.epoch += 1
+            for index in [index for index in self.chunks if index >= OPENING_CHUNKS]:
+                del self.chunks[index]
+                self.surfaces.pop(index, None)
+        self.requested = min(self.requested, OPENING_CHUNKS - 1)
+        self.next_drop = OPENING_CHUNKS
+        self._submit(('reset',))
+        self.update(0)
+
+    def set_style(self, scale, detail):
+        """Rebake the road for a new render scale or road detail"""
+        if (scale, detail) == self.style:
+            return
+        with self.lock:
+            self.style = (scale, detail)
+            self.surfaces.clear()
+        self._submit(('build', self.epoch, self.requested))
+
+    def update(self, scroll):
+        """Move the course to `scroll`: ask for chunks ahead and drop the ones left behind"""
+        self.scroll = scroll
+        bottom = int(scroll) // CHUNK_ROWS
+        self.request((int(scroll) + self.screen_height + SPAWN_MARGIN) // CHUNK_ROWS + AHEAD_CHUNKS)
+        if self.next_drop < bottom and not self.keep_all:
+            with self.lock:
+                while self.next_drop < bottom:
+                    self.chunks.pop(self.next_drop, None)
+                    self.surfaces.pop(self.next_drop, None)
+                    self.next_drop += 1
+
+    def ready(self, scroll=None):
+        """Whether every chunk on screen at `scroll` is built and baked"""
+        return all(index in self.surfaces for index, top in self.visible(self.scroll if scroll is None else scroll))
+
+    def visible(self, scroll):
+        """(chunk index, logical y of its top edge) for the chunks on screen, bottom first"""
+        bottom = max(0, int(scroll) // CHUNK_ROWS)
+        top = (int(scroll) + self.screen_height - 1) // CHUNK_ROWS
+        return [(index, self.screen_height - (index + 1) * CHUNK_ROWS + scroll) for index in range(bottom, top + 1)]
+
+    # Lookups at screen position y for the current scroll
+
+    def locate(self, y):
+        """(chunk, row within it) under screen y; the chunk is None outside the built course"""
+        position = int(self.scroll + self.screen_height - 1 - y)
+        return self.chunks.get(position // CHUNK_ROWS), position % CHUNK_ROWS
+
+    def row(self, y):
+        """(left, right, median left, median right) of the road at screen y"""
+        chunk, r = self.locate(y)
+        return DEFAULT_ROW if chunk is None else chunk.row(r)
+
+    def lanes(self, y):
+        """Lane centers at screen y"""
+        chunk, r = self.locate(y)
+        return DEFAULT_LANES if chunk is None else chunk.lanes(r)
+
+    def center(self, y):
+        chunk, r = self.locate(y)
+        if chunk is None:
+            return (ROAD_LEFT_LIMIT + ROAD_RIGHT_LIMIT) / 2
+        return (chunk.left[r] + chunk.right[r]) / 2
+
+    def clamp(self, x, y, margin):
+        """`x` moved onto the road at screen y, keeping `margin` from the edges and the median"""
+        left, right, median_left, median_right = self.row(y)
+        x = max(left + margin, min(right - margin, x))
+        if median_left < median_right and median_left - margin < x < median_right + margin:
+            x = median_left - margin if x < (median_left + median_right) / 2 else median_right + margin
+        return x
+
+
+class TrackView:
+    """The course's lookups at a scroll of its own, for simulating steps ahead without moving the track"""
+
+    locate = Track.locate
+    row = Track.row
+    lanes = Track.lanes
+    center = Track.center
+    clamp = Track.clamp
+
+    def __init__(self, track, scroll=0):
+        self.chunks = track.chunks
+        self.screen_height = track.screen_height
+        self.scroll = scroll
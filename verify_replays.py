@@ -0,0 +1,230 @@
+"""
+Score verification for Road Fighter replays.
+
+Plays submitted replays (see replay.py) back headlessly and checks that each
+run ends on its last recorded step with the score and distance it claims.
+Verifications run in parallel on a process pool, one game per worker: the
+course is built once per worker and kept, roads are never baked and
+particles are off, since the simulation never reads them.
+
+    python verify_replays.py high_scores_replays/*.replay
+    python verify_replays.py --spool spool            # verify whatever is dropped in spool/incoming
+    python verify_replays.py --bench 200              # throughput on recorded autopilot runs
+    python verify_replays.py --workers 8 ...
+
+The spool is the local queue: replay files copied into spool/incoming are
+verified as they arrive, moved to spool/verified or spool/rejected, and
+their results appended to spool/results.jsonl. Only names ending in
+.replay are picked up, so copy files in under another name and rename them.
+
+Exits with status 1 when any replay fails verification.
+"""
+
+import argparse
+import concurrent.futures
+import json
+import multiprocessing
+import os
+import time
+
+from headless import main, pygame
+from autopilot import Autopilot
+from replay import Replay, ReplayKeys, decode_replay
+
+POLL_INTERVAL = 0.25  # Seconds between looks at the spool's incoming folder
+BENCH_RUNS = 8  # Distinct autopilot runs recorded for --bench
+RUN_FRAMES = 10 * 60 * main.FPS  # A ten-minute run, for throughput figures
+
+
+class ReplayGame(main.Game):
+    """A Game whose runs end by setting `finished` instead of scoring and changing scene"""
+
+    def game_over(self):
+        self.finished = True
+
+
+def create_replay_game():
+    game = ReplayGame(1.0)
+    game.track.simulate_only()
+    game.particles.enabled = False  # Drawn, never read by the simulation
+    game.finished = False
+    return game
+
+
+def simulate(game, replay):
+    """Play a replay's inputs from its seed; the steps played before the run ended"""
+    game.reset_run(replay.seed)
+    game.finished = False
+    keys = ReplayKeys()
+    steps = 0
+    for mask in replay.inputs.steps:
+        if game.finished:
+            break
+        keys.mask = mask
+        game.update_game(keys)
+        steps += 1
+    return steps
+
+
+def check(game, replay):
+    """Why a replay fails verification, or None if it holds up"""
+    steps = simulate(game, replay)
+    if not game.finished:
+        return f"run still going after its {len(replay.inputs)} steps"
+    if steps != len(replay.inputs):
+        return f"run ended at step {steps} of {len(replay.inputs)}"
+    if game.score != replay.score:
+        return f"score {game.score}, claimed {replay.score}"
+    if game.distance != replay.distance:
+        return f"distance {game.distance!r}, claimed {replay.distance!r}"
+    return None
+
+
+# Process pool workers: one game each, built by the initializer
+
+worker_game = None
+
+
+def init_worker():
+    global worker_game
+    worker_game = create_replay_game()
+
+
+def verify(name, data):
+    start = time.perf_counter()
+    result = {'name': name, 'verified': False}
+    try:
+        replay = decode_replay(data)
+    except Exception as e:
+        result['reason'] = f"unreadable replay: {e}"
+        return result
+    reason = check(worker_game, replay)
+    result.update(verified=reason is None, reason=reason, seed=replay.seed, steps=len(replay.inputs),
+                  score=worker_game.score, distance=worker_game.distance, claimed_score=replay.score,
+                  claimed_distance=replay.distance, seconds=time.perf_counter() - start)
+    return result
+
+
+def create_pool(workers):
+    # Spawned, not forked: the parent may be running game threads of its own
+    return concurrent.futures.ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context('spawn'),
+                                                  initializer=init_worker)
+
+
+def describe(result):
+    if result['verified']:
+        return (f"OK    {result['name']}: score {result['score']}, distance {result['distance']:.1f}, "
+                f"{result['steps']} steps in {result['seconds']:.2f} s")
+    return f"FAIL  {result['name']}: {result['reason']}"
+
+
+def verify_files(paths, workers):
+    failures = 0
+    with create_pool(workers) as pool:
+        futures = []
+        for path in paths:
+            with open(path, 'rb') as f:
+                futures.append(pool.submit(verify, path, f.read()))
+        for future in futures:
+            result = future.result()
+            failures += not result['verified']
+            print(describe(result))
+    print(f"{len(paths) - failures} of {len(paths)} replays verified")
+    return 1 if failures else 0
+
+
+def serve_spool(spool, workers, once):
+    """Verify replays as they land in spool/incoming until interrupted (or, with `once`, until it is empty)"""
+    incoming = os.path.join(spool, 'incoming')
+    for folder in ('incoming', 'verified', 'rejected'):
+        os.makedirs(os.path.join(spool, folder), exist_ok=True)
+    failures = 0
+    pending = {}  # Future -> file name
+    with create_pool(workers) as pool, open(os.path.join(spool, 'results.jsonl'), 'a') as results:
+        print(f"Verifying replays dropped in {incoming} with {workers} workers")
+        try:
+            while True:
+                busy = set(pending.values())
+                for name in sorted(os.listdir(incoming)):
+                    if name.endswith('.replay') and name not in busy:
+                        with open(os.path.join(incoming, name), 'rb') as f:
+                            pending[pool.submit(verify, name, f.read())] = name
+                if not pending:
+                    if once:
+                        break
+                    time.sleep(POLL_INTERVAL)
+                    continue
+                done, _ = concurrent.futures.wait(pending, POLL_INTERVAL, concurrent.futures.FIRST_COMPLETED)
+                for future in done:
+                    name = pending.pop(future)
+                    result = future.result()
+                    failures += not result['verified']
+                    results.write(json.dumps(result) + "\n")
+                    results.flush()
+                    folder = 'verified' if result['verified'] else 'rejected'
+                    os.replace(os.path.join(incoming, name), os.path.join(spool, folder, name))
+                    print(describe(result))
+        except KeyboardInterrupt:
+            print("Stopping")
+    return 1 if failures else 0
+
+
+def record_runs(count):
+    """Replays of `count` runs driven by the autopilot, from seeds 0..count-1"""
+    game = create_replay_game()
+    autopilot = Autopilot()
+    replays = []
+    for seed in range(count):
+        game.reset_run(seed)
+        game.finished = False
+        autopilot.reset()
+        while not game.finished:
+            autopilot.drive(game)
+            game.update_game(autopilot)
+        replays.append(Replay(seed, game.input_log.copy(), game.score, game.distance))
+    return replays
+
+
+def bench(submissions, workers):
+    print(f"Recording {BENCH_RUNS} autopilot runs...")
+    replays = [replay.encode() for replay in record_runs(BENCH_RUNS)]
+    with create_pool(workers) as pool:
+        # Workers build their games before the clock starts
+        list(pool.map(time.sleep, [0.0] * workers))
+        start = time.perf_counter()
+        futures = [pool.submit(verify, f"run-{i % BENCH_RUNS}", replays[i % BENCH_RUNS]) for i in range(submissions)]
+        results = [future.result() for future in futures]
+        elapsed = time.perf_counter() - start
+    failures = sum(not result['verified'] for result in results)
+    steps = sum(result['steps'] for result in results)
+    per_minute = steps / elapsed * 60 / RUN_FRAMES
+    print(f"{submissions} replays, {steps} steps in {elapsed:.2f} s with {workers} workers")
+    print(f"{steps / elapsed:,.0f} steps/s: {per_minute:.1f} ten-minute runs verified per minute, "
+          f"{steps / elapsed / main.FPS:.0f}x real time")
+    if failures:
+        print(f"{failures} replays failed verification")
+    return 1 if failures else 0
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("replays", nargs="*", help="replay files to verify")
+    parser.add_argument("--spool", help="serve a spool folder (incoming/, verified/, rejected/, results.jsonl)")
+    parser.add_argument("--once", action="store_true", help="with --spool: stop once incoming/ is empty")
+    parser.add_argument("--bench", type=int, metavar="N", help="verify N recorded runs and report throughput")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    if args.bench:
+        return bench(args.bench, args.workers)
+    if args.spool:
+        return serve_spool(args.spool, args.workers, args.once)
+    if args.replays:
+        return verify_files(args.replays, args.workers)
+    parser.error("give replay files, --spool or --bench")
+
+
+if __name__ == "__main__":
+    exit_code = main_cli()
+    pygame.quit()
+    raise SystemExit(exit_code)